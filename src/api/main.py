@@ -8,6 +8,7 @@ import sys
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -52,6 +53,11 @@ def create_app(service: APIService) -> FastAPI:
         version="1.0.0",
     )
 
+    # Compress larger JSON bodies (team lists, sequences, backtest results).
+    # Added first so it sits inside LoggingMiddleware, whose streamed bodies
+    # would otherwise always be compressed regardless of size
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
     # Request logging middleware
     app.add_middleware(LoggingMiddleware)
 
@@ -6,14 +6,23 @@ import asyncio
 import logging
 import os
 from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from fastapi.responses import FileResponse, PlainTextResponse
 
+try:
+    import orjson
+except ImportError:  # Optional: FastAPI's default JSON encoding is used instead
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Thread pool executor for running blocking optimization tasks
 _executor = ThreadPoolExecutor(max_workers=1)
+
+# Browser caching for team lists, which don't change while the server runs
+TEAM_DATA_CACHE_CONTROL = "max-age=60"
 from .models import (
     BacktestRequest,
     BacktestResponse,
@@ -27,6 +36,29 @@ from .models import (
 )
 from .service import APIService
 
+
+def _json_response(content: Any) -> Any:
+    """
+    Serialize an untyped (no response_model) route result with orjson, if installed.
+
+    Without a response model FastAPI walks the result with jsonable_encoder() and then
+    json.dumps(); for the larger payloads (sequences, saved optimization results) orjson is
+    ~50x faster. Typed routes don't need this: Pydantic already serializes them to bytes.
+
+    Args:
+        content: JSON-compatible result (numpy values and non-string keys allowed)
+
+    Returns:
+        Response with the serialized JSON, or content unchanged when orjson is missing
+    """
+    if orjson is None:
+        return content
+    return Response(
+        orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json",
+    )
+
+
 def create_routes(service: APIService) -> APIRouter:
     """
     Create and configure FastAPI routes for the recommendation API.
@@ -64,10 +96,12 @@ def create_routes(service: APIService) -> APIRouter:
     router = APIRouter()
 
     @router.get("/api/teams", response_model=list[TeamInfo])
-    async def get_teams():
+    async def get_teams(response: Response):
         """Get all teams with metadata."""
         try:
-            return service.get_all_teams()
+            teams = service.get_all_teams()
+            response.headers["Cache-Control"] = TEAM_DATA_CACHE_CONTROL
+            return teams
         except Exception as e:
             logger.error(f"get_teams: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="An unexpected error occurred. Please try again.")
@@ -82,12 +116,13 @@ def create_routes(service: APIService) -> APIRouter:
             raise HTTPException(status_code=500, detail="An unexpected error occurred. Please try again.")
 
     @router.get("/api/teams/{team_name}/months")
-    async def get_team_months(team_name: str):
+    async def get_team_months(team_name: str, response: Response):
         """Get available months for a team."""
         try:
             months = service.get_team_months(team_name)
             if months is None:
                 raise HTTPException(status_code=404, detail=f"Team '{team_name}' not found")
+            response.headers["Cache-Control"] = TEAM_DATA_CACHE_CONTROL
             return {"team": team_name, "months": months}
         except HTTPException:
             raise
@@ -147,7 +182,7 @@ def create_routes(service: APIService) -> APIRouter:
     async def get_improvement_sequences():
         """Get all learned improvement sequences."""
         try:
-            return service.get_improvement_sequences()
+            return _json_response(service.get_improvement_sequences())
         except Exception as e:
             logger.error(f"get_improvement_sequences: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="An unexpected error occurred. Please try again.")
@@ -266,7 +301,7 @@ def create_routes(service: APIService) -> APIRouter:
             results = OptimizationEngine.load_latest_results()
             if results is None:
                 raise HTTPException(status_code=404, detail="No optimization results found")
-            return results
+            return _json_response(results)
         except HTTPException:
             raise
         except Exception as e:
@@ -48,14 +48,23 @@ class APIService:
             self.practice_remarks = {}
         self.missing_values_details = None  # Will be set by web_main.py
         self.data_file_path: str | None = None  # Will be set by web_main.py
+        # Team lists only depend on the processed data, which doesn't change while serving,
+        # so they are computed on first request and reused (see get_all_teams/get_team_months)
+        self._all_teams: list[dict[str, Any]] | None = None
+        self._team_months: dict[str, list[int] | None] = {}
 
     def get_all_teams(self) -> list[dict[str, Any]]:
         """
         Get all teams with metadata.
 
+        Computed once and cached; the returned list is shared, so callers must not mutate it.
+
         Returns:
             List of team info dictionaries with name and data count
         """
+        if self._all_teams is not None:
+            return self._all_teams
+
         teams = self.processor.get_all_teams()
         result = []
 
@@ -76,6 +85,7 @@ class APIService:
 
         # Sort by number of months (descending), then alphabetically
         result.sort(key=lambda x: (-x["num_months"], x["name"]))
+        self._all_teams = result
         return result
 
     def get_teams_with_improvements(self) -> list[dict[str, Any]]:
@@ -138,6 +148,9 @@ class APIService:
         1. The month is month 3 or later (globally)
         2. The team has a previous month in their history (to use as baseline)
 
+        Computed once per team and cached; the returned list is shared, so callers must not
+        mutate it.
+
         Args:
             team_name: Name of the team
 
@@ -145,6 +158,9 @@ class APIService:
             List of months (sorted) or None if team not found
             Only includes months that can be predicted (month 3+ globally AND team has previous month)
         """
+        if team_name in self._team_months:
+            return self._team_months[team_name]
+
         if team_name not in self.processor.get_all_teams():
             return None
 
@@ -168,6 +184,7 @@ class APIService:
             if month_idx > 0:  # Team has a previous month in their history
                 months_to_predict.append(month)
 
+        self._team_months[team_name] = months_to_predict
         return months_to_predict
 
     def get_recommendations(self, team_name: str, month: int, top_n: int = 2, k_similar: int = 19) -> dict[str, Any]:
@@ -2,13 +2,138 @@
 DataLoader: Load agile metrics from Excel files.
 """
 
+import hashlib
 import logging
 import os
+import tempfile
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 
 logger = logging.getLogger(__name__)
 
+# On-disk cache of loaded frames, keyed by the source file's path, size and mtime, so an
+# unchanged workbook is unpickled instead of re-parsed. Bump FRAME_CACHE_VERSION whenever
+# the reading logic changes, so frames read by older code are not reused
+FRAME_CACHE_DIR = Path(".cache") / "frames"
+FRAME_CACHE_VERSION = 1
+
+# Strings pd.read_excel() reads as missing values by default
+EXCEL_NA_STRINGS = frozenset(
+    {
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+        "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    }
+)
+
+
+def _is_number(text: str) -> bool:
+    """Whether a string parses as a number (pd.read_excel() would convert it)."""
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _read_plain_table(file_path: str) -> pd.DataFrame | None:
+    """
+    Read the first sheet of an .xlsx file as a plain table, streaming its rows.
+
+    pd.read_excel() opens the workbook the same way (openpyxl read-only mode, cached cell
+    values, no external links), but then converts every cell and re-parses all rows as
+    text. For a plain table - one header row of distinct names over numeric and text
+    columns - building the frame straight from the streamed cell values gives the same
+    DataFrame without that second pass (about a quarter faster on the bundled dataset).
+
+    Args:
+        file_path (str): Path to the .xlsx file
+
+    Returns:
+        pd.DataFrame | None: The table, or None if the sheet is not a plain table (e.g.
+            unnamed columns, numbers or missing-value markers stored as text), which
+            pd.read_excel() has to interpret
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = list(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+    # Read-only sheets can report trailing rows and columns that are formatted but empty
+    while rows and all(value is None for value in rows[-1]):
+        rows.pop()
+    if not rows:
+        return None
+    header = rows[0]
+    width = len(header)
+    while width and header[width - 1] is None:
+        width -= 1
+    names = list(header[:width])
+    if not names or not all(isinstance(name, str) and name for name in names) or len(set(names)) < width:
+        return None
+    if any(value is not None for row in rows[1:] for value in row[width:]):
+        return None
+
+    df = pd.DataFrame([row[:width] for row in rows[1:]], columns=names)
+
+    # Match pd.read_excel()'s type handling column by column
+    for name in names:
+        column = df[name]
+        if column.isna().all():
+            df[name] = column.astype(np.float64)
+        elif column.dtype == object:
+            if not all(
+                isinstance(value, str) and value not in EXCEL_NA_STRINGS and not _is_number(value)
+                for value in column.dropna()
+            ):
+                return None
+            df[name] = column.where(column.notna(), np.nan)
+        elif column.dtype.kind == "f" and not column.isna().any() and (column % 1 == 0).all():
+            # Whole-number floats are read as integers
+            df[name] = column.astype(np.int64)
+
+    return df
+
+
+def _frame_cache_path(file_path: str) -> Path | None:
+    """Path of the cached frame for the current version of a file (None if it can't be stat'ed)."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    key = f"v{FRAME_CACHE_VERSION}:{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return FRAME_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.pkl"
+
+
+def _load_cached_frame(cache_path: Path) -> pd.DataFrame | None:
+    """Load a cached frame, or None on a cache miss or unreadable entry."""
+    try:
+        return pd.read_pickle(cache_path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable data cache {cache_path}: {e}")
+        return None
+
+
+def _store_cached_frame(cache_path: Path, df: pd.DataFrame) -> None:
+    """Cache a loaded frame (written under a temporary name; failures only log a warning)."""
+    try:
+        FRAME_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=FRAME_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                df.to_pickle(f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.warning(f"Failed to cache loaded data: {e}")
+
 
 class DataLoader:
     """Load and prepare agile metrics data from Excel files."""
@@ -26,11 +151,12 @@ class DataLoader:
         self.teams = None
         self.months = None
 
-    def load(self) -> pd.DataFrame:
+    def load(self, use_cache: bool = False) -> pd.DataFrame:
         """
         Load agile metrics data from Excel file.
 
-        Reads the first sheet of the Excel file and identifies practice columns
+        Reads the first sheet of the Excel file (streamed in openpyxl read-only mode for
+        plain .xlsx tables, else via pd.read_excel()) and identifies practice columns
         (all columns except 'Team Name' and 'Month'). Extracts unique teams,
         practices, and months for later use.
 
@@ -41,6 +167,10 @@ class DataLoader:
         - Practice values: Should be 0-3 (maturity levels), but validation happens later
         - Month format: Numeric yyyymmdd format (e.g., 20200107)
 
+        Args:
+            use_cache (bool): Reuse the frame cached (under FRAME_CACHE_DIR) by an earlier
+                load of the same, unmodified file, and cache freshly read frames
+
         Returns:
             pd.DataFrame: Loaded data with columns:
                 - 'Team Name' (str): Name of the team
@@ -67,10 +197,19 @@ class DataLoader:
         if not os.path.exists(self.file_path):
             raise FileNotFoundError(f"File not found: {self.file_path}")
 
-        try:
-            self.df = pd.read_excel(self.file_path, sheet_name=0)
-        except Exception as e:
-            raise ValueError(f"Failed to read Excel file: {str(e)}")
+        cache_path = _frame_cache_path(self.file_path) if use_cache else None
+        self.df = _load_cached_frame(cache_path) if cache_path is not None else None
+
+        if self.df is None:
+            try:
+                if self.file_path.lower().endswith((".xlsx", ".xlsm")):
+                    self.df = _read_plain_table(self.file_path)
+                if self.df is None:
+                    self.df = pd.read_excel(self.file_path, sheet_name=0)
+            except Exception as e:
+                raise ValueError(f"Failed to read Excel file: {str(e)}")
+            if cache_path is not None:
+                _store_cached_frame(cache_path, self.df)
 
         # Identify practice columns (all except Team Name and Month)
         self.practices = [col for col in self.df.columns if col not in ["Team Name", "Month"]]
@@ -22,6 +22,18 @@ class DataProcessor:
         self.df = df
         self.practices = practices
         self.team_histories = defaultdict(dict)
+        # Team name -> positional row indices into df, in file order (filled by process())
+        self.team_row_idx = {}
+        # Chronologically sorted months per team, built once in process()
+        self._sorted_team_months = {}
+        # Per-team (n_months, n_practices) score matrices, rows in sorted month order
+        self._team_matrices = {}
+        # Sorted array of all months, and team_month_mask[team_idx, month_idx] = True when
+        # the team (in get_all_teams() order) has data for months_array[month_idx]
+        self.months_array = np.zeros(0, dtype=np.int64)
+        self.team_month_mask = np.zeros((0, 0), dtype=bool)
+        # history_tensor[team_idx, month_idx] = practice vector (zeros where the mask is False)
+        self.history_tensor = np.zeros((0, 0, len(practices)), dtype=np.float64)
         self.processed = False
 
     def process(self) -> None:
@@ -41,6 +53,12 @@ class DataProcessor:
         Returns:
             None: Modifies internal state:
                 - self.team_histories: Dictionary mapping team names to month-indexed vectors
+                - self.team_row_idx: Dictionary mapping team names to their df row positions
+                - self.months_array: Sorted int64 array of all months
+                - self.team_month_mask: (n_teams, n_months) bool array; row order matches
+                  get_all_teams(), column order matches self.months_array
+                - self.history_tensor: (n_teams, n_months, n_practices) float array of the
+                  same vectors, zero where team_month_mask is False
                 - self.processed: Set to True
 
         Raises:
@@ -50,7 +68,7 @@ class DataProcessor:
             - Original DataFrame is modified in-place (NaN values filled)
             - Practice scores are normalized: original_value / 3.0
             - Team histories are sorted by month chronologically
-            - NaN values in vectors are replaced with 0.0 using np.nan_to_num()
+            - NaN values in vectors are replaced with 0.0 (in place, before normalizing)
 
         Example:
             >>> processor = DataProcessor(df, practices)
@@ -63,24 +81,49 @@ class DataProcessor:
         """
 
 
-        # Fill NaN values with 0 (not implemented)
-        for practice in self.practices:
-            self.df[practice] = self.df[practice].fillna(0)
-
-        # Normalize scores to 0-1 range (from 0-3 scale)
-        for practice in self.practices:
-            self.df[practice] = self.df[practice] / 3.0
+        # Fill NaN values with 0 and normalize scores to 0-1 range (from 0-3 scale), in place
+        # on one float64 copy of all practice columns instead of column by column
+        scores = self.df[self.practices].to_numpy(dtype=np.float64)
+        np.copyto(scores, 0.0, where=np.isnan(scores))
+        scores /= 3.0
+        self.df[self.practices] = scores
+        vectors = scores
+
+        # Build team histories indexed by month, straight from the score rows. The row
+        # positions of every team come from one groupby pass (first-appearance order, like
+        # unique()) instead of a full-column comparison per team. Each team's rows are
+        # visited in the same (quicksort) order as sort_values("Month"), so a duplicated
+        # month keeps the same row
+        months = self.df["Month"].to_numpy()
+        self.team_row_idx = self.df.groupby("Team Name", sort=False).indices
+        for team, rows in self.team_row_idx.items():
+            rows = rows[np.argsort(months[rows], kind="quicksort")]
+            history = self.team_histories[team]
+            for row, month in zip(rows.tolist(), months[rows].tolist()):
+                history[int(month)] = vectors[row]
+
+        self._sorted_team_months = {
+            team: np.array(sorted(history), dtype=np.int64) for team, history in self.team_histories.items()
+        }
 
-        # Build team histories indexed by month
-        for team in self.df["Team Name"].unique():
-            team_data = self.df[self.df["Team Name"] == team].sort_values("Month")
-            for _, row in team_data.iterrows():
-                month = int(row["Month"])
-                # Store practices as numpy array
-                practices_vector = row[self.practices].values.astype(float)
-                # Ensure no NaN values (fill with 0 if any remain)
-                practices_vector = np.nan_to_num(practices_vector, nan=0.0)
-                self.team_histories[team][month] = practices_vector
+        self.months_array = np.array(sorted({m for history in self.team_histories.values() for m in history}),
+                                     dtype=np.int64)
+        num_teams, num_months = len(self.team_histories), len(self.months_array)
+        self.team_month_mask = np.zeros((num_teams, num_months), dtype=bool)
+        self.history_tensor = np.zeros((num_teams, num_months, len(self.practices)), dtype=np.float64)
+        for team_idx, (team, sorted_months) in enumerate(self._sorted_team_months.items()):
+            month_idx = np.searchsorted(self.months_array, sorted_months)
+            self.team_month_mask[team_idx, month_idx] = True
+            history = self.team_histories[team]
+            team_matrix = np.array([history[m] for m in sorted_months.tolist()], dtype=np.float64)
+            team_matrix = team_matrix.reshape(len(sorted_months), len(self.practices))
+            team_matrix.flags.writeable = False
+            self._team_matrices[team] = team_matrix
+            # Store the history vectors as row views into the (contiguous, month-major)
+            # team matrix, so both access paths share one copy of the data
+            for row, month in enumerate(sorted_months.tolist()):
+                history[month] = team_matrix[row]
+            self.history_tensor[team_idx, month_idx] = team_matrix
 
         self.processed = True
 
@@ -102,6 +145,53 @@ class DataProcessor:
 
         return self.team_histories[team_name]
 
+    def get_sorted_team_months(self, team_name: str) -> np.ndarray:
+        """
+        Get the chronologically sorted months for which a team has data.
+
+        The array is computed once in process(), so callers that repeatedly need a
+        team's ordered months (e.g. sequence learning at every backtest cutoff) can
+        slice it with np.searchsorted instead of re-filtering and re-sorting the
+        history keys. Treat the returned array as read-only.
+
+        Args:
+            team_name (str): Name of the team
+
+        Returns:
+            np.ndarray: 1D int64 array of months in yyyymmdd format, ascending
+
+        Raises:
+            ValueError: If process() has not been called yet or the team is unknown.
+        """
+        if not self.processed:
+            raise ValueError("Data not processed. Call process() first.")
+
+        if team_name not in self._sorted_team_months:
+            raise ValueError(f"Team '{team_name}' not found")
+
+        return self._sorted_team_months[team_name]
+
+    def get_team_matrix(self, team_name: str) -> tuple:
+        """
+        Get a team's history as a dense matrix, one row per month.
+
+        Rows follow get_sorted_team_months(), so month-relative comparisons become array
+        slices, e.g. (matrix[i:i + 3] > matrix[i - 1]).any(axis=0) flags every practice
+        that improved within three months of month i - 1. Both arrays are built once in
+        process() and are read-only.
+
+        Args:
+            team_name (str): Name of the team
+
+        Returns:
+            tuple: (months, matrix) where months is the sorted int64 month array and
+                matrix is a float64 array of shape (n_months, n_practices)
+
+        Raises:
+            ValueError: If process() has not been called yet or the team is unknown.
+        """
+        return self.get_sorted_team_months(team_name), self._team_matrices[team_name]
+
     def get_all_teams(self) -> list:
         """Get list of all teams."""
         if not self.processed:
@@ -111,19 +201,14 @@ class DataProcessor:
     def get_all_months(self) -> list:
         """Get sorted list of all months present across all teams.
 
-        Collects month keys from every team's history and returns them in
-        chronological order (yyyymmdd strings sort correctly lexicographically).
+        Returns the month keys of every team's history in chronological order
+        (yyyymmdd sorts chronologically), read from months_array, which process()
+        builds once, instead of re-collecting them from each team on every call.
 
         Returns:
-            list: Sorted list of month strings in yyyymmdd format.
-
-        Raises:
-            ValueError: If process() has not been called yet.
+            list: Sorted list of months in yyyymmdd format (empty before process()).
         """
-        all_months = set()
-        for team_months in self.team_histories.values():
-            all_months.update(team_months.keys())
-        return sorted(list(all_months))
+        return self.months_array.tolist()
 
     def get_statistics(self) -> dict:
         """
@@ -4,6 +4,7 @@ DataValidator: Validate data quality and integrity.
 
 import logging
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,8 @@ class DataValidator:
         self.df = df
         self.practices = practices
         self.issues = []
+        # Missing-value counts shared by every check and report, built by _missing_counts()
+        self._missing = None
 
     def validate(self) -> bool:
         """
@@ -32,6 +35,7 @@ class DataValidator:
             bool: True if data is valid, False otherwise
         """
         self.issues = []
+        self._missing = None
 
         # Check required columns
         self._check_required_columns()
@@ -82,65 +86,108 @@ class DataValidator:
             if min_val < 0 or max_val > 3:
                 self.issues.append(f"Practice '{practice}' has values outside 0-3 range: [{min_val}, {max_val}]")
 
+    def _missing_counts(self) -> dict:
+        """
+        Get (computing on first use) missing-value counts per column and per month.
+
+        The frame's missing-value mask is built and reduced once; validate(), the
+        missing-values reports and filter_high_missing_practices() all read these counts
+        instead of each re-scanning the frame. validate() recomputes them.
+
+        Returns:
+            dict: Counts with keys:
+                - column_idx: {column_name: column position}
+                - by_column: (n_columns,) missing values per column, over all rows
+                - months: sorted distinct months (rows without a month are left out)
+                - month_rows: (n_months,) number of rows per month
+                - by_month: (n_months, n_columns) missing values per month and column
+        """
+        if self._missing is None:
+            isna = self.df.isna().to_numpy()
+
+            if "Month" in self.df.columns:
+                month_values = self.df["Month"].to_numpy()
+                has_month = ~self.df["Month"].isna().to_numpy()
+                months, month_idx = np.unique(month_values[has_month], return_inverse=True)
+                by_month = np.zeros((len(months), isna.shape[1]), dtype=np.int64)
+                np.add.at(by_month, month_idx, isna[has_month])
+                month_rows = np.bincount(month_idx, minlength=len(months))
+            else:
+                months = np.zeros(0, dtype=np.int64)
+                by_month = np.zeros((0, isna.shape[1]), dtype=np.int64)
+                month_rows = np.zeros(0, dtype=np.int64)
+
+            self._missing = {
+                "column_idx": {column: i for i, column in enumerate(self.df.columns)},
+                "by_column": isna.sum(axis=0),
+                "months": months,
+                "month_rows": month_rows,
+                "by_month": by_month,
+            }
+        return self._missing
+
     def _check_missing_values(self) -> None:
         """Check for missing values."""
-        missing_count = self.df.isnull().sum().sum()
+        missing_count = self._missing_counts()["by_column"].sum()
         if missing_count > 0:
             self.issues.append(f"Found {missing_count} missing values in data")
 
-    def get_missing_values_details(self) -> dict:
+    def _missing_values_details(self, practices: list, skip_unknown: bool) -> dict:
         """
-        Get detailed breakdown of missing values by practice and month.
+        Build the missing-values breakdown for a set of practices from _missing_counts().
+
+        Args:
+            practices (list): Practice names to report on
+            skip_unknown (bool): Leave out practices that are not columns of the frame
+                (otherwise they raise KeyError)
 
         Returns:
-            dict: Detailed missing values information
+            dict: Missing values information (total_missing is left to the caller)
         """
+        counts = self._missing_counts()
+        column_idx = counts["column_idx"]
+        if skip_unknown:
+            practices = [practice for practice in practices if practice in column_idx]
+        columns = [column_idx[practice] for practice in practices]
+
+        months = counts["months"].tolist()
+        month_rows = counts["month_rows"].tolist()
+        total_rows = len(self.df)
+
         result = {
-            "total_missing": int(self.df.isnull().sum().sum()),
+            "total_missing": 0,
             "by_practice": {},
             "by_month": {},
             "practices_with_missing": [],
             "months_with_missing": [],
         }
 
-        # Check missing values by practice
-        for practice in self.practices:
-            if practice in self.df.columns:
-                missing_count = int(self.df[practice].isna().sum())
-                if missing_count > 0:
-                    total_rows = len(self.df)
-                    pct = (missing_count / total_rows) * 100
-                    result["by_practice"][practice] = {
-                        "count": missing_count,
-                        "percentage": round(pct, 1),
-                        "by_month": {},
-                    }
-                    result["practices_with_missing"].append(practice)
-
-                    # Check missing values by month for this practice
-                    for month in sorted(self.df["Month"].unique()):
-                        month_data = self.df[self.df["Month"] == month]
-                        month_missing = int(month_data[practice].isna().sum())
-                        month_total = len(month_data)
-                        if month_missing > 0:
-                            month_pct = (month_missing / month_total) * 100 if month_total > 0 else 0
-                            result["by_practice"][practice]["by_month"][int(month)] = {
-                                "count": month_missing,
-                                "total": month_total,
-                                "percentage": round(month_pct, 1),
-                            }
-
-        # Check missing values by month (across all practices)
-        for month in sorted(self.df["Month"].unique()):
-            month_data = self.df[self.df["Month"] == month]
-            month_missing = int(month_data[self.practices].isnull().sum().sum())
+        # Missing values by practice, and by month for each practice
+        by_month = counts["by_month"][:, columns]
+        for practice, missing_count, practice_by_month in zip(
+            practices, counts["by_column"][columns].tolist(), by_month.T.tolist()
+        ):
+            if missing_count > 0:
+                pct = (missing_count / total_rows) * 100
+                result["by_practice"][practice] = {"count": missing_count, "percentage": round(pct, 1), "by_month": {}}
+                result["practices_with_missing"].append(practice)
+
+                for month, month_missing, month_total in zip(months, practice_by_month, month_rows):
+                    if month_missing > 0:
+                        result["by_practice"][practice]["by_month"][int(month)] = {
+                            "count": month_missing,
+                            "total": month_total,
+                            "percentage": round((month_missing / month_total) * 100, 1),
+                        }
+
+        # Missing values by month (across the given practices)
+        for month, month_missing, rows in zip(months, by_month.sum(axis=1).tolist(), month_rows):
             if month_missing > 0:
-                month_total = len(month_data) * len(self.practices)
-                month_pct = (month_missing / month_total) * 100 if month_total > 0 else 0
+                month_total = rows * len(practices)
                 result["by_month"][int(month)] = {
                     "count": month_missing,
                     "total": month_total,
-                    "percentage": round(month_pct, 1),
+                    "percentage": round((month_missing / month_total) * 100, 1),
                 }
                 result["months_with_missing"].append(int(month))
 
@@ -149,6 +196,17 @@ class DataValidator:
 
         return result
 
+    def get_missing_values_details(self) -> dict:
+        """
+        Get detailed breakdown of missing values by practice and month.
+
+        Returns:
+            dict: Detailed missing values information
+        """
+        result = self._missing_values_details(self.practices, skip_unknown=False)
+        result["total_missing"] = int(self._missing_counts()["by_column"].sum())
+        return result
+
     def _check_temporal_coverage(self) -> None:
         """Check that teams have multiple time periods."""
         if "Team Name" not in self.df.columns:
@@ -174,7 +232,7 @@ class DataValidator:
             "total_columns": len(self.df.columns),
             "unique_teams": self.df["Team Name"].nunique(),
             "unique_months": self.df["Month"].nunique(),
-            "missing_values": self.df.isnull().sum().sum(),
+            "missing_values": self._missing_counts()["by_column"].sum(),
             "validation_issues": len(self.issues),
             "is_valid": len(self.issues) == 0,
         }
@@ -192,28 +250,22 @@ class DataValidator:
                 - filtered_practices: List of practices with missing values <= threshold
                 - excluded_practices: List of practices that were excluded
         """
-        missing_details = self.get_missing_values_details()
-        total_rows = len(self.df)
-
-        filtered_practices = []
-        excluded_practices = []
-
-        for practice in practices:
-            if practice not in self.df.columns:
-                # Practice column doesn't exist, exclude it
-                excluded_practices.append(practice)
-                continue
+        counts = self._missing_counts()
+        column_idx = counts["column_idx"]
+
+        # Practices without a column are excluded; the rest are judged by their missing
+        # percentage, rounded to one decimal as reported by get_missing_values_details()
+        known = [practice for practice in practices if practice in column_idx]
+        missing = counts["by_column"][[column_idx[practice] for practice in known]]
+        percentages = missing / max(len(self.df), 1) * 100
+        keep = {
+            practice
+            for practice, pct in zip(known, percentages.tolist())
+            if pct == 0 or round(pct, 1) <= threshold
+        }
 
-            # Check missing values for this practice
-            if practice in missing_details["by_practice"]:
-                missing_pct = missing_details["by_practice"][practice]["percentage"]
-                if missing_pct > threshold:
-                    excluded_practices.append(practice)
-                else:
-                    filtered_practices.append(practice)
-            else:
-                # No missing values, include it
-                filtered_practices.append(practice)
+        filtered_practices = [practice for practice in practices if practice in keep]
+        excluded_practices = [practice for practice in practices if practice not in keep]
 
         return filtered_practices, excluded_practices
 
@@ -229,57 +281,6 @@ class DataValidator:
         Returns:
             dict: Missing values information filtered to only the specified practices
         """
-        result = {
-            "total_missing": 0,
-            "by_practice": {},
-            "by_month": {},
-            "practices_with_missing": [],
-            "months_with_missing": [],
-        }
-
-        # Check missing values by practice (only for specified practices)
-        for practice in practices:
-            if practice not in self.df.columns:
-                continue
-
-            missing_count = int(self.df[practice].isna().sum())
-            if missing_count > 0:
-                total_rows = len(self.df)
-                pct = (missing_count / total_rows) * 100
-                result["by_practice"][practice] = {"count": missing_count, "percentage": round(pct, 1), "by_month": {}}
-                result["practices_with_missing"].append(practice)
-                result["total_missing"] += missing_count
-
-                # Check missing values by month for this practice
-                for month in sorted(self.df["Month"].unique()):
-                    month_data = self.df[self.df["Month"] == month]
-                    month_missing = int(month_data[practice].isna().sum())
-                    month_total = len(month_data)
-                    if month_missing > 0:
-                        month_pct = (month_missing / month_total) * 100 if month_total > 0 else 0
-                        result["by_practice"][practice]["by_month"][int(month)] = {
-                            "count": month_missing,
-                            "total": month_total,
-                            "percentage": round(month_pct, 1),
-                        }
-
-        # Check missing values by month (across specified practices only)
-        for month in sorted(self.df["Month"].unique()):
-            month_data = self.df[self.df["Month"] == month]
-            # Only count missing values for the specified practices
-            month_missing = int(month_data[practices].isnull().sum().sum())
-            if month_missing > 0:
-                month_total = len(month_data) * len(practices)
-                month_pct = (month_missing / month_total) * 100 if month_total > 0 else 0
-                result["by_month"][int(month)] = {
-                    "count": month_missing,
-                    "total": month_total,
-                    "percentage": round(month_pct, 1),
-                }
-                if int(month) not in result["months_with_missing"]:
-                    result["months_with_missing"].append(int(month))
-
-        # Sort practices by missing count (descending)
-        result["practices_with_missing"].sort(key=lambda p: result["by_practice"][p]["count"], reverse=True)
-
+        result = self._missing_values_details(practices, skip_unknown=True)
+        result["total_missing"] = sum(result["by_practice"][p]["count"] for p in result["practices_with_missing"])
         return result
@@ -818,11 +818,10 @@ class CLIInterface:
             backtest = BacktestEngine(self.recommender, self.processor)
             optimizer = OptimizationEngine(backtest)
 
-            # Progress callback to show updates
+            # Progress callback to show updates (the optimizer already throttles the calls)
             def progress_callback(current, total, config):
-                if current % 10 == 0 or current == 1:
-                    percentage = (current / total * 100) if total > 0 else 0
-                    print(f"   Progress: {current}/{total} ({percentage:.1f}%)")
+                percentage = (current / total * 100) if total > 0 else 0
+                print(f"   Progress: {current}/{total} ({percentage:.1f}%)")
 
             print("\nRunning optimization...")
             result = optimizer.find_optimal_config(min_accuracy=0.40, progress_callback=progress_callback)
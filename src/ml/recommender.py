@@ -4,6 +4,8 @@ RecommendationEngine: Generate practice recommendations using collaborative filt
 
 from collections import defaultdict
 
+import numpy as np
+
 
 class RecommendationEngine:
     """Generate practice recommendations combining similarity and sequence patterns."""
@@ -20,8 +22,49 @@ class RecommendationEngine:
         self.similarity_engine = similarity_engine
         self.sequence_mapper = sequence_mapper
         self.practices = practices
+        self._practice_idx = {practice: i for i, practice in enumerate(practices)}
         self.processor = similarity_engine.processor
 
+    def _locate_month(self, team: str, month: int) -> tuple:
+        """
+        Get a team's month/matrix arrays and the row index of one of its months.
+
+        Args:
+            team (str): Team name
+            month (int): Month (yyyymmdd format)
+
+        Returns:
+            tuple: (months, matrix, idx) as from processor.get_team_matrix(), with
+                matrix[idx] holding the team's practice vector for month
+
+        Raises:
+            ValueError: If the team is unknown or has no data for month
+        """
+        months, matrix = self.processor.get_team_matrix(team)
+        idx = int(np.searchsorted(months, month))
+        if idx == len(months) or months[idx] != month:
+            raise ValueError(f"Team '{team}' has no data for month {month}")
+        return months, matrix, idx
+
+    def _recently_improved(self, matrix: np.ndarray, current_idx: int, num_months: int) -> set:
+        """
+        Get the practices a team improved over its last num_months months.
+
+        A practice counts if its level at row current_idx is higher than at any of the
+        (up to) num_months preceding rows of the team's matrix.
+
+        Args:
+            matrix (np.ndarray): Team matrix from processor.get_team_matrix()
+            current_idx (int): Row of the current month
+            num_months (int): Months to check back
+
+        Returns:
+            set: Names of recently improved practices
+        """
+        past = matrix[max(current_idx - num_months, 0) : current_idx]
+        improved = (matrix[current_idx] > past).any(axis=0)
+        return {self.practices[j] for j in np.flatnonzero(improved)}
+
     def recommend(
         self,
         target_team: str,
@@ -111,29 +154,12 @@ class RecommendationEngine:
             - The algorithm prevents data leakage by only using historical data
             - Similar teams are deduplicated (one entry per team, highest similarity kept)
         """
-        # Get target team's current state
-        history = self.processor.get_team_history(target_team)
-        months_list = sorted(history.keys())
-
-        if current_month not in history:
-            raise ValueError(f"Team '{target_team}' has no data for month {current_month}")
+        # Get target team's current state (one row per month, in chronological order)
+        _, team_matrix, current_idx = self._locate_month(target_team, current_month)
 
-        # Validate minimum data requirement: need at least 2 months of history
-        # Month 2 can be used as baseline to predict month 3, but month 1 cannot
-        # Exception: allow_first_three_months=True for backtesting scenarios
+        # Validate minimum data requirement (month 1 cannot be a baseline)
         if not allow_first_three_months:
-            all_months = sorted(self.processor.get_all_months())
-            if len(all_months) >= 2:
-                first_month = set(all_months[:1])  # Only filter month 1
-                if current_month in first_month:
-                    raise ValueError(
-                        f"Need at least 2 months of historical data. "
-                        f"Month to predict starts from month 3 onwards. "
-                        f"Baseline month {current_month} is the first month."
-                    )
-
-        current_scores = history[current_month]
-        current_idx = months_list.index(current_month)
+            self._check_baseline_month(current_month)
 
         # Step 0: Learn sequences up to current_month (using sliding window)
         # This ensures sequences are only learned from months < current_month
@@ -147,6 +173,144 @@ class RecommendationEngine:
         if not similar_teams:
             raise ValueError(f"No similar teams found for '{target_team}'")
 
+        return self._score_practices(
+            team_matrix, current_idx, current_month, similar_teams, top_n, similarity_weight, recent_improvements_months
+        )
+
+    def recommend_batch(
+        self,
+        queries: list,
+        top_n: int = 2,
+        k_similar: int = 19,
+        allow_first_three_months: bool = False,
+        similarity_weight: float = 0.6,
+        similar_teams_lookahead_months: int = 3,
+        recent_improvements_months: int = 3,
+        min_similarity_threshold: float = 0.75,
+    ) -> list:
+        """
+        Generate recommendations for many (team, month) queries at once.
+
+        Same algorithm and parameters as recommend(), but Step 1 runs for all queries
+        together through SimilarityEngine.find_similar_teams_batch() - one matrix product
+        against the normalized index instead of one similarity scan per query. Useful when
+        the queries are known up front, e.g. every team of a backtest month.
+
+        Args:
+            queries (list): List of (target_team, current_month) tuples
+            top_n, k_similar, allow_first_three_months, similarity_weight,
+            similar_teams_lookahead_months, recent_improvements_months,
+            min_similarity_threshold: As for recommend()
+
+        Returns:
+            list: One entry per query, in query order: the list recommend() would return,
+                or the ValueError it would raise (returned, not raised, so one bad query
+                does not abort the batch)
+        """
+        results = [None] * len(queries)
+        located = []
+        for q, (target_team, current_month) in enumerate(queries):
+            try:
+                _, team_matrix, current_idx = self._locate_month(target_team, current_month)
+                if not allow_first_three_months:
+                    self._check_baseline_month(current_month)
+            except ValueError as e:
+                results[q] = e
+                continue
+            located.append((q, team_matrix, current_idx))
+
+        similar_batch = self.similarity_engine.find_similar_teams_batch(
+            [queries[q] for q, _, _ in located], k=k_similar, min_similarity=min_similarity_threshold
+        )
+
+        for (q, team_matrix, current_idx), similar_teams in zip(located, similar_batch):
+            target_team, current_month = queries[q]
+            if not similar_teams:
+                results[q] = ValueError(f"No similar teams found for '{target_team}'")
+                continue
+
+            self.sequence_mapper.learn_sequences_up_to_month(current_month)
+            results[q] = self._score_practices(
+                team_matrix,
+                current_idx,
+                current_month,
+                similar_teams,
+                top_n,
+                similarity_weight,
+                recent_improvements_months,
+            )
+
+        return results
+
+    def is_valid_baseline_month(self, current_month: int) -> bool:
+        """
+        Check whether a month can be used as a recommendation baseline at all.
+
+        Similar teams are searched in months before the baseline, so the globally first
+        month can never produce recommendations (and is also rejected outright unless
+        allow_first_three_months is set). Callers with many queries can skip such months
+        up front instead of catching the ValueError from recommend().
+
+        Args:
+            current_month (int): Baseline month (yyyymmdd format)
+
+        Returns:
+            bool: True if at least one month of the dataset precedes current_month
+        """
+        return bool(np.searchsorted(self.processor.months_array, current_month, side="left"))
+
+    def _check_baseline_month(self, current_month: int) -> None:
+        """
+        Reject the globally first month as a recommendation baseline.
+
+        Validate minimum data requirement: need at least 2 months of history.
+        Month 2 can be used as baseline to predict month 3, but month 1 cannot.
+
+        Args:
+            current_month (int): Baseline month (yyyymmdd format)
+
+        Raises:
+            ValueError: If current_month is the first month of the dataset
+        """
+        all_months = sorted(self.processor.get_all_months())
+        if len(all_months) >= 2:
+            first_month = set(all_months[:1])  # Only filter month 1
+            if current_month in first_month:
+                raise ValueError(
+                    f"Need at least 2 months of historical data. "
+                    f"Month to predict starts from month 3 onwards. "
+                    f"Baseline month {current_month} is the first month."
+                )
+
+    def _score_practices(
+        self,
+        team_matrix: np.ndarray,
+        current_idx: int,
+        current_month: int,
+        similar_teams: list,
+        top_n: int,
+        similarity_weight: float,
+        recent_improvements_months: int,
+    ) -> list:
+        """
+        Score and rank practices for one team (Steps 2-6 of recommend()).
+
+        Expects sequences to be learned up to current_month already.
+
+        Args:
+            team_matrix (np.ndarray): Target team's matrix from processor.get_team_matrix()
+            current_idx (int): Row of current_month in team_matrix
+            current_month (int): Baseline month (yyyymmdd format)
+            similar_teams (list): (team_name, similarity_score, historical_month) tuples
+            top_n (int): Number of recommendations to return
+            similarity_weight (float): Weight for similarity vs sequences (0.0-1.0)
+            recent_improvements_months (int): Months to check back for recent improvements
+
+        Returns:
+            list: (practice_name, score, current_level) tuples, best first
+        """
+        current_scores = team_matrix[current_idx]
+
         # Step 2: See what similar teams improved
         # Note: similar_teams now returns (team_name, similarity_score, historical_month)
         # IMPORTANT: Only use past data - check what similar teams improved from their
@@ -155,82 +319,38 @@ class RecommendationEngine:
         # happen every month.
         similarity_scores = defaultdict(float)  # Track similarity-based scores separately
 
+        practices = self.practices
+        locate_month = self._locate_month
+        max_months_ahead = 3
         for similar_team, similarity_weight, historical_month in similar_teams:
             try:
-                similar_history = self.processor.get_team_history(similar_team)
-
                 # Get the similar team's state when they were similar (at historical_month)
-                if historical_month not in similar_history:
-                    continue
-
-                similar_state_at_historical = similar_history[historical_month]
-
-                # Get the similar team's months in chronological order
-                similar_months = sorted(similar_history.keys())
-                hist_idx = similar_months.index(historical_month)
-
-                # Check up to 3 months ahead (but only use months <= current_month)
-                # This captures improvements that don't happen every month
-                max_months_ahead = 3
-                best_improvements = {}  # Track max improvement per practice across 1-3 months
-
-                for months_ahead in range(1, max_months_ahead + 1):
-                    if hist_idx + months_ahead >= len(similar_months):
-                        break  # No more months available
+                similar_months, similar_matrix, hist_idx = locate_month(similar_team, historical_month)
+            except ValueError:
+                continue
 
-                    similar_future_month = similar_months[hist_idx + months_ahead]
+            # Check up to 3 months ahead (but only use months <= current_month)
+            # This captures improvements that don't happen every month.
+            # CRITICAL: Only use improvements that occurred before or at current_month
+            # This ensures we only use past data for predictions (no data leakage)
+            ahead = similar_months[hist_idx + 1 : hist_idx + 1 + max_months_ahead]
+            num_ahead = int(np.searchsorted(ahead, current_month, side="right"))
+            if not num_ahead:
+                continue
 
-                    # CRITICAL: Only use improvements that occurred before or at current_month
-                    # This ensures we only use past data for predictions (no data leakage)
-                    if similar_future_month > current_month:
-                        break  # Stop checking future months
+            # Keep the maximum improvement per practice across all checked months (1-3)
+            future_states = similar_matrix[hist_idx + 1 : hist_idx + 1 + num_ahead]
+            best_improvements = (future_states - similar_matrix[hist_idx]).max(axis=0)
 
-                    similar_state_at_future = similar_history[similar_future_month]
-
-                    # Find what this team improved from historical_month to this future month
-                    for j, (hist_state, future_state) in enumerate(
-                        zip(similar_state_at_historical, similar_state_at_future)
-                    ):
-                        if future_state > hist_state:  # Improved
-                            practice_name = self.practices[j]
-                            improvement_magnitude = future_state - hist_state
-
-                            # Keep the maximum improvement across all checked months (1-3)
-                            if (
-                                practice_name not in best_improvements
-                                or improvement_magnitude > best_improvements[practice_name]
-                            ):
-                                best_improvements[practice_name] = improvement_magnitude
-
-                # Add the best improvements found (weighted by similarity)
-                for practice_name, improvement_magnitude in best_improvements.items():
-                    similarity_scores[practice_name] += similarity_weight * improvement_magnitude
-            except (KeyError, ValueError, IndexError):
-                continue
+            # Add the best improvements found (weighted by similarity)
+            for j in np.flatnonzero(best_improvements > 0):
+                similarity_scores[practices[j]] += similarity_weight * best_improvements[j]
 
         # Step 3: Add sequence boost
         # If target recently improved something (in the last N months), boost related practices
         # Note: sequences are now learned up to current_month, so this uses time-limited sequences
         # Check the last N months (or as many as available) to find recent improvements
-        recently_improved_practices = set()  # Track practices improved in last N months to avoid double-counting
-
-        # Check up to N months back (or as many as available)
-        months_to_check = min(recent_improvements_months, current_idx)
-        for months_back in range(1, months_to_check + 1):
-            if current_idx - months_back < 0:
-                break
-
-            past_month = months_list[current_idx - months_back]
-            past_scores = history[past_month]
-
-            # Compare past month to current month to find improvements
-            for j, (past, curr) in enumerate(zip(past_scores, current_scores)):
-                if curr > past:  # Improved from past_month to current_month
-                    practice_name = self.practices[j]
-                    # Only add if we haven't already seen this improvement
-                    # (practices improved in multiple months will only be counted once)
-                    if practice_name not in recently_improved_practices:
-                        recently_improved_practices.add(practice_name)
+        recently_improved_practices = self._recently_improved(team_matrix, current_idx, recent_improvements_months)
 
         # Apply sequence patterns for all recently improved practices
         # Iterate in canonical practice order (not set iteration order, which is hash-seed
@@ -277,9 +397,9 @@ class RecommendationEngine:
         # Find max score for final normalization (should be <= 1.0, but normalize to be safe)
         max_score = max(practices_scores.values()) if practices_scores else 1.0
 
+        practice_idx = self._practice_idx
         for practice, score in practices_scores.items():
-            practice_idx = self.practices.index(practice)
-            current_level = float(current_scores[practice_idx])
+            current_level = float(current_scores[practice_idx[practice]])
 
             # Skip if already maxed out (score >= 1.0 since normalized to 0-1)
             if current_level >= 1.0:
@@ -318,31 +438,9 @@ class RecommendationEngine:
         # This ensures sequences are only learned from months < current_month
         self.sequence_mapper.learn_sequences_up_to_month(current_month)
 
-        # Get team history to check for recent improvements
-        history = self.processor.get_team_history(target_team)
-        if current_month not in history:
-            raise ValueError(f"Team '{target_team}' has no data for month {current_month}")
-
-        months_list = sorted(history.keys())
-        current_idx = months_list.index(current_month)
-        current_scores = history[current_month]
-
-        # Check if sequence boost applies (similar to recommend method)
-        recently_improved_practices = set()
-        months_to_check = min(recent_improvements_months, current_idx)
-        for months_back in range(1, months_to_check + 1):
-            if current_idx - months_back < 0:
-                break
-
-            past_month = months_list[current_idx - months_back]
-            past_scores = history[past_month]
-
-            # Compare past month to current month to find improvements
-            for j, (past, curr) in enumerate(zip(past_scores, current_scores)):
-                if curr > past:  # Improved from past_month to current_month
-                    practice_name = self.practices[j]
-                    if practice_name not in recently_improved_practices:
-                        recently_improved_practices.add(practice_name)
+        # Get team history to check for recent improvements (similar to recommend method)
+        _, team_matrix, current_idx = self._locate_month(target_team, current_month)
+        recently_improved_practices = self._recently_improved(team_matrix, current_idx, recent_improvements_months)
 
         # Check if the target practice gets a sequence boost from recently improved practices
         has_sequence_boost = False
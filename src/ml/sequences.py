@@ -4,6 +4,8 @@ SequenceMapper: Learn first-order Markov chain improvement sequences.
 
 from collections import Counter, defaultdict
 
+import numpy as np
+
 
 class SequenceMapper:
     """Learn and map sequences of practice improvements across the organization."""
@@ -18,11 +20,48 @@ class SequenceMapper:
         """
         self.processor = processor
         self.practices = practices
-        self.transition_matrix = defaultdict(Counter)
-        self.practice_improvement_freq = Counter()
+        self._practice_idx = {practice: i for i, practice in enumerate(practices)}
+        # Dense counts indexed by practice position: _trans[i, j] = transitions i -> j,
+        # _freq[i] = number of improvement-bearing steps in which practice i improved
+        self._trans = np.zeros((len(practices), len(practices)), dtype=np.int64)
+        self._freq = np.zeros(len(practices), dtype=np.int64)
         self.learned = False
-        # Cache for time-limited sequences: {max_month: (transition_matrix, practice_improvement_freq)}
+        # Cache for time-limited sequences: {max_month: (trans, freq)}
         self._sequence_cache = {}
+        # Cutoff the current counts were learned for (None after a full learn_sequences()),
+        # so re-learning the same cutoff is a no-op
+        self._learned_up_to = None
+        # Bumped whenever cached snapshots are discarded, so callers memoizing results
+        # derived from learned sequences can tell stale entries apart
+        self.version = 0
+
+    @property
+    def transition_matrix(self) -> defaultdict:
+        """
+        Learned transitions as nested counters: transition_matrix[from][to] = count.
+
+        Built on access from the dense count matrix, listing practices in canonical
+        order; only practices with at least one outgoing transition appear as keys.
+        The result is a snapshot - mutating it does not change the mapper's state.
+
+        Returns:
+            defaultdict: Mapping of from_practice -> Counter(to_practice -> count)
+        """
+        matrix = defaultdict(Counter)
+        for i, j in zip(*np.nonzero(self._trans)):
+            matrix[self.practices[i]][self.practices[j]] = int(self._trans[i, j])
+        return matrix
+
+    @property
+    def practice_improvement_freq(self) -> Counter:
+        """
+        How often each practice improved, as a Counter snapshot of the dense counts.
+
+        Returns:
+            Counter: Mapping of practice -> improvement count (practices that never
+                improved are omitted)
+        """
+        return Counter({self.practices[i]: int(self._freq[i]) for i in np.flatnonzero(self._freq)})
 
     def learn_sequences(self) -> None:
         """
@@ -48,8 +87,8 @@ class SequenceMapper:
         learned patterns.
 
         Returns:
-            None: Modifies internal state (self.transition_matrix and
-                self.practice_improvement_freq). Sets self.learned = True.
+            None: Modifies internal state (the dense counts behind self.transition_matrix
+                and self.practice_improvement_freq). Sets self.learned = True.
 
         Note:
             - Only considers improvements (increases in practice scores)
@@ -63,60 +102,61 @@ class SequenceMapper:
             Learning improvement sequences...
             Learned 45 transition patterns
         """
-        self.transition_matrix = defaultdict(Counter)
-        self.practice_improvement_freq = Counter()
-
-        teams = self.processor.get_all_teams()
-        months = self.processor.get_all_months()
-
-        for team in teams:
-            history = self.processor.get_team_history(team)
+        self._trans = np.zeros((len(self.practices), len(self.practices)), dtype=np.int64)
+        self._freq = np.zeros(len(self.practices), dtype=np.int64)
 
-            # Sort months for this team
-            team_months = sorted([m for m in months if m in history])
-
-            self._learn_team_transitions(team_months, history)
+        self._learn_month_prefix(len(self.processor.months_array))
 
         self.learned = True
+        self._learned_up_to = None
 
-    def _learn_team_transitions(self, team_months: list, history: dict) -> None:
+    def _learn_month_prefix(self, num_months: int) -> None:
         """
-        Build first-order Markov transitions for one team's chronological history.
-
-        Mutates self.transition_matrix and self.practice_improvement_freq in place.
+        Learn all teams' first-order Markov transitions from the first num_months months.
+
+        Works on the processor's (team, month, practice) history tensor in one fused,
+        vectorized pass instead of a per-team loop:
+        1. Gather every available (team, month) vector before the cutoff, team-major and
+           chronological, so each team's history is a contiguous run of rows
+        2. Compare each row to the previous one; pairs that straddle two teams are masked
+           out, leaving one "improved practices" row per consecutive month pair
+        3. Keep only improvement-bearing steps (rows with at least one improvement); their
+           column sums are the improvement frequencies
+        4. Pair each step with the next step of the same team; summing the outer products
+           of those pairs is a single matrix product, prev_steps.T @ next_steps, which
+           gives the full cross-product between consecutive steps (no edges within a step)
+
+        Mutates self._trans and self._freq in place.
 
         Args:
-            team_months (list): Sorted months available for this team.
-            history (dict): Mapping of month -> practice score vector for this team.
+            num_months (int): Number of leading columns of processor.months_array to use
+                (i.e. only months < months_array[num_months] contribute)
         """
-        # Chronological list of practice-name sets, one per improvement-bearing step
-        # (steps with zero improvements are skipped, so "next" always means "the next
-        # time something actually improved," not just the next calendar month)
-        improved_sets = []
-
-        for i in range(len(team_months) - 1):
-            current_vector = history[team_months[i]]
-            next_vector = history[team_months[i + 1]]
-
-            improved = [
-                self.practices[j]
-                for j, (curr, nxt) in enumerate(zip(current_vector, next_vector))
-                if nxt > curr  # Improved
-            ]
-
-            if improved:
-                improved_sets.append(improved)
-
-        for practices_improved in improved_sets:
-            for practice_name in practices_improved:
-                self.practice_improvement_freq[practice_name] += 1
-
-        # Full cross-product between each improvement-bearing step and the next one;
-        # no edges within a step, since simultaneous improvements have no known order
-        for prev_set, next_set in zip(improved_sets, improved_sets[1:]):
-            for prev_practice in prev_set:
-                for next_practice in next_set:
-                    self.transition_matrix[prev_practice][next_practice] += 1
+        available = self.processor.team_month_mask[:, :num_months]
+        rows = self.processor.history_tensor[:, :num_months][available]  # (N, P)
+        row_teams = np.nonzero(available)[0]
+
+        if len(rows) < 2:
+            return
+
+        # Improvements between consecutive available months of the same team
+        improved = rows[1:] > rows[:-1]
+        improved &= (row_teams[1:] == row_teams[:-1])[:, None]
+
+        # Improvement-bearing steps only (steps with zero improvements are skipped, so
+        # "next" always means "the next time something actually improved")
+        has_improvement = improved.any(axis=1)
+        steps = improved[has_improvement]
+        step_teams = row_teams[1:][has_improvement]
+
+        self._freq += steps.sum(axis=0)
+
+        same_team = step_teams[1:] == step_teams[:-1]
+        if same_team.any():
+            # Counts stay exact in float64; the float product runs on multithreaded BLAS
+            prev_steps = steps[:-1][same_team].astype(np.float64)
+            next_steps = steps[1:][same_team].astype(np.float64)
+            self._trans += (prev_steps.T @ next_steps).astype(np.int64)
 
     def learn_sequences_up_to_month(self, max_month: int) -> None:
         """
@@ -124,56 +164,71 @@ class SequenceMapper:
         including) max_month. See learn_sequences() for the transition-construction algorithm;
         this variant restricts each team's month history to months < max_month before applying
         it, so no transition can straddle the max_month boundary. Uses caching to avoid
-        recomputation.
+        recomputation: cached counts are frozen (read-only) arrays that are shared by
+        reference, so a cache hit is O(1) instead of a copy. Calling it again with the
+        cutoff that is already loaded returns immediately.
 
         Args:
             max_month (int): Maximum month (exclusive) - sequences learned from months < max_month
         """
+        # Already learned for this cutoff
+        if max_month == self._learned_up_to:
+            return
+
         # Check cache first
         if max_month in self._sequence_cache:
-            cached_transition_matrix, cached_practice_improvement_freq = self._sequence_cache[max_month]
-            # Create copies to avoid mutation issues
-            self.transition_matrix = defaultdict(Counter)
-            for k, v in cached_transition_matrix.items():
-                self.transition_matrix[k] = Counter(v)
-            self.practice_improvement_freq = Counter(cached_practice_improvement_freq)
+            # Cached arrays are read-only, so they can be shared without copying
+            self._trans, self._freq = self._sequence_cache[max_month]
             self.learned = True
+            self._learned_up_to = max_month
             return
 
         # Clear previous state
-        self.transition_matrix = defaultdict(Counter)
-        self.practice_improvement_freq = Counter()
+        self._trans = np.zeros((len(self.practices), len(self.practices)), dtype=np.int64)
+        self._freq = np.zeros(len(self.practices), dtype=np.int64)
 
-        teams = self.processor.get_all_teams()
-        months = self.processor.get_all_months()
+        # Month columns < max_month form a prefix of the sorted month array
+        cutoff = np.searchsorted(self.processor.months_array, max_month, side="left")
 
-        # Filter months to only those < max_month
-        available_months = [m for m in months if m < max_month]
-
-        if len(available_months) < 2:
+        if cutoff < 2:
             # Need at least 2 months to learn transitions
             self.learned = True
             # Cache empty result
-            self._sequence_cache[max_month] = (defaultdict(Counter), Counter())
+            self._cache_snapshot(max_month)
             return
 
-        for team in teams:
-            history = self.processor.get_team_history(team)
+        self._learn_month_prefix(cutoff)
+
+        self.learned = True
 
-            # Sort months for this team, but only include months < max_month
-            team_months = sorted([m for m in available_months if m in history])
+        self._cache_snapshot(max_month)
 
-            self._learn_team_transitions(team_months, history)
+    def clear_cache(self) -> None:
+        """
+        Discard all cached time-limited sequences and bump the sequence version.
 
-        self.learned = True
+        Call this if the underlying processor data changes; the next
+        learn_sequences_up_to_month() call relearns from scratch.
+        """
+        self._sequence_cache = {}
+        self._learned_up_to = None
+        self.version += 1
 
-        # Cache the result (create deep copies to avoid mutation issues)
-        cached_transition_matrix = defaultdict(Counter)
-        for k, v in self.transition_matrix.items():
-            cached_transition_matrix[k] = Counter(v)
-        cached_practice_improvement_freq = Counter(self.practice_improvement_freq)
+    def _cache_snapshot(self, max_month: int) -> None:
+        """
+        Freeze the current counts and cache them for max_month.
 
-        self._sequence_cache[max_month] = (cached_transition_matrix, cached_practice_improvement_freq)
+        The arrays are marked read-only rather than copied: every learning pass
+        allocates fresh arrays, so nothing writes to a snapshot once it is cached,
+        and accidental in-place writes fail loudly instead of corrupting the cache.
+
+        Args:
+            max_month (int): Cache key (exclusive month cutoff)
+        """
+        self._trans.flags.writeable = False
+        self._freq.flags.writeable = False
+        self._sequence_cache[max_month] = (self._trans, self._freq)
+        self._learned_up_to = max_month
 
     def get_typical_next_practices(self, practice: str, top_n: int = 3) -> list:
         """
@@ -192,16 +247,30 @@ class SequenceMapper:
         if not self.learned:
             raise ValueError("Sequences not learned. Call learn_sequences() first.")
 
-        if practice not in self.transition_matrix:
+        idx = self._practice_idx.get(practice)
+        if idx is None:
             return []
 
-        transitions = self.transition_matrix[practice].most_common(top_n)
-        total = sum(self.transition_matrix[practice].values())
+        row = self._trans[idx]
+        total = row.sum()
 
         if total == 0:
             return []
 
-        return [(p, count / total) for p, count in transitions]
+        k = min(top_n, np.count_nonzero(row))
+        if k <= 0:
+            return []
+
+        # Partition instead of fully sorting the row: find the k-th largest count, take
+        # everything above it plus the earliest ties at it (canonical practice order),
+        # then order just those k entries by count (stable, so ties stay canonical)
+        threshold = -np.partition(-row, k - 1)[k - 1]
+        above = np.flatnonzero(row > threshold)
+        ties = np.flatnonzero(row == threshold)[: k - above.size]
+        top = np.concatenate((above, ties))
+        top = top[np.argsort(-row[top], kind="stable")]
+
+        return [(self.practices[j], float(row[j] / total)) for j in top]
 
     def get_improvement_frequency(self) -> dict:
         """
@@ -213,7 +282,10 @@ class SequenceMapper:
         if not self.learned:
             raise ValueError("Sequences not learned. Call learn_sequences() first.")
 
-        return dict(self.practice_improvement_freq.most_common())
+        # Most improved first; ties keep canonical practice order (stable sort)
+        order = np.argsort(-self._freq, kind="stable")[: np.count_nonzero(self._freq)]
+
+        return {self.practices[i]: int(self._freq[i]) for i in order}
 
     def get_sequence_stats(self) -> dict:
         """
@@ -225,17 +297,22 @@ class SequenceMapper:
         if not self.learned:
             return {"status": "not_learned"}
 
-        total_transitions = sum(sum(v.values()) for v in self.transition_matrix.values())
+        total_transitions = int(self._trans.sum())
+        # A "transition type" is a source practice with at least one outgoing transition
+        num_transition_types = int(np.count_nonzero(self._trans.sum(axis=1)))
+
+        most_improved = None
+        if self._freq.any():
+            top = int(self._freq.argmax())
+            most_improved = (self.practices[top], int(self._freq[top]))
 
         return {
-            "num_transition_types": len(self.transition_matrix),
+            "num_transition_types": num_transition_types,
             "total_transitions": total_transitions,
-            "practices_that_improved": len(self.practice_improvement_freq),
-            "most_improved_practice": self.practice_improvement_freq.most_common(1)[0]
-            if self.practice_improvement_freq
-            else None,
+            "practices_that_improved": int(np.count_nonzero(self._freq)),
+            "most_improved_practice": most_improved,
             "avg_transitions_per_type": (
-                total_transitions / len(self.transition_matrix) if self.transition_matrix else 0
+                total_transitions / num_transition_types if num_transition_types else 0
             ),
         }
 
@@ -254,14 +331,12 @@ class SequenceMapper:
             return []
 
         sequences = []
+        row_totals = self._trans.sum(axis=1)
 
-        for from_practice, transitions in self.transition_matrix.items():
-            total_from = sum(transitions.values())
-
-            for to_practice, count in transitions.items():
-                if count >= min_count:
-                    probability = count / total_from if total_from > 0 else 0
-                    sequences.append((from_practice, to_practice, count, probability))
+        for i, j in zip(*np.nonzero(self._trans >= max(min_count, 1))):
+            count = int(self._trans[i, j])
+            probability = count / int(row_totals[i])
+            sequences.append((self.practices[i], self.practices[j], count, probability))
 
         # Sort by count (descending), then by probability (descending)
         sequences.sort(key=lambda x: (-x[2], -x[3]))
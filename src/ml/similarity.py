@@ -3,7 +3,7 @@ SimilarityEngine: Calculate similarity between teams using cosine similarity.
 """
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy.linalg.blas import dsyrk
 
 
 class SimilarityEngine:
@@ -19,6 +19,57 @@ class SimilarityEngine:
         self.processor = processor
         self.similarity_matrix = None
         self.teams = None
+        # Normalized index over every (team, month) vector, built lazily by _get_index()
+        self._index = None
+
+    def _get_index(self) -> dict:
+        """
+        Get (building on first use) the normalized index of all team/month vectors.
+
+        Rows are ordered month-major, then by team in get_all_teams() order - the same
+        order a scan over past months and teams visits them - so "months < X" is a row
+        prefix and the first row of a team is its earliest snapshot. Team histories do not
+        change after processing, so every vector is normalized exactly once. Zero vectors
+        stay zero, so they score 0.0 against everything, as in cosine_similarity.
+
+        Returns:
+            dict: Index with keys:
+                - units: (N, P) float64 unit vectors (or zero vectors)
+                - row_team: (N,) team index of each row
+                - row_month: (N,) month (yyyymmdd) of each row
+                - row_of: {(team_idx, month): row} lookup
+                - team_idx: {team_name: team_idx} lookup
+                - teams: team names in get_all_teams() order
+        """
+        if self._index is None:
+            teams = self.processor.get_all_teams()
+            months = self.processor.months_array
+            month_idx, team_idx = np.nonzero(self.processor.team_month_mask.T)
+
+            vectors = self.processor.history_tensor[team_idx, month_idx]
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            units = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+            row_month = months[month_idx]
+            self._index = {
+                "units": units,
+                "row_team": team_idx,
+                "row_month": row_month,
+                "row_of": {(t, m): row for row, (t, m) in enumerate(zip(team_idx.tolist(), row_month.tolist()))},
+                "team_idx": {team: i for i, team in enumerate(teams)},
+                "teams": teams,
+            }
+        return self._index
+
+    def warm_up(self) -> None:
+        """
+        Build the similarity index ahead of time.
+
+        The index is otherwise built by the first similarity query; long-running servers
+        call this in a background thread at startup so no request pays that cost. A query
+        racing it just builds an identical index, so no locking is needed.
+        """
+        self._get_index()
 
     def build_similarity_matrix(self, target_month: int) -> np.ndarray:
         """
@@ -76,9 +127,14 @@ class SimilarityEngine:
         if not vectors:
             raise ValueError(f"No data available for month {target_month}")
 
-        # Calculate cosine similarity
-        vectors = np.array(vectors)
-        self.similarity_matrix = cosine_similarity(vectors)
+        # Calculate cosine similarity: normalize rows (zero rows stay zero), then form the
+        # Gram matrix with a symmetric rank-k update, which computes only the upper triangle
+        # (about half the FLOPs of a full product), and mirror it into the lower triangle
+        vectors = np.array(vectors, dtype=np.float64)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        normed = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        upper = dsyrk(1.0, normed)
+        self.similarity_matrix = np.triu(upper) + np.triu(upper, k=1).T
         self.teams = valid_teams
 
         return self.similarity_matrix
@@ -110,60 +166,91 @@ class SimilarityEngine:
         if target_month not in target_history:
             raise ValueError(f"Team '{target_team}' has no data for month {target_month}")
 
-        target_vector = target_history[target_month]
-        target_vector = np.array(target_vector).reshape(1, -1)
-
-        # Get all past months (months < target_month)
-        all_months = self.processor.get_all_months()
-        past_months = [m for m in all_months if m < target_month]
-
-        if not past_months:
+        # Past months (months < target_month) must exist
+        if not np.searchsorted(self.processor.months_array, target_month, side="left"):
             raise ValueError(f"No past months available before {target_month}")
 
-        # Collect all similarity comparisons across all past months
-        all_similarities = []
-
-        for historical_month in past_months:
-            # Get all teams that have data for this historical month
-            all_teams = self.processor.get_all_teams()
+        unique_similarities = self.find_similar_teams_batch([(target_team, target_month)], k, min_similarity)[0]
 
-            for team in all_teams:
-                # Skip the target team itself
-                if team == target_team:
-                    continue
-
-                team_history = self.processor.get_team_history(team)
-                if historical_month not in team_history:
-                    continue
-
-                # Get team's practice vector at historical month
-                team_vector = team_history[historical_month]
-                team_vector = np.array(team_vector).reshape(1, -1)
+        if not unique_similarities:
+            raise ValueError(f"No similar teams found for '{target_team}' in past months")
 
-                # Calculate cosine similarity
-                similarity = cosine_similarity(target_vector, team_vector)[0][0]
+        return unique_similarities
 
-                # Filter by minimum similarity threshold
-                if similarity >= min_similarity:
-                    # Store: (team_name, similarity_score, historical_month)
-                    all_similarities.append((team, float(similarity), historical_month))
+    def find_similar_teams_batch(self, queries: list, k: int = 5, min_similarity: float = 0.0) -> list:
+        """
+        Find K most similar teams for many (team, month) queries at once.
 
-        if not all_similarities:
-            raise ValueError(f"No similar teams found for '{target_team}' in past months")
+        Same semantics as find_similar_teams() - each query is compared against all other
+        teams' states at all months before its target month, deduplicated to the best
+        (earliest on ties) snapshot per team, sorted by similarity descending - but all
+        query similarities come from one matrix product against the normalized index
+        instead of a per-pair loop.
 
-        # Deduplicate by team name - keep only the entry with highest similarity for each team
-        # This ensures we get K different teams, not the same team at different months
-        team_best_similarity = {}
-        for team, similarity, historical_month in all_similarities:
-            if team not in team_best_similarity or similarity > team_best_similarity[team][1]:
-                team_best_similarity[team] = (team, similarity, historical_month)
+        Args:
+            queries (list): List of (target_team, target_month) tuples
+            k (int): Number of similar teams to return per query
+            min_similarity (float): Minimum similarity threshold (0.0-1.0, default 0.0 = no filter)
 
-        # Convert to list and sort by similarity score (descending)
-        unique_similarities = list(team_best_similarity.values())
-        unique_similarities.sort(key=lambda x: x[1], reverse=True)
+        Returns:
+            list: One entry per query, in query order: a list of (team_name,
+                similarity_score, historical_month) tuples as returned by
+                find_similar_teams(). Queries with no past months or no team above
+                min_similarity get an empty list instead of raising.
 
-        # Return top K different teams
-        return unique_similarities[:k]
+        Raises:
+            ValueError: If a query's team is unknown or has no data for its month
+        """
+        index = self._get_index()
+        teams = index["teams"]
+        row_team = index["row_team"]
+        row_month = index["row_month"]
+
+        query_rows = []
+        for target_team, target_month in queries:
+            if target_month not in self.processor.get_team_history(target_team):
+                raise ValueError(f"Team '{target_team}' has no data for month {target_month}")
+            query_rows.append(index["row_of"][(index["team_idx"][target_team], target_month)])
+
+        if not query_rows:
+            return []
+
+        # (Nq, N) cosine similarities of every query against every indexed snapshot, clipped
+        # to the cosine range so rounding never reports e.g. 1.0000000000000002
+        similarities = index["units"][query_rows] @ index["units"].T
+        np.clip(similarities, -1.0, 1.0, out=similarities)
+
+        results = []
+        for q, (target_team, target_month) in enumerate(queries):
+            # Rows are month-major, so snapshots from months < target_month are a prefix
+            num_past = np.searchsorted(row_month, target_month, side="left")
+            sims = similarities[q, :num_past]
+
+            # Skip the target team itself and filter by minimum similarity threshold
+            candidates = np.flatnonzero(
+                (row_team[:num_past] != index["team_idx"][target_team]) & (sims >= min_similarity)
+            )
+            if not candidates.size:
+                results.append([])
+                continue
+
+            # Keep only the highest similarity per team (earliest month wins ties), so we
+            # get K different teams, not the same team at different months
+            cand_teams = row_team[candidates]
+            order = np.lexsort((candidates, -sims[candidates], cand_teams))
+            is_best = np.r_[True, cand_teams[order][1:] != cand_teams[order][:-1]]
+            best_rows = candidates[order][is_best]
+
+            # Sort by similarity score (descending); equal scores keep the order in which
+            # teams first appeared in the scan
+            _, first_seen = np.unique(cand_teams, return_index=True)
+            best_rows = best_rows[np.lexsort((first_seen, -sims[best_rows]))][:k]
+
+            results.append(
+                [(teams[row_team[row]], float(sims[row]), int(row_month[row])) for row in best_rows]
+            )
+
+        return results
 
     def get_similarity_stats(self) -> dict:
         """
@@ -175,13 +262,23 @@ class SimilarityEngine:
         if self.similarity_matrix is None:
             return {"status": "not_built"}
 
-        # Exclude diagonal (self-similarities = 1.0)
-        upper_triangle = self.similarity_matrix[np.triu_indices_from(self.similarity_matrix, k=1)]
+        # Exclude diagonal (self-similarities = 1.0); a boolean mask gathers the upper
+        # triangle in one pass without materializing two N^2/2 index arrays
+        n = self.similarity_matrix.shape[0]
+        upper_triangle = self.similarity_matrix[np.triu(np.ones((n, n), dtype=bool), k=1)]
+
+        min_similarity = upper_triangle.min()
+        max_similarity = upper_triangle.max()
+
+        # Mean and std from a single sum and sum of squares: Var = E[X^2] - E[X]^2
+        count = upper_triangle.size
+        mean_similarity = upper_triangle.sum() / count
+        variance = max(np.dot(upper_triangle, upper_triangle) / count - mean_similarity**2, 0.0)
 
         return {
             "num_teams": len(self.teams),
-            "mean_similarity": float(np.mean(upper_triangle)),
-            "std_similarity": float(np.std(upper_triangle)),
-            "min_similarity": float(np.min(upper_triangle)),
-            "max_similarity": float(np.max(upper_triangle)),
+            "mean_similarity": float(mean_similarity),
+            "std_similarity": float(np.sqrt(variance)),
+            "min_similarity": float(min_similarity),
+            "max_similarity": float(max_similarity),
         }
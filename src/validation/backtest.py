@@ -3,14 +3,84 @@ BacktestEngine: Validate recommendations against historical data.
 """
 
 import logging
+import math
+from collections import OrderedDict
 from collections.abc import Callable
 
-from scipy.special import comb
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 
 from .metrics import MetricsCalculator
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of memoized recommendation lists kept by a BacktestEngine
+REC_CACHE_SIZE = 8192
+
+# Arrays at least this large are handed to joblib workers as read-only memory maps of
+# one shared temp file instead of being pickled into every worker (joblib max_nbytes)
+SHARED_ARRAY_MIN_BYTES = "64K"
+
+# Per-month metrics whose run-level value is the average over months
+AVERAGED_METRICS = ("accuracy", "popularity_accuracy", "precision", "recall", "mrr")
+
+
+def _recommendation_kwargs(params: tuple) -> dict:
+    """
+    Expand a recommendation parameter tuple into recommender keyword arguments.
+
+    Args:
+        params (tuple): (top_n, k_similar, similarity_weight, similar_teams_lookahead_months,
+            recent_improvements_months, min_similarity_threshold)
+
+    Returns:
+        dict: Keyword arguments for recommend() / recommend_batch(). allow_first_three_months
+            is always True: in backtest we may use month 2 to predict month 3, which is
+            valid for validation purposes
+    """
+    top_n, k_similar, similarity_weight, lookahead, recent, min_similarity = params
+    return {
+        "top_n": top_n,
+        "k_similar": k_similar,
+        "allow_first_three_months": True,
+        "similarity_weight": similarity_weight,
+        "similar_teams_lookahead_months": lookahead,
+        "recent_improvements_months": recent,
+        "min_similarity_threshold": min_similarity,
+    }
+
+
+def _pack_rows(mask: np.ndarray) -> list:
+    """
+    Pack each row of a boolean matrix into an int bitmask (bit j = column j).
+
+    Args:
+        mask (np.ndarray): (R, P) boolean matrix
+
+    Returns:
+        list: R Python ints, for cheap set-style tests (&, |, bit_count()) per row
+    """
+    packed = np.packbits(mask, axis=1, bitorder="little")
+    return [int.from_bytes(row.tobytes(), "little") for row in packed]
+
+
+def _recommend_chunk(recommender, queries: list, params: tuple) -> list:
+    """
+    Run recommender.recommend_batch() for a chunk of (team, prev_month) queries.
+
+    Module-level so joblib can pickle it for worker processes.
+
+    Args:
+        recommender: RecommendationEngine instance (a copy, in a worker process)
+        queries (list): List of (team, prev_month) tuples
+        params (tuple): Recommendation parameters, as for BacktestEngine._recommend_cached()
+
+    Returns:
+        list: One entry per query: the recommendation list, or the ValueError recommend()
+            would have raised
+    """
+    return recommender.recommend_batch(queries, **_recommendation_kwargs(params))
+
 
 class BacktestEngine:
     """Run backtest validation using historical data."""
@@ -25,6 +95,96 @@ class BacktestEngine:
         """
         self.recommender = recommender_engine
         self.processor = processor
+        # LRU memo of recommend() results: {(team, prev_month, sequence_version, params): list}
+        self._rec_cache: OrderedDict[tuple, list] = OrderedDict()
+        # Per-team ({month: row}, sorted months, matrix) from processor.get_team_matrix(),
+        # rebuilt once by run_backtest()
+        self._team_months: dict[str, tuple[dict, list, np.ndarray]] = {}
+
+    @staticmethod
+    def _random_baseline(n: int, k_avg: float, top_n: int) -> float:
+        """
+        Probability that a random top-N pick contains at least one correct practice.
+
+        P(at least one correct) = 1 - C(n-k_avg, top_n) / C(n, top_n), evaluated as the
+        product prod_{i<top_n} (n-k_avg-i) / (n-i), which is exact for integer k_avg and
+        extends smoothly to the fractional average k_avg used here. (scipy's exact comb()
+        rejects a fractional k_avg.)
+
+        Args:
+            n (int): Total number of practices.
+            k_avg (float): Average number of practices improved per case.
+            top_n (int): Number of recommendations drawn.
+
+        Returns:
+            float: Random baseline hit rate (0-1).
+        """
+        if n <= 0 or k_avg <= 0 or top_n <= 0:
+            return 0.0
+        if k_avg > n or top_n > n:
+            # Edge case: use simple approximation
+            return min(1.0, (k_avg / n) * top_n)
+
+        p_none = 1.0
+        for i in range(top_n):
+            p_none *= max(0.0, n - k_avg - i) / (n - i)
+        return 1.0 - p_none
+
+    def _recommend_cached(self, team: str, prev_month: int, params: tuple) -> list:
+        """
+        Call recommender.recommend() for one team, memoizing the result.
+
+        recommend() learns sequences up to prev_month itself, so for a fixed sequence
+        version its output depends only on (team, prev_month) and the recommendation
+        parameters. Repeated backtests with the same configuration (e.g. re-running from
+        the web UI, or an optimizer revisiting a combination) reuse earlier results instead
+        of repeating the KNN + scoring work. Failed calls are cached too, and re-raise
+        their ValueError on a hit.
+
+        Args:
+            team (str): Team to recommend for
+            prev_month (int): Baseline month (yyyymmdd format)
+            params (tuple): (top_n, k_similar, similarity_weight, similar_teams_lookahead_months,
+                recent_improvements_months, min_similarity_threshold)
+
+        Returns:
+            list: Recommendations as returned by recommender.recommend()
+
+        Raises:
+            ValueError: Propagated from recommender.recommend()
+        """
+        sequence_mapper = self.recommender.sequence_mapper
+        key = (team, prev_month, sequence_mapper.version, params)
+
+        recommendations = self._rec_cache.get(key)
+        if recommendations is not None:
+            self._rec_cache.move_to_end(key)
+            # Leave the sequence state where recommend() would have left it (the
+            # popularity baseline reads it right after this call); a cached O(1) rebind
+            sequence_mapper.learn_sequences_up_to_month(prev_month)
+            if isinstance(recommendations, ValueError):
+                raise recommendations.with_traceback(None)
+            return recommendations
+
+        try:
+            recommendations = self.recommender.recommend(team, prev_month, **_recommendation_kwargs(params))
+        except ValueError as e:
+            self._store_recommendations(key, e)
+            raise
+        self._store_recommendations(key, recommendations)
+        return recommendations
+
+    def _store_recommendations(self, key: tuple, recommendations) -> None:
+        """
+        Add one entry to the recommendation cache, evicting the least recently used.
+
+        Args:
+            key (tuple): (team, prev_month, sequence_version, params)
+            recommendations: Recommendation list, or the ValueError recommend() raised
+        """
+        self._rec_cache[key] = recommendations
+        if len(self._rec_cache) > REC_CACHE_SIZE:
+            self._rec_cache.popitem(last=False)
 
     @staticmethod
     def _expected_random_mrr(n: int, k: int, top_n: int) -> float:
@@ -48,19 +208,102 @@ class BacktestEngine:
         if n <= 0 or k <= 0 or top_n <= 0:
             return 0.0
         try:
-            denom = comb(n, k, exact=True)
+            denom = math.comb(n, k)
             if denom == 0:
                 return 0.0
             expected = 0.0
             for r in range(1, min(top_n, n) + 1):
-                numer = comb(n - r, k - 1, exact=True)
+                numer = math.comb(n - r, k - 1)
                 expected += (numer / denom) / r
             return expected
         except (ValueError, ZeroDivisionError):
             return 0.0
 
+    def _prefetch_recommendations(self, queries: list, params: tuple, n_jobs: int = 1) -> None:
+        """
+        Compute recommendations for one test month's teams in a batch and memoize them.
+
+        The uncached queries go through recommender.recommend_batch(), which finds the
+        similar teams for all of them with one matrix product. With n_jobs != 1 they are
+        split into one chunk per worker and run with joblib (process backend, so the
+        recommender is shipped once per chunk; its large arrays - history tensor,
+        similarity index - are shared read-only through memory maps rather than copied
+        into each worker, see SHARED_ARRAY_MIN_BYTES). Results - including the ValueError of
+        queries that cannot be recommended for - land in the recommendation cache, where
+        the validation loop picks them up through _recommend_cached().
+
+        Args:
+            queries (list): (team, prev_month) tuples needing recommendations
+            params (tuple): Recommendation parameters, as for _recommend_cached()
+            n_jobs (int): Number of joblib workers (negative values count back from all
+                cores, as in joblib: -1 = all cores). Defaults to 1 (in-process)
+        """
+        version = self.recommender.sequence_mapper.version
+        pending = [q for q in queries if (q[0], q[1], version, params) not in self._rec_cache]
+        if not pending:
+            return
+
+        num_chunks = min(len(pending), effective_n_jobs(n_jobs))
+        if num_chunks == 1:
+            results = _recommend_chunk(self.recommender, pending, params)
+        else:
+            chunks = [pending[i::num_chunks] for i in range(num_chunks)]
+            chunk_results = Parallel(
+                n_jobs=n_jobs, prefer="processes", max_nbytes=SHARED_ARRAY_MIN_BYTES, mmap_mode="r"
+            )(
+                delayed(_recommend_chunk)(self.recommender, chunk, params) for chunk in chunks
+            )
+            # Undo the round-robin split so results line up with pending again
+            pending = [q for chunk in chunks for q in chunk]
+            results = [r for chunk_result in chunk_results for r in chunk_result]
+
+        for (team, prev_month), recommendations in zip(pending, results):
+            self._store_recommendations((team, prev_month, version, params), recommendations)
+
+    def _build_month_tensor(self, test_month: int, teams: list) -> tuple:
+        """
+        Stack every team's baseline and validation-window vectors for one test month.
+
+        Requires the per-team month tables built at the start of run_backtest().
+
+        For each team with data for test_month and at least one earlier month, row t of the
+        tensor holds [prev, test_month, next, next + 1] from the team's own chronological
+        history (prev is the team's last month before test_month). Validation months past
+        the end of the team's history, and every row of teams without a baseline, are NaN.
+
+        Args:
+            test_month (int): Month being validated (yyyymmdd format)
+            teams (list): Teams to include, in row order
+
+        Returns:
+            tuple: (tensor, prev_months, has_baseline) where tensor is a float64 array of
+                shape (n_teams, 4, n_practices), prev_months is a list of each team's
+                baseline month (None without a baseline), and has_baseline is a bool array
+                flagging rows with a usable baseline
+        """
+        tensor = np.full((len(teams), 4, len(self.recommender.practices)), np.nan)
+        prev_months = [None] * len(teams)
+        has_baseline = np.zeros(len(teams), dtype=bool)
+
+        for team_row, team in enumerate(teams):
+            month_idx, team_months, team_matrix = self._team_months[team]
+            test_idx = month_idx.get(test_month)
+            if not test_idx:
+                continue  # No data for test_month, or no earlier month to use as baseline
+
+            window = team_matrix[test_idx - 1 : test_idx + 3]
+            tensor[team_row, : len(window)] = window
+            prev_months[team_row] = team_months[test_idx - 1]
+            has_baseline[team_row] = True
+
+        return tensor, prev_months, has_baseline
+
     def run_backtest(
-        self, train_ratio: float = None, config: dict = None, cancellation_check: Callable[[], bool] | None = None
+        self,
+        train_ratio: float = None,
+        config: dict = None,
+        cancellation_check: Callable[[], bool] | None = None,
+        n_jobs: int = 1,
     ) -> dict:
         """
         Run rolling window backtest validation on historical data.
@@ -103,6 +346,11 @@ class BacktestEngine:
             cancellation_check (Callable[[], bool], optional): Function that returns True if
                 cancellation was requested. Called periodically during execution. If True,
                 returns partial results with 'cancelled': True.
+            n_jobs (int, optional): Number of worker processes used to compute each test
+                month's recommendations (joblib convention, -1 = all cores). Defaults to 1
+                (serial). Results are identical for any value; parallel recommendations for
+                a month cannot be interrupted, so cancellation is only checked between months
+                while they are computed.
 
         Returns:
             dict: Backtest results dictionary containing:
@@ -162,10 +410,54 @@ class BacktestEngine:
         recent_improvements_months = config.get("recent_improvements_months", 3)
         min_similarity_threshold = config.get("min_similarity_threshold", 0.75)
 
-        total_practices = len(self.recommender.practices)  # Total practices (30 after filtering)
+        rec_params = (
+            top_n,
+            k_similar,
+            similarity_weight,
+            similar_teams_lookahead_months,
+            recent_improvements_months,
+            min_similarity_threshold,
+        )
+
+        # Months the recommender accepts as a baseline (see is_valid_baseline_month)
+        valid_prev_months = {month for month in months if self.recommender.is_valid_baseline_month(month)}
+
+        # Popularity baseline ranking per prev_month (see the team loop)
+        popularity_rankings = {}
+
+        # Materialize every team's months and matrix once per run, so per-month lookups
+        # are dict hits rather than processor calls
+        self._team_months = {}
+        for team in teams:
+            team_months, team_matrix = self.processor.get_team_matrix(team)
+            team_months = team_months.tolist()
+            self._team_months[team] = (
+                {month: idx for idx, month in enumerate(team_months)},
+                team_months,
+                team_matrix,
+            )
+
+        # Loop invariants, bound to locals once (local loads are cheaper than attribute
+        # chains in the per-team loop)
+        practices = self.recommender.practices
+        sequence_mapper = self.recommender.sequence_mapper
+        recommend_cached = self._recommend_cached
+        expected_random_mrr = self._expected_random_mrr
+        # Cancellation is polled every CANCEL_CHECK_EVERY teams via a countdown (no modulo
+        # per team); with no callback the per-team check is skipped entirely
+        cancel = cancellation_check
+        CANCEL_CHECK_EVERY = 10
+
+        total_practices = len(practices)  # Total practices (30 after filtering)
+        # Practice sets are held as int bitmasks (bit i = practice i) for the hit tests
+        practice_index = {practice: i for i, practice in enumerate(practices)}
+        practice_bit = {practice: 1 << i for practice, i in practice_index.items()}
 
         # Rolling window: start from month 4 (index 3, 0-based)
         per_month_results = []
+        # Running sums of the averaged per-month metrics, so overall values (including
+        # partial results on cancellation) need no extra pass over per_month_results
+        metric_sums = dict.fromkeys(AVERAGED_METRICS, 0.0)
         total_predictions = 0
         total_correct = 0
         all_teams_tested = set()  # Track all teams that made predictions
@@ -194,6 +486,7 @@ class BacktestEngine:
                         all_teams_tested,
                         top_n,
                         expected_mrr_per_case,
+                        metric_sums,
                     )
 
             test_month = months[test_month_idx]
@@ -213,158 +506,163 @@ class BacktestEngine:
                     all_teams_tested,
                     top_n,
                     expected_mrr_per_case,
+                    metric_sums,
                 )
 
             # Learn sequences up to test_month (using sliding window)
             # This ensures sequences are only learned from months < test_month
             # The sequences will be cached and reused if needed
-            self.recommender.sequence_mapper.learn_sequences_up_to_month(test_month)
+            sequence_mapper.learn_sequences_up_to_month(test_month)
 
             # Run backtest for this month
             month_predictions = 0
             month_correct = 0
             month_popularity_correct = 0
-            month_precision_sum = 0.0
             month_recall_sum = 0.0
-            month_mrr_sum = 0.0
             teams_tested_this_month = set()
+            # Per-case team rows and recommended practice indices, scored in one batch below
+            month_case_rows = []
+            month_case_recs = []
+
+            # What did each team actually improve in test_month, test_month + 1, AND
+            # test_month + 2? Check improvements in all 3 months to account for adoption
+            # timelines (this aligns with recommendation logic which looks up to 3 months
+            # ahead). One reduction over the month tensor covers every team at once; absent
+            # future months are NaN and never count as improvements
+            month_tensor, prev_months, has_baseline = self._build_month_tensor(test_month, teams)
+            future = np.nan_to_num(month_tensor[:, 1:], nan=-np.inf)
+            improved = (future > month_tensor[:, :1]).any(axis=1)  # (T, P)
+            num_improvements = improved.sum(axis=1).tolist()
+
+            # Per-team sets for the hit tests below, packed once per month as int bitmasks:
+            # what each team improved, and which practices it had maxed out in prev_month
+            # (NaN rows compare False). E[MRR] under random selection depends only on the
+            # improvement count, so it is computed once per distinct count
+            improved_bits_all = _pack_rows(improved)
+            maxed_bits_all = _pack_rows(month_tensor[:, 0] >= 1.0)
+            expected_mrr_by_k = {
+                k: expected_random_mrr(total_practices, k, top_n) for k in set(num_improvements)
+            }
+
+            # Compute every eligible team's recommendations for this month up front in one
+            # batch (in parallel when n_jobs != 1); the loop below then reads them from the
+            # recommendation cache
+            self._prefetch_recommendations(
+                [
+                    (team, prev_months[row])
+                    for row, team in enumerate(teams)
+                    if num_improvements[row] and prev_months[row] in valid_prev_months
+                ],
+                rec_params,
+                n_jobs,
+            )
 
-            team_count = 0  # Track team count for cancellation checks
-            for team in teams:
-                # Check for cancellation every 10 teams (starting from team 1)
-                team_count += 1
-                if cancellation_check and team_count % 10 == 0:
-                    is_cancelled = cancellation_check()
-                    if is_cancelled:
-                        logger.debug(
-                            "Cancellation detected at team %d/%d in month %d",
-                            team_count, len(teams), test_month_idx + 1,
-                        )
-                        # Return partial results
-                        return self._build_partial_results(
-                            per_month_results,
-                            total_predictions,
-                            total_correct,
-                            improvements_per_case,
-                            all_teams_tested,
-                            top_n,
-                            expected_mrr_per_case,
-                        )
-                try:
-                    history = self.processor.get_team_history(team)
-                    team_months = sorted([m for m in months if m in history])
-
-                    if test_month not in history:
-                        continue
-
-                    test_idx = team_months.index(test_month)
-                    if test_idx <= 0:
-                        continue  # Need at least one previous month
-
-                    prev_month = team_months[test_idx - 1]
-
-                    # What did team actually improve in test_month, test_month + 1, AND test_month + 2?
-                    # Check improvements in all 3 months to account for adoption timelines
-                    # This aligns with recommendation logic which looks up to 3 months ahead
-                    prev_vector = history[prev_month]
-                    test_vector = history[test_month]
-
-                    # Check improvements in test_month (immediate next month)
-                    actual_improved_month1 = set()
-                    for j, (p, t) in enumerate(zip(prev_vector, test_vector)):
-                        if t > p:
-                            actual_improved_month1.add(self.recommender.practices[j])
-
-                    # Check improvements in test_month + 1 (month after that) if it exists
-                    actual_improved_month2 = set()
-                    if test_idx + 1 < len(team_months):
-                        next_month = team_months[test_idx + 1]
-                        next_vector = history[next_month]
-                        for j, (p, n) in enumerate(zip(prev_vector, next_vector)):
-                            if n > p:
-                                actual_improved_month2.add(self.recommender.practices[j])
-
-                    # Check improvements in test_month + 2 (third month ahead) if it exists
-                    actual_improved_month3 = set()
-                    if test_idx + 2 < len(team_months):
-                        month_after_2 = team_months[test_idx + 2]
-                        month_after_2_vector = history[month_after_2]
-                        for j, (p, m2) in enumerate(zip(prev_vector, month_after_2_vector)):
-                            if m2 > p:
-                                actual_improved_month3.add(self.recommender.practices[j])
-
-                    # Combine improvements from all 3 months
-                    actual_improved = actual_improved_month1 | actual_improved_month2 | actual_improved_month3
-
-                    # Skip teams with no improvements in any of the 3 validation months
-                    # This ensures we only count predictions for teams that actually improved something.
-                    # Teams with no improvements shouldn't be counted as "failures" since no prediction
-                    # could succeed when no improvements occurred - this isn't a model failure.
-                    if not actual_improved:
-                        continue  # Skip if no improvements in any of the 3 months
-
-                    # Track number of improvements for random baseline calculation
-                    improvements_per_case.append(len(actual_improved))
-                    expected_mrr_per_case.append(
-                        self._expected_random_mrr(total_practices, len(actual_improved), top_n)
-                    )
+            cancel_countdown = CANCEL_CHECK_EVERY
+            for team_row, team in enumerate(teams):
+                # Check for cancellation every 10 teams (first check at team 10)
+                if cancel is not None:
+                    cancel_countdown -= 1
+                    if not cancel_countdown:
+                        cancel_countdown = CANCEL_CHECK_EVERY
+                        if cancel():
+                            logger.debug(
+                                "Cancellation detected at team %d/%d in month %d",
+                                team_row + 1, len(teams), test_month_idx + 1,
+                            )
+                            # Return partial results
+                            return self._build_partial_results(
+                                per_month_results,
+                                total_predictions,
+                                total_correct,
+                                improvements_per_case,
+                                all_teams_tested,
+                                top_n,
+                                expected_mrr_per_case,
+                                metric_sums,
+                            )
+                # Need data for test_month and at least one previous month
+                if not has_baseline[team_row]:
+                    continue
 
-                    # What did we recommend?
-                    # Note: allow_first_three_months=True because in backtest, we may use
-                    # month 2 to predict month 3, which is valid for validation purposes
-                    try:
-                        recommendations = self.recommender.recommend(
-                            team,
-                            prev_month,
-                            top_n=top_n,
-                            k_similar=k_similar,
-                            allow_first_three_months=True,
-                            similarity_weight=similarity_weight,
-                            similar_teams_lookahead_months=similar_teams_lookahead_months,
-                            recent_improvements_months=recent_improvements_months,
-                            min_similarity_threshold=min_similarity_threshold,
-                        )
-                        recommended = set([r[0] for r in recommendations])
-
-                        month_predictions += 1
-                        total_predictions += 1
-                        teams_tested_this_month.add(team)
-                        all_teams_tested.add(team)
-
-                        # Check for hits
-                        if recommended & actual_improved:  # Intersection
-                            month_correct += 1
-                            total_correct += 1
-
-                        # Popularity baseline: always recommend the top-N globally most-improved
-                        # practices (learned only from months < prev_month, same cutoff the real
-                        # model just used above), excluding practices this team has already maxed
-                        # out. This is a stronger sanity check than random selection - a naive
-                        # heuristic a reviewer would expect the model to beat.
-                        improvement_freq = self.recommender.sequence_mapper.get_improvement_frequency()
-                        maxed_out = {
-                            self.recommender.practices[j] for j, level in enumerate(prev_vector) if level >= 1.0
-                        }
-                        popularity_ranked = sorted(improvement_freq, key=improvement_freq.get, reverse=True)
-                        popularity_recommended = [p for p in popularity_ranked if p not in maxed_out][:top_n]
-                        if set(popularity_recommended) & actual_improved:
-                            month_popularity_correct += 1
-
-                        # Rank-aware supplementary metrics: precision@N, recall@N, MRR
-                        ordered_practices = [r[0] for r in recommendations]
-                        month_precision_sum += MetricsCalculator.calculate_hit_rate(ordered_practices, actual_improved)
-                        month_recall_sum += len(recommended & actual_improved) / len(actual_improved)
-                        month_mrr_sum += MetricsCalculator.calculate_mrr(ordered_practices, actual_improved)
-                    except ValueError:
-                        # Skip if month validation fails (e.g., month in first 3 months)
-                        # This can happen if prev_month is in the first 3 months
-                        continue
-                    except Exception:
-                        # Log other errors but continue
-                        continue
-                except:
+                # Skip teams with no improvements in any of the 3 validation months
+                # This ensures we only count predictions for teams that actually improved something.
+                # Teams with no improvements shouldn't be counted as "failures" since no prediction
+                # could succeed when no improvements occurred - this isn't a model failure.
+                if not num_improvements[team_row]:
+                    continue  # Skip if no improvements in any of the 3 months
+
+                prev_month = prev_months[team_row]
+                num_improved = num_improvements[team_row]
+                improved_bits = improved_bits_all[team_row]
+
+                # Track number of improvements for random baseline calculation
+                improvements_per_case.append(num_improved)
+                expected_mrr_per_case.append(expected_mrr_by_k[num_improved])
+
+                # What did we recommend?
+                # Note: allow_first_three_months=True because in backtest, we may use
+                # month 2 to predict month 3, which is valid for validation purposes
+                # (memoized across runs - see _recommend_cached). Baselines the recommender
+                # always rejects are skipped without calling it
+                if prev_month not in valid_prev_months:
+                    continue
+                try:
+                    recommendations = recommend_cached(team, prev_month, rec_params)
+                except ValueError:
+                    # Skip if month validation fails (e.g., month in first 3 months)
+                    # This can happen if prev_month is in the first 3 months
                     continue
 
+                rec_idx = [practice_index[r[0]] for r in recommendations]
+                recommended_bits = 0
+                for j in rec_idx:
+                    recommended_bits |= 1 << j
+                hit_bits = recommended_bits & improved_bits
+
+                month_predictions += 1
+                total_predictions += 1
+                teams_tested_this_month.add(team)
+                all_teams_tested.add(team)
+
+                # Check for hits
+                if hit_bits:  # Intersection
+                    month_correct += 1
+                    total_correct += 1
+
+                # Popularity baseline: always recommend the top-N globally most-improved
+                # practices (learned only from months < prev_month, same cutoff the real
+                # model just used above), excluding practices this team has already maxed
+                # out. This is a stronger sanity check than random selection - a naive
+                # heuristic a reviewer would expect the model to beat.
+                # The ranking depends only on the sequence state for prev_month, so it is
+                # computed once per prev_month rather than once per team
+                popularity_ranked = popularity_rankings.get(prev_month)
+                if popularity_ranked is None:
+                    improvement_freq = sequence_mapper.get_improvement_frequency()
+                    popularity_ranked = sorted(improvement_freq, key=improvement_freq.get, reverse=True)
+                    popularity_rankings[prev_month] = popularity_ranked
+                maxed_bits = maxed_bits_all[team_row]
+                popularity_recommended = [p for p in popularity_ranked if not practice_bit[p] & maxed_bits][:top_n]
+                if sum(practice_bit[p] for p in popularity_recommended) & improved_bits:
+                    month_popularity_correct += 1
+
+                # Rank-aware supplementary metrics: recall@N here, precision@N and MRR
+                # for all of this month's cases at once after the loop
+                month_recall_sum += hit_bits.bit_count() / num_improved
+                month_case_rows.append(team_row)
+                month_case_recs.append(rec_idx)
+
+            month_precision_sum = 0.0
+            month_mrr_sum = 0.0
+            if month_case_rows:
+                # Pad shorter recommendation lists with -1 (ignored by the batch metrics)
+                recs_idx = np.full((len(month_case_recs), max(map(len, month_case_recs))), -1)
+                for case, rec_idx in enumerate(month_case_recs):
+                    recs_idx[case, : len(rec_idx)] = rec_idx
+                case_improved = improved[month_case_rows]
+                month_precision_sum = float(MetricsCalculator.calculate_hit_rate_batch(recs_idx, case_improved).sum())
+                month_mrr_sum = float(MetricsCalculator.calculate_mrr_batch(recs_idx, case_improved).sum())
+
             # Calculate accuracy and rank-aware metrics for this month
             month_accuracy = month_correct / month_predictions if month_predictions > 0 else 0
             month_popularity_accuracy = month_popularity_correct / month_predictions if month_predictions > 0 else 0
@@ -372,30 +670,86 @@ class BacktestEngine:
             month_recall = month_recall_sum / month_predictions if month_predictions > 0 else 0
             month_mrr = month_mrr_sum / month_predictions if month_predictions > 0 else 0
 
-            per_month_results.append(
-                {
-                    "month": test_month,
-                    "train_months": train_months,
-                    "predictions": month_predictions,
-                    "correct": month_correct,
-                    "accuracy": month_accuracy,
-                    "popularity_accuracy": month_popularity_accuracy,
-                    "precision": month_precision,
-                    "recall": month_recall,
-                    "mrr": month_mrr,
-                    "teams_tested": len(teams_tested_this_month),
-                }
-            )
+            month_result = {
+                "month": test_month,
+                "train_months": train_months,
+                "predictions": month_predictions,
+                "correct": month_correct,
+                "accuracy": month_accuracy,
+                "popularity_accuracy": month_popularity_accuracy,
+                "precision": month_precision,
+                "recall": month_recall,
+                "mrr": month_mrr,
+                "teams_tested": len(teams_tested_this_month),
+            }
+            per_month_results.append(month_result)
+            for name in AVERAGED_METRICS:
+                metric_sums[name] += month_result[name]
+
+        return self._finalize_metrics(
+            per_month_results,
+            total_predictions,
+            total_correct,
+            improvements_per_case,
+            all_teams_tested,
+            top_n,
+            cancelled=False,
+            expected_mrr_per_case=expected_mrr_per_case,
+            metric_sums=metric_sums,
+        )
+
+    def _finalize_metrics(
+        self,
+        per_month_results: list,
+        total_predictions: int,
+        total_correct: int,
+        improvements_per_case: list,
+        all_teams_tested: set,
+        top_n: int,
+        cancelled: bool,
+        expected_mrr_per_case: list | None = None,
+        metric_sums: dict | None = None,
+    ) -> dict:
+        """
+        Build the backtest results dictionary from the accumulated run state.
+
+        Shared by run_backtest() (full run) and _build_partial_results() (cancelled run),
+        so both report overall accuracy, random/popularity baselines, and rank-aware
+        metrics the same way.
+
+        Args:
+            per_month_results (list): Result dictionaries of the completed months.
+            total_predictions (int): Total number of predictions made.
+            total_correct (int): Total number of correct predictions.
+            improvements_per_case (list): Number of improved practices per tested case,
+                used for the random baseline.
+            all_teams_tested (set): Names of all teams that made predictions.
+            top_n (int): Number of recommendations generated per prediction.
+            cancelled (bool): Whether the run was cancelled before finishing.
+            expected_mrr_per_case (list, optional): Per-case exact expected MRR under random
+                selection. Used for the MRR random baseline.
+            metric_sums (dict, optional): Running sums of the AVERAGED_METRICS over
+                per_month_results. Summed from per_month_results when not given.
+
+        Returns:
+            dict: Results dictionary as documented in run_backtest(), with 'cancelled' set
+                to the given flag.
+        """
+        expected_mrr_per_case = expected_mrr_per_case or []
+        if metric_sums is None:
+            metric_sums = {
+                name: sum(r.get(name, 0) for r in per_month_results) for name in AVERAGED_METRICS
+            }
+        total_practices = len(self.recommender.practices)  # Total practices (30 after filtering)
 
         # Calculate overall accuracy and rank-aware metrics (average of per-month values)
         if per_month_results:
-            overall_accuracy = sum(r["accuracy"] for r in per_month_results) / len(per_month_results)
-            overall_popularity_baseline = sum(r["popularity_accuracy"] for r in per_month_results) / len(
-                per_month_results
-            )
-            overall_precision = sum(r["precision"] for r in per_month_results) / len(per_month_results)
-            overall_recall = sum(r["recall"] for r in per_month_results) / len(per_month_results)
-            overall_mrr = sum(r["mrr"] for r in per_month_results) / len(per_month_results)
+            num_months = len(per_month_results)
+            overall_accuracy = metric_sums["accuracy"] / num_months
+            overall_popularity_baseline = metric_sums["popularity_accuracy"] / num_months
+            overall_precision = metric_sums["precision"] / num_months
+            overall_recall = metric_sums["recall"] / num_months
+            overall_mrr = metric_sums["mrr"] / num_months
         else:
             overall_accuracy = 0
             overall_popularity_baseline = 0
@@ -418,17 +772,7 @@ class BacktestEngine:
         if improvements_per_case and total_practices > 0:
             k_avg = sum(improvements_per_case) / len(improvements_per_case)
             # Calculate probability of getting at least one correct with random selection
-            if k_avg > 0 and top_n > 0 and total_practices >= k_avg and total_practices >= top_n:
-                # P(none correct) = C(n-k_avg, top_n) / C(n, top_n)
-                try:
-                    p_none = comb(total_practices - k_avg, top_n, exact=True) / comb(total_practices, top_n, exact=True)
-                    random_baseline = 1.0 - p_none
-                except (ValueError, ZeroDivisionError):
-                    # Fallback to simple approximation if combination calculation fails
-                    random_baseline = min(1.0, (k_avg / total_practices) * top_n)
-            else:
-                # Edge case: use simple approximation
-                random_baseline = min(1.0, (k_avg / total_practices) * top_n) if total_practices > 0 else 0.0
+            random_baseline = self._random_baseline(total_practices, k_avg, top_n)
 
             improvement_gap = overall_accuracy - random_baseline
 
@@ -490,7 +834,7 @@ class BacktestEngine:
             "avg_improvements_per_case": sum(improvements_per_case) / len(improvements_per_case)
             if improvements_per_case
             else 0,
-            "cancelled": False,
+            "cancelled": cancelled,
         }
 
     def _build_partial_results(
@@ -502,6 +846,7 @@ class BacktestEngine:
         all_teams_tested: set,
         top_n: int,
         expected_mrr_per_case: list | None = None,
+        metric_sums: dict | None = None,
     ) -> dict:
         """
         Build partial results dictionary when backtest is cancelled mid-execution.
@@ -522,6 +867,9 @@ class BacktestEngine:
                 random baseline probability calculation.
             expected_mrr_per_case (list, optional): Per-case exact expected MRR under random
                 selection, tested so far. Used for the MRR random baseline.
+            metric_sums (dict, optional): Running sums of the AVERAGED_METRICS over
+                per_month_results, as kept by run_backtest(). Summed from
+                per_month_results when not given.
 
         Returns:
             dict: Partial backtest results dictionary with same structure as run_backtest()
@@ -539,103 +887,18 @@ class BacktestEngine:
             "Backtest cancelled — returning partial results (%d months completed, %d/%d correct)",
             len(per_month_results), total_correct, total_predictions,
         )
-        expected_mrr_per_case = expected_mrr_per_case or []
-
-        # Calculate overall accuracy and rank-aware metrics from completed months only
-        if per_month_results:
-            overall_accuracy = sum(r["accuracy"] for r in per_month_results) / len(per_month_results)
-            overall_popularity_baseline = sum(r.get("popularity_accuracy", 0) for r in per_month_results) / len(
-                per_month_results
-            )
-            overall_precision = sum(r.get("precision", 0) for r in per_month_results) / len(per_month_results)
-            overall_recall = sum(r.get("recall", 0) for r in per_month_results) / len(per_month_results)
-            overall_mrr = sum(r.get("mrr", 0) for r in per_month_results) / len(per_month_results)
-        else:
-            overall_accuracy = 0
-            overall_popularity_baseline = 0
-            overall_precision = 0
-            overall_recall = 0
-            overall_mrr = 0
-
-        # Calculate random baseline from partial data
-        total_practices = len(self.recommender.practices)  # Total practices
-        random_baseline = 0.0
-        improvement_gap = 0.0
-        random_precision = 0.0
-        random_recall = 0.0
-        random_mrr = 0.0
-        precision_gap = 0.0
-        recall_gap = 0.0
-        mrr_gap = 0.0
-
-        if improvements_per_case and total_practices > 0:
-            k_avg = sum(improvements_per_case) / len(improvements_per_case)
-            # Calculate probability of getting at least one correct with random selection
-            if k_avg > 0 and top_n > 0 and total_practices >= k_avg and total_practices >= top_n:
-                # P(none correct) = C(n-k_avg, top_n) / C(n, top_n)
-                try:
-                    p_none = comb(total_practices - k_avg, top_n, exact=True) / comb(total_practices, top_n, exact=True)
-                    random_baseline = 1.0 - p_none
-                except (ValueError, ZeroDivisionError):
-                    # Fallback to simple approximation if combination calculation fails
-                    random_baseline = min(1.0, (k_avg / total_practices) * top_n)
-            else:
-                # Edge case: use simple approximation
-                random_baseline = min(1.0, (k_avg / total_practices) * top_n) if total_practices > 0 else 0.0
-
-            improvement_gap = overall_accuracy - random_baseline
-
-            random_precision = min(1.0, k_avg / total_practices)
-            random_recall = min(1.0, top_n / total_practices)
-            if expected_mrr_per_case:
-                random_mrr = sum(expected_mrr_per_case) / len(expected_mrr_per_case)
-
-            precision_gap = overall_precision - random_precision
-            recall_gap = overall_recall - random_recall
-            mrr_gap = overall_mrr - random_mrr
-
-        # Calculate improvement factor
-        improvement_factor = overall_accuracy / random_baseline if random_baseline > 0 else 0
-        precision_improvement_factor = overall_precision / random_precision if random_precision > 0 else 0
-        recall_improvement_factor = overall_recall / random_recall if random_recall > 0 else 0
-        mrr_improvement_factor = overall_mrr / random_mrr if random_mrr > 0 else 0
-
-        popularity_gap = overall_accuracy - overall_popularity_baseline
-        popularity_improvement_factor = (
-            overall_accuracy / overall_popularity_baseline if overall_popularity_baseline > 0 else 0
+        return self._finalize_metrics(
+            per_month_results,
+            total_predictions,
+            total_correct,
+            improvements_per_case,
+            all_teams_tested,
+            top_n,
+            cancelled=True,
+            expected_mrr_per_case=expected_mrr_per_case,
+            metric_sums=metric_sums,
         )
 
-        return {
-            "status": "success",
-            "per_month_results": per_month_results,
-            "total_predictions": total_predictions,
-            "correct_predictions": total_correct,
-            "overall_accuracy": overall_accuracy,
-            "random_baseline": random_baseline,
-            "improvement_gap": improvement_gap,
-            "improvement_factor": improvement_factor,
-            "overall_popularity_baseline": overall_popularity_baseline,
-            "popularity_gap": popularity_gap,
-            "popularity_improvement_factor": popularity_improvement_factor,
-            "overall_precision": overall_precision,
-            "overall_recall": overall_recall,
-            "overall_mrr": overall_mrr,
-            "random_precision": random_precision,
-            "random_recall": random_recall,
-            "random_mrr": random_mrr,
-            "precision_gap": precision_gap,
-            "recall_gap": recall_gap,
-            "mrr_gap": mrr_gap,
-            "precision_improvement_factor": precision_improvement_factor,
-            "recall_improvement_factor": recall_improvement_factor,
-            "mrr_improvement_factor": mrr_improvement_factor,
-            "teams_tested": len(all_teams_tested),
-            "avg_improvements_per_case": sum(improvements_per_case) / len(improvements_per_case)
-            if improvements_per_case
-            else 0,
-            "cancelled": True,
-        }
-
     def get_accuracy_summary(self, backtest_results: dict) -> str:
         """
         Get human-readable accuracy summary.
@@ -2,6 +2,8 @@
 MetricsCalculator: Calculate performance metrics for the recommendation system.
 """
 
+from operator import itemgetter
+
 import numpy as np
 
 
@@ -23,6 +25,7 @@ class MetricsCalculator:
         if not recommendations:
             return 0.0
 
+        # Count per list entry rather than via set intersection, which would collapse repeats
         hits = sum(1 for r in recommendations if r in actual_improvements)
         return hits / len(recommendations)
 
@@ -43,6 +46,65 @@ class MetricsCalculator:
                 return 1.0 / rank
         return 0.0
 
+    @staticmethod
+    def _batch_hits(recs_idx: np.ndarray, improved_mask: np.ndarray) -> tuple:
+        """
+        Look up, for every case and rank, whether the recommended practice improved.
+
+        Args:
+            recs_idx (np.ndarray): (n_cases, top_n) int practice indices in rank order;
+                negative entries pad lists shorter than top_n
+            improved_mask (np.ndarray): (n_cases, n_practices) bool, True where the
+                practice actually improved in that case
+
+        Returns:
+            tuple: (hits, valid) bool arrays of shape (n_cases, top_n)
+        """
+        recs_idx = np.asarray(recs_idx, dtype=np.int64)
+        valid = recs_idx >= 0
+        rows = np.arange(recs_idx.shape[0])[:, None]
+        hits = np.asarray(improved_mask, dtype=bool)[rows, np.where(valid, recs_idx, 0)] & valid
+        return hits, valid
+
+    @staticmethod
+    def calculate_hit_rate_batch(recs_idx: np.ndarray, improved_mask: np.ndarray) -> np.ndarray:
+        """
+        Calculate calculate_hit_rate() for many cases at once.
+
+        Args:
+            recs_idx (np.ndarray): (n_cases, top_n) int practice indices in rank order;
+                negative entries pad lists shorter than top_n
+            improved_mask (np.ndarray): (n_cases, n_practices) bool, True where the
+                practice actually improved in that case
+
+        Returns:
+            np.ndarray: (n_cases,) hit rates (0-1); 0.0 for empty recommendation lists
+        """
+        hits, valid = MetricsCalculator._batch_hits(recs_idx, improved_mask)
+        num_recs = valid.sum(axis=1)
+        return np.divide(hits.sum(axis=1), num_recs, out=np.zeros(len(num_recs)), where=num_recs > 0)
+
+    @staticmethod
+    def calculate_mrr_batch(recs_idx: np.ndarray, improved_mask: np.ndarray) -> np.ndarray:
+        """
+        Calculate calculate_mrr() for many cases at once.
+
+        Args:
+            recs_idx (np.ndarray): (n_cases, top_n) int practice indices in rank order;
+                negative entries pad lists shorter than top_n
+            improved_mask (np.ndarray): (n_cases, n_practices) bool, True where the
+                practice actually improved in that case
+
+        Returns:
+            np.ndarray: (n_cases,) reciprocal ranks of the first correct recommendation
+                (0.0 where none is correct)
+        """
+        hits, _ = MetricsCalculator._batch_hits(recs_idx, improved_mask)
+        if not hits.shape[1]:
+            return np.zeros(hits.shape[0])
+        first = np.argmax(hits, axis=1)
+        return np.where(hits.any(axis=1), 1.0 / (first + 1), 0.0)
+
     @staticmethod
     def calculate_coverage(all_recommendations: list, all_practices: set) -> float:
         """
@@ -74,9 +136,19 @@ class MetricsCalculator:
         if len(recommendations) <= 1:
             return 0.0
 
-        scores = [r[1] for r in recommendations]
-        mean_score = np.mean(scores)
-        std_score = np.std(scores)
+        n = len(recommendations)
+        if n <= 48:
+            # Typical top-N lists are short: plain Python arithmetic beats NumPy's per-call overhead
+            scores = [r[1] for r in recommendations]
+            mean_score = sum(scores) / n
+            std_score = (sum((s - mean_score) ** 2 for s in scores) / n) ** 0.5
+        else:
+            # One pass to fill the array, then the (population) std as a centred dot product,
+            # which avoids ndarray.std()'s temporaries and dispatch overhead
+            scores = np.fromiter(map(itemgetter(1), recommendations), dtype=np.float64, count=n)
+            mean_score = scores.sum() / n
+            deviations = scores - mean_score
+            std_score = (float(np.dot(deviations, deviations)) / n) ** 0.5
 
         if mean_score == 0:
             return 0.0
@@ -2,18 +2,165 @@
 OptimizationEngine: Find optimal parameter configuration by testing combinations.
 """
 
+import hashlib
+import heapq
 import json
 import logging
-from collections.abc import Generator
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Generator, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from itertools import product
 from pathlib import Path
 from typing import Any, Callable
 
+import joblib
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used instead
+    orjson = None
+
 from .backtest import BacktestEngine
 
 logger = logging.getLogger(__name__)
 
+# Known-good configuration (the recommender's tuned defaults). Grid combinations are
+# tested closest-first, so early stopping tends to fire on a strong config sooner
+PREFERRED_CONFIG = {
+    "top_n": 2,
+    "similarity_weight": 0.6,
+    "k_similar": 19,
+    "similar_teams_lookahead_months": 3,
+    "recent_improvements_months": 3,
+    "min_similarity_threshold": 0.75,
+}
+
+
+# Minimum time between progress reports (log line + progress_callback) in find_optimal_config()
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+# Saved optimization results: results/optimization_YYYYMMDD_HHMMSS.json (a strftime
+# format, so a filename is one call on the save timestamp)
+RESULTS_DIR = Path("results")
+RESULTS_FILE_FORMAT = "optimization_%Y%m%d_%H%M%S.json"
+
+# On-disk cache of grid-search backtest summaries, shared across optimization runs:
+# one JSON file per (data fingerprint, config). Bump BACKTEST_CACHE_VERSION whenever the
+# backtest or recommendation logic changes, so results from older code are not reused
+BACKTEST_CACHE_DIR = Path(".cache") / "backtest"
+BACKTEST_CACHE_VERSION = 1
+# run_backtest() result fields the optimizer reads (all that a cache entry stores)
+CACHED_RESULT_KEYS = (
+    "overall_accuracy",
+    "random_baseline",
+    "improvement_gap",
+    "improvement_factor",
+    "total_predictions",
+    "correct_predictions",
+)
+
+
+# Single background writer for results files, so find_optimal_config() does not wait on
+# disk I/O (saves stay in submission order; pending ones finish at interpreter exit)
+_SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="optimizer-save")
+
+
+def _write_results_file(results: dict[str, Any], filepath: Path) -> None:
+    """
+    Write a results dictionary to filepath as JSON, atomically.
+
+    Serializes with orjson when it is installed (numpy values included), else with the
+    stdlib json module; both produce 2-space indented JSON.
+
+    Args:
+        results: Results dictionary (with timestamp) to write
+        filepath: Destination path; written via a temporary file in the same directory
+    """
+    if orjson is not None:
+        data = orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        data = json.dumps(results, indent=2).encode()
+
+    tmp_path = filepath.with_name(f".{filepath.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+    logger.info(f"Optimization results saved to {filepath}")
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for numpy values (np.int64 range values, arrays); anything else as str."""
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+
+def _log_save_failure(future: Future) -> None:
+    """Log the error of a failed background results save (it has no caller to raise to)."""
+    if future.exception() is not None:
+        logger.warning(f"Failed to save optimization results: {future.exception()}")
+
+
+def _run_backtest_config(backtest_engine: BacktestEngine, config: dict[str, Any]) -> dict[str, Any] | Exception:
+    """
+    Run one grid-search backtest in a joblib worker.
+
+    Args:
+        backtest_engine: BacktestEngine to run (a pickled copy in the worker process)
+        config: Parameter configuration to test
+
+    Returns:
+        The run_backtest() results dict, or the exception it raised (returned, not
+        raised, so one failing configuration does not abort the remaining workers)
+    """
+    try:
+        return backtest_engine.run_backtest(config=config)
+    except Exception as e:
+        return e
+
+
+# BacktestEngine loaded in a worker process, by the path of the dump it was loaded from
+_WORKER_ENGINES: dict[str, BacktestEngine] = {}
+# Engine dumps at least this large are memory-mapped by the workers rather than loaded
+# (memmaps add per-operation overhead, which only pays off for large data)
+SHARED_ENGINE_MMAP_MIN_BYTES = 64 * 1024 * 1024
+
+
+def _run_shared_backtest_config(engine_path: str, config: dict[str, Any]) -> dict[str, Any] | Exception:
+    """
+    Run one grid-search backtest in a worker process on a shared engine dump.
+
+    The engine dumped at engine_path is loaded once per worker and reused for every later
+    config - along with the caches it builds up - so only the path and the config are sent
+    per task. Dumps of at least SHARED_ENGINE_MMAP_MIN_BYTES have their numpy arrays
+    memory-mapped copy-on-write, so workers share the pages of the read-only data instead
+    of each holding a copy.
+
+    Args:
+        engine_path: Path of the BacktestEngine dumped by joblib.dump()
+        config: Parameter configuration to test
+
+    Returns:
+        The run_backtest() results dict, or the exception raised while loading the
+        engine or running the backtest
+    """
+    try:
+        backtest_engine = _WORKER_ENGINES.get(engine_path)
+        if backtest_engine is None:
+            # A new dump means a new optimization run; drop the previous engine
+            _WORKER_ENGINES.clear()
+            mmap_mode = "c" if os.path.getsize(engine_path) >= SHARED_ENGINE_MMAP_MIN_BYTES else None
+            backtest_engine = _WORKER_ENGINES[engine_path] = joblib.load(engine_path, mmap_mode=mmap_mode)
+    except Exception as e:
+        return e
+    return _run_backtest_config(backtest_engine, config)
+
 
 class OptimizationEngine:
     """Find optimal configuration by testing parameter combinations."""
@@ -26,7 +173,89 @@ class OptimizationEngine:
             backtest_engine: BacktestEngine instance
         """
         self.backtest_engine = backtest_engine
-        self._cancelled = False  # Cancellation flag
+        # Cancellation flag, set from another thread (e.g. the API's cancel route)
+        self._cancel_event = threading.Event()
+
+    @property
+    def _cancelled(self) -> bool:
+        """Whether cancellation has been requested (the state of the cancellation event)."""
+        return self._cancel_event.is_set()
+
+    @_cancelled.setter
+    def _cancelled(self, value: bool) -> None:
+        if value:
+            self._cancel_event.set()
+        else:
+            self._cancel_event.clear()
+
+    @staticmethod
+    def _parameter_ranges(
+        top_n_range: list[int] | None = None,
+        similarity_weight_range: list[float] | None = None,
+        k_similar_range: list[int] | None = None,
+        similar_teams_lookahead_months_range: list[int] | None = None,
+        recent_improvements_months_range: list[int] | None = None,
+        min_similarity_threshold_range: list[float] | None = None,
+    ) -> dict[str, list]:
+        """
+        Fill in default ranges for the grid search parameters.
+
+        Returns:
+            Dictionary mapping each parameter name to its list of values, in the
+            parameter order used by generate_parameter_combinations()
+        """
+        # Default ranges
+        if top_n_range is None:
+            top_n_range = [2, 3, 4, 5]  # Removed 1 (too few recommendations)
+        if similarity_weight_range is None:
+            similarity_weight_range = [0.6, 0.7, 0.8]  # Focus around 0.7
+        if k_similar_range is None:
+            k_similar_range = [5, 10, 15, 19, 20]  # Added 19 and 20 (user found 19 gives 1.9x improvement)
+        if similar_teams_lookahead_months_range is None:
+            similar_teams_lookahead_months_range = [3]
+        if recent_improvements_months_range is None:
+            recent_improvements_months_range = [3]
+        if min_similarity_threshold_range is None:
+            min_similarity_threshold_range = [0.0, 0.5, 0.75]  # Added 0.75 back (user found it improves results)
+
+        return {
+            "top_n": top_n_range,
+            "similarity_weight": similarity_weight_range,
+            "k_similar": k_similar_range,
+            "similar_teams_lookahead_months": similar_teams_lookahead_months_range,
+            "recent_improvements_months": recent_improvements_months_range,
+            "min_similarity_threshold": min_similarity_threshold_range,
+        }
+
+    @staticmethod
+    def count_parameter_combinations(ranges: dict[str, list], fixed_params: dict[str, Any] | None = None) -> int:
+        """
+        Count the distinct configurations a grid yields, without generating them.
+
+        A parameter fixed by fixed_params contributes its single fixed value (its range is
+        not swept); every other parameter contributes its number of distinct values.
+
+        Args:
+            ranges: Parameter ranges as returned by _parameter_ranges()
+            fixed_params: Fixed parameter values (overrides ranges)
+
+        Returns:
+            Number of distinct configurations
+        """
+        fixed_params = fixed_params or {}
+        return math.prod(
+            1 if name in fixed_params else len(set(values)) for name, values in ranges.items()
+        )
+
+    @staticmethod
+    def _unique_configs(configs: Iterable[dict[str, Any]]) -> Generator[dict[str, Any], None, None]:
+        """Yield each distinct configuration once (first occurrence), lazily."""
+        seen = set()
+        for config in configs:
+            key = tuple(sorted(config.items()))
+            if key not in seen:
+                seen.add(key)
+                yield config
 
     def generate_parameter_combinations(
         self,
@@ -39,7 +268,7 @@ class OptimizationEngine:
         fixed_params: dict[str, Any] | None = None,
     ) -> Generator[dict[str, Any], None, None]:
         """
-        Generate all parameter combinations.
+        Generate all distinct parameter combinations, closest to PREFERRED_CONFIG first.
 
         Args:
             top_n_range: List of top_n values (default: [2, 3, 4, 5])
@@ -53,50 +282,139 @@ class OptimizationEngine:
         Yields:
             Dictionary with parameter configuration
         """
-        # Default ranges
-        if top_n_range is None:
-            top_n_range = [2, 3, 4, 5]  # Removed 1 (too few recommendations)
-        if similarity_weight_range is None:
-            similarity_weight_range = [0.6, 0.7, 0.8]  # Focus around 0.7
-        if k_similar_range is None:
-            k_similar_range = [5, 10, 15, 19, 20]  # Added 19 and 20 (user found 19 gives 1.9x improvement)
-        if similar_teams_lookahead_months_range is None:
-            similar_teams_lookahead_months_range = [3]
-        if recent_improvements_months_range is None:
-            recent_improvements_months_range = [3]
-        if min_similarity_threshold_range is None:
-            min_similarity_threshold_range = [0.0, 0.5, 0.75]  # Added 0.75 back (user found it improves results)
-        if fixed_params is None:
-            fixed_params = {}
-
-        # Generate all combinations
-        for top_n, similarity_weight, k_similar, lookahead, recent, min_sim in product(
+        ranges = self._parameter_ranges(
             top_n_range,
             similarity_weight_range,
             k_similar_range,
             similar_teams_lookahead_months_range,
             recent_improvements_months_range,
             min_similarity_threshold_range,
-        ):
-            config = {
-                "top_n": top_n,
-                "similarity_weight": similarity_weight,
-                "k_similar": k_similar,
-                "similar_teams_lookahead_months": lookahead,
-                "recent_improvements_months": recent,
-                "min_similarity_threshold": min_sim,
-            }
+        )
+        if fixed_params is None:
+            fixed_params = {}
+
+        # Fixed parameters are not swept at all: they live in a template that every
+        # combination copies, and only the remaining parameters form the product, each over
+        # its distinct values - so every yielded configuration is distinct
+        swept = [name for name in ranges if name not in fixed_params]
+        base = {**dict.fromkeys(ranges), **fixed_params}
+        ranges = {name: list(dict.fromkeys(ranges[name])) for name in swept}
+
+        # Order combinations by their distance from PREFERRED_CONFIG, each parameter scaled
+        # by the span of its range (sum of per-parameter |value - preferred| / span). The
+        # sort is stable, so equally distant combinations keep grid order
+        scaled = [
+            (PREFERRED_CONFIG[name], max(ranges[name]) - min(ranges[name]) if ranges[name] else 0)
+            for name in swept
+        ]
+
+        def distance(values: tuple) -> float:
+            return sum(abs(value - preferred) / span for value, (preferred, span) in zip(values, scaled) if span)
+
+        # Generate all combinations
+        for values in sorted(product(*(ranges[name] for name in swept)), key=distance):
+            yield {**base, **dict(zip(swept, values))}
+
+    def sample_parameter_combinations(
+        self,
+        ranges: dict[str, list],
+        n_trials: int,
+        fixed_params: dict[str, Any] | None = None,
+        seed: int | None = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Sample distinct parameter combinations uniformly from the grid, without replacement.
+
+        Grid points are drawn by index and decoded one axis at a time, so the full product
+        is never materialized.
+
+        Args:
+            ranges: Parameter ranges as returned by _parameter_ranges()
+            n_trials: Number of combinations to sample (capped at the grid size)
+            fixed_params: Fixed parameter values (overrides ranges)
+            seed: Random seed, for a reproducible sample
+
+        Yields:
+            Dictionary with parameter configuration
+        """
+        if fixed_params is None:
+            fixed_params = {}
+
+        swept = [name for name in ranges if name not in fixed_params]
+        base = {**dict.fromkeys(ranges), **fixed_params}
+        axes = [list(dict.fromkeys(ranges[name])) for name in swept]
+        total = math.prod(len(axis) for axis in axes)
 
-            # Apply fixed parameters (override generated values)
-            config.update(fixed_params)
+        for index in random.Random(seed).sample(range(total), min(n_trials, total)):
+            values = []
+            for axis in reversed(axes):
+                index, pos = divmod(index, len(axis))
+                values.append(axis[pos])
+            yield {**base, **dict(zip(swept, reversed(values)))}
 
-            yield config
+    @staticmethod
+    def _coarse_ranges(ranges: dict[str, list]) -> dict[str, list]:
+        """
+        Thin each range to every other distinct value (sorted), always keeping both ends.
+
+        Args:
+            ranges: Parameter ranges as returned by _parameter_ranges()
+
+        Returns:
+            Coarse ranges for the first stage of a multi-resolution search
+        """
+        coarse = {}
+        for name, values in ranges.items():
+            values = sorted(set(values))
+            coarse[name] = values[::2] + values[-1:] if len(values) % 2 == 0 else values[::2]
+        return coarse
+
+    def _refine_configs(
+        self,
+        ranges: dict[str, list],
+        fixed_params: dict[str, Any] | None,
+        seeds: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """
+        Build the fine stage of a multi-resolution search around the best coarse configs.
+
+        For each seed, every parameter is swept over its seed value and the values on
+        either side of it in the full (sorted) range. Configurations already in the coarse
+        grid, and repeats across seeds, are dropped.
+
+        Args:
+            ranges: Full parameter ranges as returned by _parameter_ranges()
+            fixed_params: Fixed parameter values (overrides ranges)
+            seeds: Best coarse configurations, best first
+
+        Returns:
+            New configurations to test, grouped by seed in seed order
+        """
+        coarse = self._coarse_ranges(ranges)
+        tried = {
+            tuple(sorted(config.items()))
+            for config in self.generate_parameter_combinations(*coarse.values(), fixed_params)
+        }
+
+        refined = []
+        for seed in seeds:
+            local = {}
+            for name, values in ranges.items():
+                values = sorted(set(values))
+                if seed[name] in values:
+                    pos = values.index(seed[name])
+                    local[name] = values[max(pos - 1, 0) : pos + 2]
+                else:
+                    local[name] = values
+            refined.extend(self.generate_parameter_combinations(*local.values(), fixed_params))
+
+        return [config for config in self._unique_configs(refined) if tuple(sorted(config.items())) not in tried]
 
     def cancel(self) -> None:
         """
         Cancel the current optimization process.
 
-        Sets an internal cancellation flag that is checked during optimization.
+        Sets an internal cancellation event that is checked during optimization.
         When set, the optimization loop will break at the next check point and
         return partial results. The cancellation is checked:
         - At the start of each parameter combination test
@@ -111,7 +429,7 @@ class OptimizationEngine:
             - Call reset_cancellation() before starting a new optimization
         """
         logger.info("[CANCELLATION] OptimizationEngine.cancel() called - setting _cancelled = True")
-        self._cancelled = True
+        self._cancel_event.set()
         logger.info(f"[CANCELLATION] OptimizationEngine: _cancelled flag is now {self._cancelled}")
 
     def reset_cancellation(self) -> None:
@@ -125,37 +443,104 @@ class OptimizationEngine:
         Returns:
             None: Modifies internal state (sets self._cancelled = False)
         """
-        self._cancelled = False
+        self._cancel_event.clear()
+
+    def _data_fingerprint(self) -> str | None:
+        """
+        Fingerprint the data the backtest engine runs on, for the result cache key.
 
-    def save_results(self, results: dict[str, Any]) -> str | None:
+        Hashes the processor's history tensor, team/month mask, months, team and practice
+        names together with BACKTEST_CACHE_VERSION, so cached results are reused only
+        for the same data and backtest logic.
+
+        Returns:
+            Hex digest, or None if the engine has no processed data to fingerprint
+            (caching is then skipped)
+        """
+        try:
+            processor = self.backtest_engine.processor
+            digest = hashlib.sha256(f"v{BACKTEST_CACHE_VERSION}".encode())
+            for array in (processor.history_tensor, processor.team_month_mask, processor.months_array):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            digest.update(json.dumps([processor.get_all_teams(), list(processor.practices)]).encode())
+        except (AttributeError, TypeError, ValueError):
+            return None
+        return digest.hexdigest()
+
+    @staticmethod
+    def _cache_path(fingerprint: str, config: dict[str, Any]) -> Path:
+        """Path of the cached backtest summary for a config on fingerprinted data."""
+        # numpy values key like the equal Python ones (np.int64(5) and 5 share an entry)
+        config_key = json.dumps(config, sort_keys=True, default=_json_default)
+        key = hashlib.sha256((fingerprint + config_key).encode()).hexdigest()
+        return BACKTEST_CACHE_DIR / f"{key}.json"
+
+    def _load_cached_result(self, fingerprint: str, config: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Load a cached backtest summary.
+
+        Returns:
+            Dictionary with CACHED_RESULT_KEYS, or None on a cache miss (including a
+            config that cannot be turned into a cache key)
+        """
+        try:
+            with open(self._cache_path(fingerprint, config)) as f:
+                return json.load(f)
+        except (OSError, TypeError, ValueError):
+            return None
+
+    def _store_cached_result(self, fingerprint: str, config: dict[str, Any], result: dict[str, Any]) -> None:
+        """Cache the summary fields of a completed backtest (atomically; failures only log a warning)."""
+        try:
+            cache_path = self._cache_path(fingerprint, config)
+            data = json.dumps({key: result.get(key) for key in CACHED_RESULT_KEYS}, default=_json_default)
+            BACKTEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=BACKTEST_CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(data)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache backtest result: {e}")
+
+    def save_results(self, results: dict[str, Any], wait_for_save: bool = True) -> str | None:
         """
         Save optimization results to JSON file.
 
+        The file is written under a temporary name and renamed into place, so readers
+        such as load_latest_results() never see a partially written file.
+
         Args:
             results: Results dictionary from find_optimal_config()
+            wait_for_save: If False, the file is written on a background thread and the
+                path is returned right away (write failures are then only logged).
+                Defaults to True.
 
         Returns:
             Path to saved file, or None if save failed
         """
         try:
             # Create results directory if it doesn't exist
-            results_dir = Path("results")
-            results_dir.mkdir(exist_ok=True)
+            RESULTS_DIR.mkdir(exist_ok=True)
 
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"optimization_{timestamp}.json"
-            filepath = results_dir / filename
+            now = datetime.now()
+            filepath = RESULTS_DIR / now.strftime(RESULTS_FILE_FORMAT)
 
             # Add timestamp to results
             results_to_save = results.copy()
-            results_to_save["timestamp"] = datetime.now().isoformat()
+            results_to_save["timestamp"] = now.isoformat()
 
-            # Save to JSON file
-            with open(filepath, "w") as f:
-                json.dump(results_to_save, f, indent=2)
+            if not wait_for_save:
+                _SAVE_EXECUTOR.submit(_write_results_file, results_to_save, filepath).add_done_callback(
+                    _log_save_failure
+                )
+                return str(filepath)
 
-            logger.info(f"Optimization results saved to {filepath}")
+            _write_results_file(results_to_save, filepath)
             return str(filepath)
         except Exception as e:
             logger.warning(f"Failed to save optimization results: {e}")
@@ -170,22 +555,27 @@ class OptimizationEngine:
             Results dictionary, or None if no results found
         """
         try:
-            results_dir = Path("results")
-            if not results_dir.exists():
+            if not RESULTS_DIR.exists():
                 return None
 
-            # Find all optimization result files
-            result_files = list(results_dir.glob("optimization_*.json"))
+            # Find all optimization result files in one directory scan (entries cache
+            # their stat results, so each file is stat-ed at most once)
+            with os.scandir(RESULTS_DIR) as it:
+                result_files = [
+                    entry
+                    for entry in it
+                    if entry.name.startswith("optimization_") and entry.name.endswith(".json") and entry.is_file()
+                ]
             if not result_files:
                 return None
 
-            # Sort by modification time (most recent first)
-            result_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-            latest_file = result_files[0]
+            # Most recently modified file
+            latest_file = max(result_files, key=lambda entry: entry.stat().st_mtime).path
 
             # Load JSON file
-            with open(latest_file) as f:
-                results = json.load(f)
+            with open(latest_file, "rb") as f:
+                data = f.read()
+            results = orjson.loads(data) if orjson is not None else json.loads(data)
 
             logger.info(f"Loaded latest optimization results from {latest_file}")
             return results
@@ -206,6 +596,13 @@ class OptimizationEngine:
         progress_callback: Callable[[int, int, dict[str, Any]], None] | None = None,
         early_stop_threshold: float = 0.25,
         early_stop_min_tested: float = 0.5,
+        n_jobs: int = 1,
+        backend: str | None = None,
+        use_cache: bool = True,
+        multi_resolution: bool = False,
+        search: str = "grid",
+        n_trials: int = 30,
+        seed: int | None = None,
     ) -> dict[str, Any]:
         """
         Find optimal configuration by testing parameter combinations via grid search.
@@ -227,6 +624,21 @@ class OptimizationEngine:
         Cancellation is checked at the start of each parameter combination test and
         during backtest execution. Partial results are returned with 'cancelled': True.
 
+        Multi-Resolution Search:
+        With multi_resolution=True the full grid is not tested. A coarse grid (every other
+        value of each range, ends included) is tested first; then the neighbourhood of the
+        3 best coarse configs by improvement_gap (each value and its adjacent range values)
+        is tested, skipping configs already tested.
+
+        Random Search:
+        With search="random", n_trials distinct combinations are drawn uniformly from the
+        grid instead of testing all of it; with few parameters that matter, a random sample
+        usually gets close to the grid optimum at a fraction of the backtests.
+
+        Result Cache:
+        Completed backtests are cached on disk, keyed by config and a fingerprint of the
+        data, so re-running with overlapping ranges only backtests new combinations.
+
         Results Saving:
         Results are automatically saved to results/optimization_YYYYMMDD_HHMMSS.json
         for later retrieval via load_latest_results().
@@ -250,11 +662,33 @@ class OptimizationEngine:
                 (override ranges). Keys match parameter names. Useful for testing subsets.
             progress_callback (callable, optional): Optional callback function called during
                 optimization. Signature: callback(current: int, total: int, config: dict).
-                Called every 10 iterations and at start.
+                Called for the first and last combination and otherwise at most every
+                PROGRESS_INTERVAL_SECONDS, so fast (e.g. cached) backtests are not slowed
+                down by progress reporting.
             early_stop_threshold (float, optional): Stop early if improvement_gap exceeds
                 this value (0.0-1.0). Defaults to 0.25 (25% improvement gap).
             early_stop_min_tested (float, optional): Minimum fraction (0.0-1.0) of combinations
                 that must be tested before early stopping can occur. Defaults to 0.5 (50%).
+            n_jobs (int, optional): Number of joblib worker processes running backtests
+                concurrently (negative values count back from all cores, as in joblib:
+                -1 = all cores). Results are still consumed in combination order, so the
+                best config and early stopping match a serial run; cancellation is then
+                checked as each result arrives rather than inside the running backtests.
+                Defaults to 1 (serial, in-process).
+            backend (str, optional): joblib backend running the backtests, e.g. "dask" (with
+                a dask.distributed Client) or "ray" (after ray.util.joblib.register_ray())
+                to spread them over a cluster. Giving a backend runs the parallel path
+                even with n_jobs=1. Defaults to None (a local process pool when n_jobs > 1).
+            use_cache (bool, optional): Reuse backtest results cached on disk (under
+                BACKTEST_CACHE_DIR) by earlier runs with the same data and config, and cache
+                newly completed ones. Defaults to True.
+            multi_resolution (bool, optional): Run a coarse-then-fine search instead of the
+                full grid (see Multi-Resolution Search). Defaults to False.
+            search (str, optional): Search strategy: "grid" (every combination) or
+                "random" (see Random Search). Defaults to "grid".
+            n_trials (int, optional): Number of combinations to test with search="random".
+                Defaults to 30.
+            seed (int, optional): Random seed for search="random". Defaults to None.
 
         Returns:
             Dict[str, Any]: Results dictionary containing:
@@ -265,8 +699,10 @@ class OptimizationEngine:
                 - improvement_factor (float): model_accuracy / random_baseline
                 - total_predictions (int): Total predictions made with optimal config
                 - correct_predictions (int): Correct predictions with optimal config
-                - total_combinations_tested (int): Number of combinations evaluated
-                - total_combinations_available (int): Total combinations in grid
+                - total_combinations_tested (int): Number of combinations evaluated (with
+                  multi_resolution, at most the coarse plus refined configs)
+                - total_combinations_available (int): Distinct combinations in grid (after
+                  fixed_params overrides)
                 - valid_combinations (int): Number that met min_accuracy threshold
                 - all_results (list): Top 50 valid results sorted by improvement_gap (descending)
                 - early_stopped (bool): True if stopped early due to excellent solution
@@ -274,6 +710,8 @@ class OptimizationEngine:
                 - results_file (str, optional): Path to saved results file
 
         Raises:
+            ValueError: If search is not "grid" or "random", or multi_resolution is combined
+                with search="random".
             Exception: Any exception during backtest execution is caught and that
                 combination is skipped (does not stop optimization).
 
@@ -292,97 +730,178 @@ class OptimizationEngine:
             - Cancellation flag is automatically reset at start
             - Results are automatically saved to JSON file
         """
+        if search not in ("grid", "random"):
+            raise ValueError(f"Unknown search strategy '{search}' (expected 'grid' or 'random')")
+        if multi_resolution and search != "grid":
+            raise ValueError("multi_resolution requires search='grid'")
+
         # Reset cancellation flag
         logger.info("[CANCELLATION] OptimizationEngine: Starting find_optimal_config - resetting cancellation flag")
         self.reset_cancellation()
 
-        # Generate all combinations
-        combinations = list(
-            self.generate_parameter_combinations(
-                top_n_range=top_n_range,
-                similarity_weight_range=similarity_weight_range,
-                k_similar_range=k_similar_range,
-                similar_teams_lookahead_months_range=similar_teams_lookahead_months_range,
-                recent_improvements_months_range=recent_improvements_months_range,
-                min_similarity_threshold_range=min_similarity_threshold_range,
-                fixed_params=fixed_params,
-            )
+        # Combinations are generated lazily, as the loop consumes them, and are already
+        # distinct (fixed parameters and repeated range values are not swept twice), so no
+        # backtest runs twice
+        ranges = self._parameter_ranges(
+            top_n_range,
+            similarity_weight_range,
+            k_similar_range,
+            similar_teams_lookahead_months_range,
+            recent_improvements_months_range,
+            min_similarity_threshold_range,
         )
+        grid_combinations = self.count_parameter_combinations(ranges, fixed_params)
+
+        # A multi-resolution search starts from the coarse grid; its refinement stage is
+        # added once the coarse results are in, growing total_combinations
+        if search == "random":
+            total_combinations = min(n_trials, grid_combinations)
+            combinations = self.sample_parameter_combinations(ranges, n_trials, fixed_params, seed)
+        else:
+            stage_ranges = self._coarse_ranges(ranges) if multi_resolution else ranges
+            total_combinations = self.count_parameter_combinations(stage_ranges, fixed_params)
+            combinations = self.generate_parameter_combinations(*stage_ranges.values(), fixed_params)
+        refining = False
 
-        total_combinations = len(combinations)
         logger.info(f"[CANCELLATION] OptimizationEngine: Generated {total_combinations} combinations to test")
         valid_results = []
-        best_config = None
+        best_entry = None  # The valid_results entry with the highest improvement_gap
         best_improvement_gap = float("-inf")
         early_stopped = False
         cancelled = False
+        tested_count = 0
+
+        # Results of earlier runs on the same data, looked up as each combination comes up
+        fingerprint = self._data_fingerprint() if use_cache else None
+        cached_results = {}
+
+        # (improvement_gap, config) of every completed coarse backtest, valid or not
+        coarse_scores = []
+        offset = 0
+        last_progress_time = None
+        shared_engine_dir = None  # Engine dump shared by local worker processes
+
+        while True:
+            # With several workers (or a distributed backend), the uncached backtests run ahead
+            # in a worker pool and the loop below takes their results in combination order.
+            # The pool dispatches ahead of the loop, so in that case the combinations and
+            # their cache hits are settled up front
+            run_parallel = backend is not None or effective_n_jobs(n_jobs) > 1
+            parallel_results = None
+            if run_parallel:
+                combinations = list(combinations)
+                if fingerprint:
+                    for cache_idx, config in enumerate(combinations, start=offset):
+                        cached = self._load_cached_result(fingerprint, config)
+                        if cached is not None:
+                            cached_results[cache_idx] = cached
+                if any(cache_idx not in cached_results for cache_idx in range(offset, offset + len(combinations))):
+                    # Local worker processes share one dump of the engine instead of each task
+                    # pickling its own copy; other backends (possibly remote) get the engine
+                    if backend is None:
+                        if shared_engine_dir is None:
+                            shared_engine_dir = tempfile.TemporaryDirectory(
+                                prefix="optimizer-engine-", ignore_cleanup_errors=True
+                            )
+                            engine_arg = os.path.join(shared_engine_dir.name, "engine.joblib")
+                            joblib.dump(self.backtest_engine, engine_arg)
+                        run_config = _run_shared_backtest_config
+                    else:
+                        run_config, engine_arg = _run_backtest_config, self.backtest_engine
+                    parallel_results = Parallel(
+                        n_jobs=n_jobs, backend=backend, prefer="processes", return_as="generator"
+                    )(
+                        delayed(run_config)(engine_arg, config)
+                        for cache_idx, config in enumerate(combinations, start=offset)
+                        if cache_idx not in cached_results
+                    )
 
-        # Test each combination
-        for idx, config in enumerate(combinations):
-            # Log progress every 10 iterations (or at start)
-            if idx == 0 or (idx + 1) % 10 == 0:
-                percentage = ((idx + 1) / total_combinations * 100) if total_combinations > 0 else 0
-                logger.info(
-                    f"[CANCELLATION] OptimizationEngine: Progress: {idx + 1}/{total_combinations} combinations tested ({percentage:.1f}%)"
-                )
-
-            # Check for cancellation
-            if self._cancelled:
-                percentage = ((idx + 1) / total_combinations * 100) if total_combinations > 0 else 0
-                logger.info(
-                    f"[CANCELLATION] OptimizationEngine: Cancellation detected at iteration {idx + 1}/{total_combinations} ({percentage:.1f}% complete) - breaking loop"
+            # Test each combination
+            for idx, config in enumerate(combinations, start=offset):
+                tested_count = idx + 1
+                # Report progress at the first and last combination, otherwise at most every
+                # PROGRESS_INTERVAL_SECONDS
+                now = time.monotonic()
+                report_progress = (
+                    last_progress_time is None
+                    or now - last_progress_time >= PROGRESS_INTERVAL_SECONDS
+                    or idx + 1 == total_combinations
                 )
-                cancelled = True
-                break
-
-            # Progress callback
-            if progress_callback:
-                progress_callback(idx + 1, total_combinations, config)
-
-            logger.debug(
-                f"[CANCELLATION] OptimizationEngine: Starting backtest for combination {idx + 1}/{total_combinations}, _cancelled={self._cancelled}"
-            )
-
-            try:
-                # Run backtest with this configuration
-                # Pass cancellation check lambda so backtest can check cancellation during execution
-                result = self.backtest_engine.run_backtest(config=config, cancellation_check=lambda: self._cancelled)
-
-                # Check if backtest was cancelled mid-execution
-                if result.get("cancelled", False):
+                if report_progress:
+                    last_progress_time = now
+                    # The percentage is only worked out when the line will actually be emitted
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "[CANCELLATION] OptimizationEngine: Progress: %d/%d combinations tested (%.1f%%)",
+                            idx + 1,
+                            total_combinations,
+                            ((idx + 1) / total_combinations * 100) if total_combinations > 0 else 0,
+                        )
+
+                # Check for cancellation
+                if self._cancel_event.is_set():
                     percentage = ((idx + 1) / total_combinations * 100) if total_combinations > 0 else 0
                     logger.info(
-                        f"[CANCELLATION] OptimizationEngine: Backtest returned cancelled=True at iteration {idx + 1}/{total_combinations} ({percentage:.1f}% complete) - breaking loop"
+                        f"[CANCELLATION] OptimizationEngine: Cancellation detected at iteration {idx + 1}/{total_combinations} ({percentage:.1f}% complete) - breaking loop"
                     )
                     cancelled = True
                     break
 
-                if "error" in result:
-                    continue
-
-                accuracy = result.get("overall_accuracy", 0.0)
+                # Progress callback
+                if progress_callback and report_progress:
+                    progress_callback(idx + 1, total_combinations, config)
 
-                # Filter by minimum accuracy
-                if accuracy >= min_accuracy:
-                    improvement_gap = result.get("improvement_gap", 0.0)
-                    random_baseline = result.get("random_baseline", 0.0)
-
-                    valid_results.append(
-                        {
-                            "config": config,
-                            "model_accuracy": accuracy,
-                            "random_baseline": random_baseline,
-                            "improvement_gap": improvement_gap,
-                            "improvement_factor": result.get("improvement_factor", 0.0),
-                            "total_predictions": result.get("total_predictions", 0),
-                            "correct_predictions": result.get("correct_predictions", 0),
-                        }
-                    )
+                logger.debug(
+                    "[CANCELLATION] OptimizationEngine: Starting backtest for combination %d/%d, _cancelled=%s",
+                    idx + 1,
+                    total_combinations,
+                    self._cancelled,
+                )
 
-                    # Track best configuration
-                    if improvement_gap > best_improvement_gap:
-                        best_improvement_gap = improvement_gap
-                        best_config = {
+                try:
+                    # Run backtest with this configuration
+                    # Pass the event's is_set so backtest can check cancellation during execution
+                    if fingerprint and not run_parallel:
+                        cached = self._load_cached_result(fingerprint, config)
+                        if cached is not None:
+                            cached_results[idx] = cached
+                    if idx in cached_results:
+                        result = cached_results[idx]
+                    elif not run_parallel:
+                        result = self.backtest_engine.run_backtest(
+                            config=config, cancellation_check=self._cancel_event.is_set
+                        )
+                    else:
+                        result = next(parallel_results)
+                        if isinstance(result, Exception):
+                            raise result
+
+                    # Check if backtest was cancelled mid-execution
+                    if result.get("cancelled", False):
+                        percentage = ((idx + 1) / total_combinations * 100) if total_combinations > 0 else 0
+                        logger.info(
+                            f"[CANCELLATION] OptimizationEngine: Backtest returned cancelled=True at iteration {idx + 1}/{total_combinations} ({percentage:.1f}% complete) - breaking loop"
+                        )
+                        cancelled = True
+                        break
+
+                    if "error" in result:
+                        continue
+
+                    if fingerprint and idx not in cached_results:
+                        self._store_cached_result(fingerprint, config, result)
+
+                    if multi_resolution and not refining:
+                        coarse_scores.append((result.get("improvement_gap", 0.0), config))
+
+                    accuracy = result.get("overall_accuracy", 0.0)
+
+                    # Filter by minimum accuracy
+                    if accuracy >= min_accuracy:
+                        improvement_gap = result.get("improvement_gap", 0.0)
+                        random_baseline = result.get("random_baseline", 0.0)
+
+                        entry = {
                             "config": config,
                             "model_accuracy": accuracy,
                             "random_baseline": random_baseline,
@@ -391,39 +910,60 @@ class OptimizationEngine:
                             "total_predictions": result.get("total_predictions", 0),
                             "correct_predictions": result.get("correct_predictions", 0),
                         }
-
-                        # Early stopping: if we found an excellent solution
-                        tested_fraction = (idx + 1) / total_combinations
-                        if improvement_gap > early_stop_threshold:
-                            if tested_fraction >= early_stop_min_tested or improvement_gap > 0.30:
-                                # Excellent solution found, stop early
+                        valid_results.append(entry)
+
+                        # Track best configuration (a reference to its entry, no copy)
+                        if improvement_gap > best_improvement_gap:
+                            best_improvement_gap = improvement_gap
+                            best_entry = entry
+
+                            # Early stopping: if we found an excellent solution
+                            tested_fraction = (idx + 1) / total_combinations
+                            if improvement_gap > early_stop_threshold:
+                                if tested_fraction >= early_stop_min_tested or improvement_gap > 0.30:
+                                    # Excellent solution found, stop early
+                                    early_stopped = True
+                                    break
+                            elif improvement_gap > 0.20 and tested_fraction >= 0.5:
+                                # Good solution found after testing at least 50%
                                 early_stopped = True
                                 break
-                        elif improvement_gap > 0.20 and tested_fraction >= 0.5:
-                            # Good solution found after testing at least 50%
-                            early_stopped = True
-                            break
-
-            except KeyboardInterrupt:
-                # Handle Ctrl-C gracefully
-                cancelled = True
+
+                except KeyboardInterrupt:
+                    # Handle Ctrl-C gracefully
+                    cancelled = True
+                    break
+                except Exception:
+                    # Skip configurations that cause errors
+                    continue
+
+            # Stop any backtests still queued or running after a cancel / early stop
+            if parallel_results is not None:
+                parallel_results.close()
+
+            if cancelled or early_stopped or not multi_resolution or refining:
                 break
-            except Exception:
-                # Skip configurations that cause errors
-                continue
 
-        # Sort valid results by improvement_gap (descending)
-        valid_results.sort(key=lambda x: x["improvement_gap"], reverse=True)
+            # Refine around the best coarse configs (ties keep coarse order)
+            seeds = [config for _, config in sorted(coarse_scores, key=lambda x: x[0], reverse=True)[:3]]
+            combinations = self._refine_configs(ranges, fixed_params, seeds)
+            total_combinations += len(combinations)
+            offset = tested_count
+            refining = True
+            logger.info(
+                f"[CANCELLATION] OptimizationEngine: Refining around {len(seeds)} coarse configs - {len(combinations)} more combinations to test"
+            )
 
-        # Calculate total combinations tested (defensive: handle edge case where loop never runs)
-        # If cancelled/early_stopped, use idx + 1 (number of iterations completed)
-        # Otherwise use total_combinations (all were tested)
-        # If idx is not defined (loop never ran), default to 0
-        try:
-            tested_count = idx + 1 if cancelled or early_stopped else total_combinations
-        except NameError:
-            # Loop never ran (edge case: empty combinations list)
-            tested_count = 0
+        if shared_engine_dir is not None:
+            shared_engine_dir.cleanup()
+
+        # Top 50 valid results by improvement_gap (descending; ties keep test order). A
+        # bounded heap selection, not a full sort of every valid result
+        top_results = heapq.nlargest(50, valid_results, key=lambda x: x["improvement_gap"])
+
+        # Combinations tested: those the loop reached (all of them unless cancelled/early stopped)
+        if not (cancelled or early_stopped):
+            tested_count = total_combinations
 
         # Calculate completion percentage
         completion_pct = (tested_count / total_combinations * 100) if total_combinations > 0 else 0
@@ -432,25 +972,35 @@ class OptimizationEngine:
             f"[CANCELLATION] OptimizationEngine: Optimization {status_msg} - tested {tested_count}/{total_combinations} combinations ({completion_pct:.1f}%), found {len(valid_results)} valid results"
         )
 
-        # Build results dictionary
+        # Build results dictionary; the optimal config's summary is read straight from its entry
+        if best_entry is None:
+            best_entry = {
+                "config": None,
+                "model_accuracy": 0.0,
+                "random_baseline": 0.0,
+                "improvement_gap": 0.0,
+                "improvement_factor": 0.0,
+                "total_predictions": 0,
+                "correct_predictions": 0,
+            }
         results = {
-            "optimal_config": best_config["config"] if best_config else None,
-            "model_accuracy": best_config["model_accuracy"] if best_config else 0.0,
-            "random_baseline": best_config["random_baseline"] if best_config else 0.0,
-            "improvement_gap": best_config["improvement_gap"] if best_config else 0.0,
-            "improvement_factor": best_config["improvement_factor"] if best_config else 0.0,
-            "total_predictions": best_config["total_predictions"] if best_config else 0,
-            "correct_predictions": best_config["correct_predictions"] if best_config else 0,
+            "optimal_config": best_entry["config"],
+            "model_accuracy": best_entry["model_accuracy"],
+            "random_baseline": best_entry["random_baseline"],
+            "improvement_gap": best_entry["improvement_gap"],
+            "improvement_factor": best_entry["improvement_factor"],
+            "total_predictions": best_entry["total_predictions"],
+            "correct_predictions": best_entry["correct_predictions"],
             "total_combinations_tested": tested_count,
-            "total_combinations_available": total_combinations,
+            "total_combinations_available": grid_combinations,
             "valid_combinations": len(valid_results),
-            "all_results": valid_results[:50],  # Top 50 results (increased from 10)
+            "all_results": top_results,  # Top 50 results (increased from 10)
             "early_stopped": early_stopped,
             "cancelled": cancelled,
         }
 
-        # Auto-save results (don't fail if save fails)
-        results_file = self.save_results(results)
+        # Auto-save results in the background (don't fail if save fails)
+        results_file = self.save_results(results, wait_for_save=False)
         if results_file:
             results["results_file"] = results_file
 
@@ -29,12 +29,6 @@ _UVICORN_LOG_CONFIG = {
             "datefmt": "%Y-%m-%d %H:%M:%S",
             "use_colors": False,
         },
-        "access": {
-            "()": "uvicorn.logging.AccessFormatter",
-            "fmt": '%(asctime)s [%(levelname)s] %(client_addr)s - "%(request_line)s" %(status_code)s',
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-            "use_colors": False,
-        },
     },
     "handlers": {
         "default": {
@@ -42,19 +36,16 @@ _UVICORN_LOG_CONFIG = {
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stderr",
         },
-        "access": {
-            "formatter": "access",
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
-        },
     },
     "loggers": {
         "uvicorn": {"handlers": ["default"], "level": "INFO", "propagate": False},
         "uvicorn.error": {"handlers": ["default"], "level": "INFO", "propagate": False},
-        "uvicorn.access": {"handlers": ["access"], "level": "WARNING", "propagate": False},
     },
 }
 
+# Default datasets, in order of preference, when no path is given on the command line
+DEFAULT_DATA_FILES = ("data/raw/combined_dataset.xlsx", "data/raw/20250204_Cleaned_Dataset.xlsx")
+
 # Add project root to Python path to enable absolute imports
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
@@ -135,46 +126,35 @@ def main() -> int:
     # Setup path
     if len(sys.argv) > 1:
         excel_file = sys.argv[1]
+        if not os.path.isfile(excel_file):
+            logger.error("Data file not found: %s", excel_file)
+            return 1
     else:
-        # Try bundled path first (PyInstaller executable mode), then relative path (development mode)
-        excel_file = get_resource_path("data/raw/combined_dataset.xlsx")
-        if not os.path.exists(excel_file):
-            excel_file = get_resource_path("data/raw/20250204_Cleaned_Dataset.xlsx")
-            if not os.path.exists(excel_file):
-                # Fallback to relative path (for development)
-                excel_file = "data/raw/combined_dataset.xlsx"
-                if not os.path.exists(excel_file):
-                    excel_file = "data/raw/20250204_Cleaned_Dataset.xlsx"
-                    if not os.path.exists(excel_file):
-                        logger.error("Data file not found. Checked default locations: data/raw/combined_dataset.xlsx")
-                        logger.error("Run with: python src/web_main.py <path_to_excel_file>")
-                        return 1
-
-    if not os.path.exists(excel_file):
-        logger.error("Data file not found: %s", excel_file)
-        return 1
+        # Try bundled paths first (PyInstaller executable mode), then relative paths (development mode)
+        candidates = tuple(get_resource_path(path) for path in DEFAULT_DATA_FILES) + DEFAULT_DATA_FILES
+        excel_file = next((path for path in candidates if os.path.isfile(path)), None)
+        if excel_file is None:
+            logger.error("Data file not found. Checked default locations: %s", ", ".join(DEFAULT_DATA_FILES))
+            logger.error("Run with: python src/web_main.py <path_to_excel_file>")
+            return 1
 
     logger.info("Starting Agile Practice Prediction System")
     logger.info("Dataset: %s", excel_file)
 
-    # Import components
-    import time
-    import webbrowser
-    import uvicorn
-
-    from src.api import APIService
-    from src.api.main import create_app
-    from src.data import DataLoader, DataProcessor, DataValidator
-    from src.ml import RecommendationEngine, SequenceMapper, SimilarityEngine
-
+    # Components are imported next to their first use, so a bad dataset fails
+    # before the ML and web stacks are loaded
     try:
         # Step 1: Load data
+        from src.data import DataLoader
+
         logger.info("[1/5] Reading dataset...")
         loader = DataLoader(excel_file)
-        df = loader.load()
+        df = loader.load(use_cache=True)
         practices = loader.practices
 
         # Step 2: Validate data
+        from src.data import DataValidator
+
         logger.info("[2/5] Checking data quality...")
         validator = DataValidator(df, practices)
         validator.validate()
@@ -195,15 +175,19 @@ def main() -> int:
         filtered_missing_details = validator.get_missing_values_details_for_practices(practices)
 
         # Step 4: Process data
+        from src.data import DataProcessor
+
         logger.info("[4/5] Building team histories...")
         processor = DataProcessor(df, practices)
         processor.process()
         logger.info("Normalized scores for %d teams", len(processor.team_histories))
 
         # Step 5: Build ML models
+        from src.ml import RecommendationEngine, SequenceMapper, SimilarityEngine
+
         logger.info("[5/5] Training recommendation models...")
 
-        # Similarity engine (will be built on demand)
+        # Similarity engine (index warmed in the background once the server starts)
         similarity_engine = SimilarityEngine(processor)
 
         # Sequence mapper
@@ -215,6 +199,9 @@ def main() -> int:
         recommender = RecommendationEngine(similarity_engine, sequence_mapper, practices)
 
         # Create API service and app
+        from src.api import APIService
+        from src.api.main import create_app
+
         service = APIService(recommender, processor)
         # Store filtered missing values details for API
         service.missing_values_details = filtered_missing_details
@@ -226,11 +213,22 @@ def main() -> int:
 
         # Start server with increased timeout settings for long-running requests
         # Use threading to allow browser opening after server starts
+        import socket
         import threading
+        import time
+        import webbrowser
+
+        import uvicorn
         
         def open_browser_after_delay():
-            """Open browser after server has had time to start"""
-            time.sleep(2.0)  # Wait for server to be ready
+            """Open browser as soon as the server accepts connections (or after 5 seconds)"""
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline:
+                try:
+                    with socket.create_connection(("127.0.0.1", 8000), timeout=0.1):
+                        break
+                except OSError:
+                    time.sleep(0.05)  # Not listening yet
             try:
                 webbrowser.open('http://localhost:8000')
             except Exception:
@@ -240,13 +238,22 @@ def main() -> int:
         # Start browser opener in background thread
         browser_thread = threading.Thread(target=open_browser_after_delay, daemon=True)
         browser_thread.start()
+
+        # Build the similarity index off the startup path, so the first request finds it ready
+        warm_up_thread = threading.Thread(target=similarity_engine.warm_up, daemon=True)
+        warm_up_thread.start()
         
-        # Start server (this will block until Ctrl+C)
+        # Start server (this will block until Ctrl+C). It stays a single worker: the optimizer's
+        # cancel flag and the models live in this process, so a cancel request routed to another
+        # worker would never reach the running optimization
         uvicorn.run(
             app,
             host="0.0.0.0",
             port=8000,
             log_config=_UVICORN_LOG_CONFIG,
+            # Access lines were filtered out at WARNING anyway; disabling the access log
+            # also skips building a log call for every request
+            access_log=False,
             timeout_keep_alive=300,
             timeout_graceful_shutdown=30,
         )
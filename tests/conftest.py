@@ -7,25 +7,31 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+from unittest.mock import DEFAULT, patch
 
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.data import DataLoader, DataProcessor, DataValidator
 from src.ml import SimilarityEngine, SequenceMapper, RecommendationEngine
+from tests.sample_data import SAMPLE_DATA, SAMPLE_PRACTICES
+
+
+@pytest.fixture(scope="module")
+def patched_api_service_dependencies():
+    """Patch the engines APIService builds in its constructor, once per requesting module.
+
+    Not autouse and not session-scoped: the UI tests build a real APIService.
+    """
+    with patch.multiple('src.api.service', BacktestEngine=DEFAULT, OptimizationEngine=DEFAULT,
+                        PracticeDefinitionsLoader=DEFAULT) as patched:
+        yield patched
 
 
 @pytest.fixture
 def sample_dataframe():
     """Create sample DataFrame for testing."""
-    data = {
-        'Team Name': ['Team1', 'Team1', 'Team1', 'Team2', 'Team2', 'Team2', 'Team3', 'Team3', 'Team3'],
-        'Month': [202001, 202002, 202003, 202001, 202002, 202003, 202001, 202002, 202003],
-        'Practice1': [1, 2, 2, 1, 2, 2, 0, 1, 1],
-        'Practice2': [0, 1, 2, 0, 1, 1, 1, 2, 2],
-        'Practice3': [2, 3, 3, 1, 2, 3, 2, 2, 3]
-    }
-    return pd.DataFrame(data)
+    return pd.DataFrame(SAMPLE_DATA)
 
 
 @pytest.fixture
@@ -57,12 +63,12 @@ def sample_dataframe_invalid():
 @pytest.fixture
 def sample_practices():
     """Sample practice list."""
-    return ['Practice1', 'Practice2', 'Practice3']
+    return list(SAMPLE_PRACTICES)
 
 
 @pytest.fixture
 def sample_processor(sample_dataframe, sample_practices):
-    """Create a DataProcessor with sample data."""
+    """Create a DataProcessor with sample data (fresh per test; see shared_sample_processor)."""
     processor = DataProcessor(sample_dataframe, sample_practices)
     processor.process()
     return processor
@@ -90,10 +96,31 @@ def sample_sequence_mapper(sample_processor, sample_practices):
 
 @pytest.fixture
 def sample_recommender(sample_similarity_engine, sample_sequence_mapper, sample_practices):
-    """Create a RecommendationEngine with all dependencies."""
+    """Create a RecommendationEngine with all dependencies (fresh per test; see shared_sample_recommender)."""
     return RecommendationEngine(sample_similarity_engine, sample_sequence_mapper, sample_practices)
 
 
+@pytest.fixture(scope="session")
+def shared_sample_processor():
+    """Create a processed DataProcessor with sample data, once per session (read-only)."""
+    processor = DataProcessor(pd.DataFrame(SAMPLE_DATA), list(SAMPLE_PRACTICES))
+    processor.process()
+    return processor
+
+
+@pytest.fixture(scope="session")
+def shared_sample_recommender(shared_sample_processor):
+    """Create a RecommendationEngine on shared_sample_processor, once per session.
+
+    Treat it as read-only; recommend() and run_backtest() relearn its sequence mapper up to
+    the month they need, which is fine for their callers but not for tests that expect the
+    full learned sequences.
+    """
+    mapper = SequenceMapper(shared_sample_processor, list(SAMPLE_PRACTICES))
+    mapper.learn_sequences()
+    return RecommendationEngine(SimilarityEngine(shared_sample_processor), mapper, list(SAMPLE_PRACTICES))
+
+
 @pytest.fixture
 def empty_dataframe():
     """Create empty DataFrame."""
@@ -0,0 +1,16 @@
+"""
+Sample dataset shared by the test fixtures and by test modules.
+
+Test modules import these constants from here rather than from conftest.py, which pytest
+loads itself and which is not meant to be imported.
+"""
+
+SAMPLE_DATA = {
+    'Team Name': ['Team1', 'Team1', 'Team1', 'Team2', 'Team2', 'Team2', 'Team3', 'Team3', 'Team3'],
+    'Month': [202001, 202002, 202003, 202001, 202002, 202003, 202001, 202002, 202003],
+    'Practice1': [1, 2, 2, 1, 2, 2, 0, 1, 1],
+    'Practice2': [0, 1, 2, 0, 1, 1, 1, 2, 2],
+    'Practice3': [2, 3, 3, 1, 2, 3, 2, 2, 3]
+}
+SAMPLE_PRACTICES = ['Practice1', 'Practice2', 'Practice3']
+SAMPLE_MONTHS = sorted(set(SAMPLE_DATA['Month']))
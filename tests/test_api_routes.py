@@ -12,9 +12,10 @@ from src.api.service import APIService
 class TestAPIRoutes:
     """Test API routes functionality."""
     
-    @pytest.fixture
-    def mock_service(self):
-        """Create mock APIService."""
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_service(cls):
+        """Create mock APIService (shared by the class; tests override it via monkeypatch)."""
         service = Mock(spec=APIService)
         service.get_all_teams = Mock(return_value=[
             {'name': 'Team1', 'num_months': 3, 'months': [202001, 202002, 202003],
@@ -73,14 +74,21 @@ class TestAPIRoutes:
         service.optimizer_engine.cancel = Mock()
         return service
     
-    @pytest.fixture
-    def client(self, mock_service):
-        """Create test client."""
+    @pytest.fixture(scope="class")
+    @classmethod
+    def client(cls, mock_service):
+        """Create test client (shared by the class)."""
         router = create_routes(mock_service)
         from fastapi import FastAPI
         app = FastAPI()
         app.include_router(router)
         return TestClient(app)
+
+    @pytest.fixture(autouse=True)
+    def reset_mock_calls(self, mock_service):
+        """Clear recorded calls on the shared mock after each test (return values are kept)."""
+        yield
+        mock_service.reset_mock()
     
     def test_get_teams(self, client, mock_service):
         """Test GET /api/teams endpoint."""
@@ -89,6 +97,7 @@ class TestAPIRoutes:
         data = response.json()
         assert isinstance(data, list)
         mock_service.get_all_teams.assert_called_once()
+        assert response.headers['cache-control'] == 'max-age=60'
     
     def test_get_teams_with_improvements(self, client, mock_service):
         """Test GET /api/teams/with-improvements endpoint."""
@@ -106,9 +115,9 @@ class TestAPIRoutes:
         assert 'team' in data
         assert 'months' in data
     
-    def test_get_team_months_not_found(self, client, mock_service):
+    def test_get_team_months_not_found(self, client, mock_service, monkeypatch):
         """Test GET /api/teams/{team_name}/months with unknown team."""
-        mock_service.get_team_months = Mock(return_value=None)
+        monkeypatch.setattr(mock_service, 'get_team_months', Mock(return_value=None))
         response = client.get("/api/teams/UnknownTeam/months")
         assert response.status_code == 404
     
@@ -126,9 +135,9 @@ class TestAPIRoutes:
         assert 'team' in data
         assert 'recommendations' in data
     
-    def test_post_recommendations_error(self, client, mock_service):
+    def test_post_recommendations_error(self, client, mock_service, monkeypatch):
         """Test POST /api/recommendations with error."""
-        mock_service.get_recommendations = Mock(return_value={'error': 'Team not found'})
+        monkeypatch.setattr(mock_service, 'get_recommendations', Mock(return_value={'error': 'Team not found'}))
         request_data = {'team': 'UnknownTeam', 'month': 202003}
         response = client.post("/api/recommendations", json=request_data)
         assert response.status_code == 400
@@ -155,6 +164,23 @@ class TestAPIRoutes:
         data = response.json()
         assert 'sequences' in data
     
+    def test_get_sequences_serializes_numpy_and_int_keys(self, client, mock_service, monkeypatch):
+        """Test untyped responses handle numpy values and non-string keys like the default encoder."""
+        import numpy as np
+
+        monkeypatch.setattr(mock_service.get_improvement_sequences, 'return_value', {
+            'sequences': [{'from': 'Practice1', 'to': 'Practice2', 'count': np.int64(3), 'probability': np.float64(0.5)}],
+            'stats': {202001: 1},
+        })
+        response = client.get("/api/sequences")
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/json'
+        assert response.json() == {
+            'sequences': [{'from': 'Practice1', 'to': 'Practice2', 'count': 3, 'probability': 0.5}],
+            'stats': {'202001': 1},
+        }
+
     def test_post_optimize(self, client, mock_service):
         """Test POST /api/optimize endpoint."""
         request_data = {'min_accuracy': 0.5}
@@ -178,3 +204,21 @@ class TestAPIRoutes:
             response = client.get("/api/optimize/latest")
             assert response.status_code == 200
 
+
+    def test_create_app_compresses_large_responses(self, mock_service, monkeypatch):
+        """Test create_app gzips large JSON responses but not small ones."""
+        from src.api.main import create_app
+
+        client = TestClient(create_app(mock_service))
+
+        small = client.get("/api/teams", headers={'Accept-Encoding': 'gzip'})
+        assert 'content-encoding' not in small.headers
+
+        monkeypatch.setattr(mock_service.get_all_teams, 'return_value', [
+            {'name': f'Team{i}', 'num_months': 3, 'months': [202001, 202002, 202003],
+             'first_month': 202001, 'last_month': 202003}
+            for i in range(50)
+        ])
+        large = client.get("/api/teams", headers={'Accept-Encoding': 'gzip'})
+        assert large.headers['content-encoding'] == 'gzip'
+        assert len(large.json()) == 50
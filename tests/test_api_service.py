@@ -3,46 +3,134 @@ Tests for APIService class.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock
 from src.api.service import APIService
+from src.ml import RecommendationEngine, SequenceMapper, SimilarityEngine
+
+# Default processor data; read-only, so it is built once and shared by every test
+TEAMS = ('Team1', 'Team2')
+MONTHS = (202001, 202002, 202003)
+TEAM_HISTORY = MappingProxyType({
+    202001: (0.33, 0.33, 0.33),
+    202002: (0.67, 0.33, 0.33),
+    202003: (0.67, 0.67, 0.33)
+})
+
+# Canned engine results. run_backtest() normalizes its result in place, so tests hand
+# it a copy of BACKTEST_RESULT
+BACKTEST_RESULT = {
+    'total_predictions': 100,
+    'correct_predictions': 70,
+    'overall_accuracy': 0.7,
+    'random_baseline': 0.1,
+    'improvement_gap': 0.6,
+    'improvement_factor': 7.0,
+    'per_month_results': [],
+    'teams_tested': 10,
+    'avg_improvements_per_case': 2.5
+}
+
+OPTIMIZER_RESULT = {
+    'optimal_config': {'top_n': 3},
+    'model_accuracy': 0.75,
+    'random_baseline': 0.1,
+    'improvement_gap': 0.65,
+    'improvement_factor': 7.5,
+    'total_predictions': 100,
+    'correct_predictions': 75,
+    'total_combinations_tested': 10,
+    'total_combinations_available': 20,
+    'valid_combinations': 5,
+    'all_results': [],
+    'early_stopped': False,
+    'cancelled': False
+}
+
+# Keys the corresponding APIService results (or each of their items) must carry
+TEAM_INFO_KEYS = frozenset({'name', 'num_months', 'months', 'first_month', 'last_month'})
+IMPROVEMENT_KEYS = frozenset({'team', 'month', 'num_improvements', 'improvements'})
+SYSTEM_STATS_KEYS = frozenset({'num_teams', 'num_practices', 'num_months', 'total_observations', 'months', 'practices'})
+RECOMMENDATION_KEYS = frozenset({
+    'practice', 'score', 'current_level', 'original_level', 'level_num', 'level_description',
+    'level_display', 'why', 'similar_teams', 'validated'
+})
+
+
+def _const(value):
+    """Return a plain function that always returns value (a call-free stand-in for a mock)."""
+    return lambda *args, **kwargs: value
+
+
+def _reset_service(service, recommender, processor):
+    """Restore the default mock behaviour and clear the service caches."""
+    recommender.reset_mock(return_value=True, side_effect=True)
+    recommender.practices = ['Practice1', 'Practice2', 'Practice3']
+
+    processor.get_all_teams = _const(TEAMS)
+    processor.get_all_months = _const(MONTHS)
+    processor.get_team_history = _const(TEAM_HISTORY)
+
+    service.backtest_engine.reset_mock(return_value=True, side_effect=True)
+    service.optimizer_engine.reset_mock(return_value=True, side_effect=True)
+    service.practice_definitions = {}
+    service.practice_remarks = {}
+    service.missing_values_details = None
+    service._all_teams = None
+    service._team_months = {}
 
 
 class TestAPIService:
     """Test APIService functionality."""
     
-    @pytest.fixture
-    def mock_recommender(self):
-        """Create mock RecommendationEngine."""
-        recommender = Mock()
-        recommender.practices = ['Practice1', 'Practice2', 'Practice3']
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_recommender(cls):
+        """Create mock RecommendationEngine (configured per test by reset_mocks)."""
+        recommender = MagicMock(spec=RecommendationEngine)
+        # Instance attributes are not part of the class spec
+        recommender.sequence_mapper = MagicMock(spec=SequenceMapper)
+        recommender.similarity_engine = MagicMock(spec=SimilarityEngine)
         return recommender
     
-    @pytest.fixture
-    def mock_processor(self):
-        """Create mock DataProcessor."""
-        processor = Mock()
-        processor.get_all_teams = Mock(return_value=['Team1', 'Team2'])
-        processor.get_all_months = Mock(return_value=[202001, 202002, 202003])
-        processor.get_team_history = Mock(return_value={
-            202001: [0.33, 0.33, 0.33],
-            202002: [0.67, 0.33, 0.33],
-            202003: [0.67, 0.67, 0.33]
-        })
-        return processor
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_processor(cls):
+        """Create stand-in DataProcessor (configured per test by reset_mocks).
+
+        APIService only reads from the processor, so its methods are constant functions
+        rather than mocks; tests override one with monkeypatch.setattr (e.g. a
+        MagicMock(wraps=...) to count calls), which is undone after the test.
+        """
+        return SimpleNamespace()
     
-    @pytest.fixture
-    def api_service(self, mock_recommender, mock_processor):
-        """Create APIService with mocked dependencies."""
-        with patch('src.api.service.BacktestEngine'), \
-             patch('src.api.service.OptimizationEngine'), \
-             patch('src.api.service.PracticeDefinitionsLoader'):
-            service = APIService(mock_recommender, mock_processor)
-            service.backtest_engine = Mock()
-            service.optimizer_engine = Mock()
-            service.practice_definitions = {}
-            service.practice_remarks = {}
-            service.missing_values_details = None
-            return service
+    @pytest.fixture(scope="class")
+    @classmethod
+    def api_service(cls, patched_api_service_dependencies, mock_recommender, mock_processor):
+        """Create APIService with mocked dependencies, once for the class."""
+        return APIService(mock_recommender, mock_processor)
+
+    @pytest.fixture(autouse=True)
+    def reset_mocks(self, api_service, mock_recommender, mock_processor):
+        """Restore the default mock behaviour and clear the service caches before each test."""
+        _reset_service(api_service, mock_recommender, mock_processor)
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def recommendations_result(cls, api_service, mock_recommender, mock_processor):
+        """Call get_recommendations('Team1', 202003, top_n=2) once for the class, on stubbed engine output."""
+        _reset_service(api_service, mock_recommender, mock_processor)
+        mock_recommender.recommend.return_value = [
+            ('Practice1', 0.8, 0.33),
+            ('Practice2', 0.7, 0.67)
+        ]
+        mock_recommender.get_recommendation_explanation.return_value = {
+            'similar_teams_improved': 2,
+            'total_similar_teams_checked': 5,
+            'has_sequence_boost': True,
+            'similar_teams_list': []
+        }
+        return api_service.get_recommendations('Team1', 202003, top_n=2)
     
     def test_get_all_teams(self, api_service, mock_processor):
         """Test get_all_teams returns team information."""
@@ -53,12 +141,19 @@ class TestAPIService:
         
         # Check structure
         for team_info in teams:
-            assert 'name' in team_info
-            assert 'num_months' in team_info
-            assert 'months' in team_info
-            assert 'first_month' in team_info
-            assert 'last_month' in team_info
+            assert TEAM_INFO_KEYS <= team_info.keys()
     
+    def test_team_lists_are_cached(self, api_service, mock_processor, monkeypatch):
+        """Test get_all_teams and get_team_months compute once and reuse the result."""
+        monkeypatch.setattr(mock_processor, 'get_team_history', MagicMock(wraps=mock_processor.get_team_history))
+        teams = api_service.get_all_teams()
+        months = api_service.get_team_months('Team1')
+        calls = mock_processor.get_team_history.call_count
+
+        assert api_service.get_all_teams() is teams
+        assert api_service.get_team_months('Team1') is months
+        assert mock_processor.get_team_history.call_count == calls
+
     def test_get_teams_with_improvements(self, api_service, mock_processor):
         """Test get_teams_with_improvements returns teams with improvements."""
         teams_with_improvements = api_service.get_teams_with_improvements()
@@ -67,10 +162,7 @@ class TestAPIService:
         
         # Check structure
         for team_info in teams_with_improvements:
-            assert 'team' in team_info
-            assert 'month' in team_info
-            assert 'num_improvements' in team_info
-            assert 'improvements' in team_info
+            assert IMPROVEMENT_KEYS <= team_info.keys()
     
     def test_get_team_months(self, api_service, mock_processor):
         """Test get_team_months returns available months for team."""
@@ -80,41 +172,25 @@ class TestAPIService:
         # Should only include months 3+ (filtering first 2 months)
         # Since we have 3 months, should return at least month 3
     
-    def test_get_team_months_team_not_found(self, api_service, mock_processor):
+    def test_get_team_months_team_not_found(self, api_service, mock_processor, monkeypatch):
         """Test get_team_months returns None for unknown team."""
-        mock_processor.get_all_teams = Mock(return_value=['Team1'])
+        monkeypatch.setattr(mock_processor, 'get_all_teams', lambda: ['Team1'])
         
         months = api_service.get_team_months('UnknownTeam')
         
         assert months is None
     
-    def test_get_recommendations_basic(self, api_service, mock_recommender, mock_processor):
+    def test_get_recommendations_basic(self, recommendations_result):
         """Test get_recommendations returns recommendations."""
-        mock_recommender.recommend = Mock(return_value=[
-            ('Practice1', 0.8, 0.33),
-            ('Practice2', 0.7, 0.33)
-        ])
-        mock_recommender.get_recommendation_explanation = Mock(return_value={
-            'similar_teams_improved': 2,
-            'total_similar_teams_checked': 5,
-            'has_sequence_boost': True,
-            'similar_teams_list': []
-        })
+        result = recommendations_result
         
-        result = api_service.get_recommendations('Team1', 202003, top_n=2)
-        
-        assert isinstance(result, dict)
-        assert 'team' in result
-        assert 'month' in result
-        assert 'recommendations' in result
-        assert 'validation' in result
-        assert 'practice_profile' in result
+        assert {'team', 'month', 'recommendations', 'validation', 'practice_profile'} <= result.keys()
         
         assert len(result['recommendations']) == 2
     
-    def test_get_recommendations_team_not_found(self, api_service, mock_processor):
+    def test_get_recommendations_team_not_found(self, api_service, mock_processor, monkeypatch):
         """Test get_recommendations returns error for unknown team."""
-        mock_processor.get_all_teams = Mock(return_value=['Team1'])
+        monkeypatch.setattr(mock_processor, 'get_all_teams', lambda: ['Team1'])
         
         result = api_service.get_recommendations('UnknownTeam', 202003)
         
@@ -130,42 +206,15 @@ class TestAPIService:
     
     def test_run_backtest(self, api_service):
         """Test run_backtest runs backtest and returns results."""
-        mock_result = {
-            'total_predictions': 100,
-            'correct_predictions': 70,
-            'overall_accuracy': 0.7,
-            'random_baseline': 0.1,
-            'improvement_gap': 0.6,
-            'improvement_factor': 7.0,
-            'per_month_results': [],
-            'teams_tested': 10,
-            'avg_improvements_per_case': 2.5
-        }
-        
-        api_service.backtest_engine.run_backtest = Mock(return_value=mock_result)
+        api_service.backtest_engine.run_backtest.return_value = dict(BACKTEST_RESULT)
         
         result = api_service.run_backtest()
         
-        assert isinstance(result, dict)
-        assert 'total_predictions' in result
-        assert 'overall_accuracy' in result
-        assert 'random_baseline' in result
+        assert {'total_predictions', 'overall_accuracy', 'random_baseline'} <= result.keys()
     
     def test_run_backtest_with_config(self, api_service):
         """Test run_backtest accepts configuration."""
-        mock_result = {
-            'total_predictions': 100,
-            'correct_predictions': 70,
-            'overall_accuracy': 0.7,
-            'random_baseline': 0.1,
-            'improvement_gap': 0.6,
-            'improvement_factor': 7.0,
-            'per_month_results': [],
-            'teams_tested': 10,
-            'avg_improvements_per_case': 2.5
-        }
-        
-        api_service.backtest_engine.run_backtest = Mock(return_value=mock_result)
+        api_service.backtest_engine.run_backtest.return_value = dict(BACKTEST_RESULT)
         
         config = {
             'top_n': 3,
@@ -180,34 +229,14 @@ class TestAPIService:
     
     def test_find_optimal_config(self, api_service):
         """Test find_optimal_config runs optimization."""
-        mock_result = {
-            'optimal_config': {'top_n': 3},
-            'model_accuracy': 0.75,
-            'random_baseline': 0.1,
-            'improvement_gap': 0.65,
-            'improvement_factor': 7.5,
-            'total_predictions': 100,
-            'correct_predictions': 75,
-            'total_combinations_tested': 10,
-            'total_combinations_available': 20,
-            'valid_combinations': 5,
-            'all_results': [],
-            'early_stopped': False,
-            'cancelled': False
-        }
-        
-        api_service.optimizer_engine.find_optimal_config = Mock(return_value=mock_result)
+        api_service.optimizer_engine.find_optimal_config.return_value = OPTIMIZER_RESULT
         
         result = api_service.find_optimal_config(min_accuracy=0.5)
         
-        assert isinstance(result, dict)
-        assert 'optimal_config' in result
-        assert 'model_accuracy' in result
+        assert {'optimal_config', 'model_accuracy'} <= result.keys()
     
     def test_cancel_optimization(self, api_service):
         """Test cancel_optimization cancels optimization."""
-        api_service.optimizer_engine.cancel = Mock()
-        
         api_service.cancel_optimization()
         
         api_service.optimizer_engine.cancel.assert_called_once()
@@ -216,82 +245,36 @@ class TestAPIService:
         """Test get_system_stats returns system statistics."""
         stats = api_service.get_system_stats()
         
-        assert isinstance(stats, dict)
-        assert 'num_teams' in stats
-        assert 'num_practices' in stats
-        assert 'num_months' in stats
-        assert 'total_observations' in stats
-        assert 'months' in stats
-        assert 'practices' in stats
+        assert SYSTEM_STATS_KEYS <= stats.keys()
     
     def test_get_improvement_sequences(self, api_service, mock_recommender):
         """Test get_improvement_sequences returns sequences."""
-        mock_recommender.sequence_mapper = Mock()
-        mock_recommender.sequence_mapper.get_all_sequences = Mock(return_value=[
+        mock_recommender.sequence_mapper.get_all_sequences.return_value = [
             ('Practice1', 'Practice2', 5, 0.5),
             ('Practice2', 'Practice3', 3, 0.3)
-        ])
-        mock_recommender.sequence_mapper.get_sequence_stats = Mock(return_value={
+        ]
+        mock_recommender.sequence_mapper.get_sequence_stats.return_value = {
             'num_transition_types': 2,
             'total_transitions': 8,
             'practices_that_improved': 3
-        })
+        }
         
         result = api_service.get_improvement_sequences()
         
-        assert isinstance(result, dict)
-        assert 'sequences' in result
-        assert 'grouped_sequences' in result
-        assert 'stats' in result
-        assert 'total_sequences' in result
+        assert {'sequences', 'grouped_sequences', 'stats', 'total_sequences'} <= result.keys()
     
-    def test_get_recommendations_formats_correctly(self, api_service, mock_recommender, mock_processor):
+    def test_get_recommendations_formats_correctly(self, recommendations_result):
         """Test get_recommendations formats recommendations correctly."""
-        mock_recommender.recommend = Mock(return_value=[
-            ('Practice1', 0.8, 0.33),
-            ('Practice2', 0.7, 0.67)
-        ])
-        mock_recommender.get_recommendation_explanation = Mock(return_value={
-            'similar_teams_improved': 2,
-            'total_similar_teams_checked': 5,
-            'has_sequence_boost': True,
-            'similar_teams_list': []
-        })
-        
-        result = api_service.get_recommendations('Team1', 202003, top_n=2)
-        
         # Check recommendation format
-        for rec in result['recommendations']:
-            assert 'practice' in rec
-            assert 'score' in rec
-            assert 'current_level' in rec
-            assert 'original_level' in rec
-            assert 'level_num' in rec
-            assert 'level_description' in rec
-            assert 'level_display' in rec
-            assert 'why' in rec
-            assert 'similar_teams' in rec
-            assert 'validated' in rec
+        for rec in recommendations_result['recommendations']:
+            assert RECOMMENDATION_KEYS <= rec.keys()
     
-    def test_get_recommendations_validation_summary(self, api_service, mock_recommender, mock_processor):
+    def test_get_recommendations_validation_summary(self, recommendations_result):
         """Test get_recommendations includes validation summary."""
-        mock_recommender.recommend = Mock(return_value=[
-            ('Practice1', 0.8, 0.33)
-        ])
-        mock_recommender.get_recommendation_explanation = Mock(return_value={
-            'similar_teams_improved': 2,
-            'total_similar_teams_checked': 5,
-            'has_sequence_boost': True,
-            'similar_teams_list': []
-        })
-        
-        result = api_service.get_recommendations('Team1', 202003, top_n=1)
-        
-        assert 'validation' in result
-        validation = result['validation']
+        assert 'validation' in recommendations_result
+        validation = recommendations_result['validation']
         assert 'next_month' in validation
         assert 'actual_improvements' in validation
         assert 'validated_count' in validation
         assert 'total_recommendations' in validation
         assert 'accuracy' in validation
-
@@ -1,80 +1,74 @@
 """
 Tests for BacktestEngine class.
 """
-
+import itertools
 import pytest
 from unittest.mock import Mock, patch
 from src.validation.backtest import BacktestEngine
+from tests.sample_data import SAMPLE_MONTHS
+
+# run_backtest() needs at least 4 months; decided once at collection, before any fixture runs
+needs_backtest_months = pytest.mark.skipif(len(SAMPLE_MONTHS) < 4, reason="Need at least 4 months for backtest")
+
+# Keys of every backtest result, complete or partial (cancelled)
+RESULT_KEYS = frozenset({
+    'per_month_results', 'total_predictions', 'correct_predictions', 'overall_accuracy', 'random_baseline',
+    'improvement_gap'
+})
+PER_MONTH_KEYS = frozenset({'month', 'train_months', 'predictions', 'correct', 'accuracy', 'teams_tested'})
 
 
 class TestBacktestEngine:
     """Test BacktestEngine functionality."""
+
+    @pytest.fixture(scope="session")
+    @classmethod
+    def backtest(cls, shared_sample_recommender, shared_sample_processor):
+        """Create one BacktestEngine for the session (tests that inspect caches build their own)."""
+        return BacktestEngine(shared_sample_recommender, shared_sample_processor)
+
+    @pytest.fixture(scope="session")
+    @classmethod
+    def backtest_result(cls, backtest):
+        """Run the default backtest once per session (it is deterministic); returns (engine, result)."""
+        return backtest, backtest.run_backtest()
     
-    def test_initialization(self, sample_recommender, sample_processor):
+    def test_initialization(self, shared_sample_recommender, shared_sample_processor):
         """Test BacktestEngine can be initialized."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        assert backtest.recommender == sample_recommender
-        assert backtest.processor == sample_processor
+        backtest = BacktestEngine(shared_sample_recommender, shared_sample_processor)
+        assert backtest.recommender == shared_sample_recommender
+        assert backtest.processor == shared_sample_processor
     
-    def test_run_backtest_insufficient_data(self, sample_recommender, sample_processor):
+    @pytest.mark.skipif(len(SAMPLE_MONTHS) >= 4, reason="Have sufficient data for backtest")
+    def test_run_backtest_insufficient_data(self, backtest):
         """Test run_backtest returns error when insufficient data."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        
-        # Create processor with less than 4 months
-        months = sample_processor.get_all_months()
-        if len(months) >= 4:
-            # Skip if we have enough data
-            pytest.skip("Have sufficient data for backtest")
-        
         result = backtest.run_backtest()
         
         assert 'error' in result
         assert '4 time periods' in result['error'] or '4' in result['error']
     
-    def test_run_backtest_basic(self, sample_recommender, sample_processor):
+    @needs_backtest_months
+    def test_run_backtest_basic(self, backtest_result):
         """Test run_backtest runs successfully with sufficient data."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        months = sample_processor.get_all_months()
-        
-        if len(months) < 4:
-            pytest.skip("Need at least 4 months for backtest")
-        
-        result = backtest.run_backtest()
+        _, result = backtest_result
         
         assert isinstance(result, dict)
         assert 'status' in result or 'error' in result
         
         if 'error' not in result:
-            assert 'per_month_results' in result
-            assert 'total_predictions' in result
-            assert 'correct_predictions' in result
-            assert 'overall_accuracy' in result
-            assert 'random_baseline' in result
-            assert 'improvement_gap' in result
-            assert 'improvement_factor' in result
-            assert 'teams_tested' in result
+            assert RESULT_KEYS | {'improvement_factor', 'teams_tested'} <= result.keys()
     
-    def test_run_backtest_per_month_results(self, sample_recommender, sample_processor):
+    @needs_backtest_months
+    def test_run_backtest_per_month_results(self, backtest_result):
         """Test run_backtest returns per-month results."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        months = sample_processor.get_all_months()
-        
-        if len(months) < 4:
-            pytest.skip("Need at least 4 months for backtest")
-        
-        result = backtest.run_backtest()
+        _, result = backtest_result
         
         if 'error' not in result:
             assert isinstance(result['per_month_results'], list)
             
             # Check structure of per-month results
             for month_result in result['per_month_results']:
-                assert 'month' in month_result
-                assert 'train_months' in month_result
-                assert 'predictions' in month_result
-                assert 'correct' in month_result
-                assert 'accuracy' in month_result
-                assert 'teams_tested' in month_result
+                assert PER_MONTH_KEYS <= month_result.keys()
                 
                 assert isinstance(month_result['month'], int)
                 assert isinstance(month_result['train_months'], list)
@@ -83,15 +77,10 @@ class TestBacktestEngine:
                 assert isinstance(month_result['accuracy'], float)
                 assert 0.0 <= month_result['accuracy'] <= 1.0
     
-    def test_run_backtest_accuracy_calculation(self, sample_recommender, sample_processor):
+    @needs_backtest_months
+    def test_run_backtest_accuracy_calculation(self, backtest_result):
         """Test run_backtest calculates accuracy correctly."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        months = sample_processor.get_all_months()
-        
-        if len(months) < 4:
-            pytest.skip("Need at least 4 months for backtest")
-        
-        result = backtest.run_backtest()
+        _, result = backtest_result
         
         if 'error' not in result:
             overall_accuracy = result['overall_accuracy']
@@ -103,29 +92,19 @@ class TestBacktestEngine:
                 expected_accuracy = sum(per_month_accuracies) / len(per_month_accuracies)
                 assert abs(overall_accuracy - expected_accuracy) < 0.01
     
-    def test_run_backtest_random_baseline(self, sample_recommender, sample_processor):
+    @needs_backtest_months
+    def test_run_backtest_random_baseline(self, backtest_result):
         """Test run_backtest calculates random baseline."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        months = sample_processor.get_all_months()
-        
-        if len(months) < 4:
-            pytest.skip("Need at least 4 months for backtest")
-        
-        result = backtest.run_backtest()
+        _, result = backtest_result
         
         if 'error' not in result:
             random_baseline = result['random_baseline']
             assert 0.0 <= random_baseline <= 1.0
     
-    def test_run_backtest_improvement_gap(self, sample_recommender, sample_processor):
+    @needs_backtest_months
+    def test_run_backtest_improvement_gap(self, backtest_result):
         """Test run_backtest calculates improvement gap."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        months = sample_processor.get_all_months()
-        
-        if len(months) < 4:
-            pytest.skip("Need at least 4 months for backtest")
-        
-        result = backtest.run_backtest()
+        _, result = backtest_result
         
         if 'error' not in result:
             improvement_gap = result['improvement_gap']
@@ -136,14 +115,9 @@ class TestBacktestEngine:
             expected_gap = overall_accuracy - random_baseline
             assert abs(improvement_gap - expected_gap) < 0.01
     
-    def test_run_backtest_with_config(self, sample_recommender, sample_processor):
+    @needs_backtest_months
+    def test_run_backtest_with_config(self, backtest):
         """Test run_backtest accepts configuration parameters."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        months = sample_processor.get_all_months()
-        
-        if len(months) < 4:
-            pytest.skip("Need at least 4 months for backtest")
-        
         config = {
             'top_n': 3,
             'k_similar': 10,
@@ -158,19 +132,13 @@ class TestBacktestEngine:
         if 'error' not in result:
             assert isinstance(result, dict)
     
-    def test_run_backtest_cancellation(self, sample_recommender, sample_processor):
+    @needs_backtest_months
+    def test_run_backtest_cancellation(self, backtest):
         """Test run_backtest handles cancellation."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        months = sample_processor.get_all_months()
-        
-        if len(months) < 4:
-            pytest.skip("Need at least 4 months for backtest")
-        
         # Create cancellation check that returns True after first iteration
-        call_count = [0]
+        calls = itertools.count()
         def cancellation_check():
-            call_count[0] += 1
-            return call_count[0] > 1
+            return next(calls) > 0
         
         result = backtest.run_backtest(cancellation_check=cancellation_check)
         
@@ -179,10 +147,8 @@ class TestBacktestEngine:
         assert result.get('cancelled', False) is True
         assert 'per_month_results' in result
     
-    def test_build_partial_results(self, sample_recommender, sample_processor):
+    def test_build_partial_results(self, backtest):
         """Test _build_partial_results builds correct structure."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        
         per_month_results = [
             {
                 'month': 202001,
@@ -204,29 +170,19 @@ class TestBacktestEngine:
             improvements_per_case, all_teams_tested, top_n
         )
         
-        assert isinstance(result, dict)
         assert result['cancelled'] is True
-        assert 'per_month_results' in result
-        assert 'total_predictions' in result
-        assert 'correct_predictions' in result
-        assert 'overall_accuracy' in result
-        assert 'random_baseline' in result
-        assert 'improvement_gap' in result
+        assert RESULT_KEYS <= result.keys()
     
-    def test_get_accuracy_summary_error(self, sample_recommender, sample_processor):
+    def test_get_accuracy_summary_error(self, backtest):
         """Test get_accuracy_summary handles error results."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        
         error_result = {'error': 'Insufficient data'}
         summary = backtest.get_accuracy_summary(error_result)
         
         assert isinstance(summary, str)
         assert 'Error' in summary or 'error' in summary.lower()
     
-    def test_get_accuracy_summary_success(self, sample_recommender, sample_processor):
+    def test_get_accuracy_summary_success(self, backtest):
         """Test get_accuracy_summary formats successful results."""
-        backtest = BacktestEngine(sample_recommender, sample_processor)
-        
         success_result = {
             'total_predictions': 100,
             'correct_predictions': 70,
@@ -246,3 +202,65 @@ class TestBacktestEngine:
         assert '70' in summary or 'Correct' in summary
         assert '70.0%' in summary or '70%' in summary or '0.7' in summary
 
+
+    def test_recommend_cached_reuses_results(self, sample_recommender, sample_processor):
+        """Test recommendations are memoized per (team, prev_month, sequence version, params)."""
+        backtest = BacktestEngine(sample_recommender, sample_processor)
+        months = sample_processor.get_all_months()
+        params = (2, 5, 0.6, 3, 3, 0.0)
+
+        with patch.object(sample_recommender, 'recommend', wraps=sample_recommender.recommend) as recommend:
+            first = backtest._recommend_cached('Team1', months[-1], params)
+            second = backtest._recommend_cached('Team1', months[-1], params)
+            assert first == second
+            assert recommend.call_count == 1
+
+            # Different parameters are a different cache entry
+            backtest._recommend_cached('Team1', months[-1], (3, 5, 0.6, 3, 3, 0.0))
+            assert recommend.call_count == 2
+
+            # Discarding the sequence cache invalidates memoized recommendations
+            sample_recommender.sequence_mapper.clear_cache()
+            backtest._recommend_cached('Team1', months[-1], params)
+            assert recommend.call_count == 3
+
+    def test_prefetch_recommendations_matches_serial(self, sample_recommender, sample_processor):
+        """Test parallel prefetching memoizes the same recommendations as serial calls."""
+        backtest = BacktestEngine(sample_recommender, sample_processor)
+        month = sample_processor.get_all_months()[-1]
+        params = (2, 5, 0.6, 3, 3, 0.0)
+        queries = [(team, month) for team in sample_processor.get_all_teams()]
+
+        backtest._prefetch_recommendations(queries, params, n_jobs=2)
+
+        version = sample_recommender.sequence_mapper.version
+        serial = BacktestEngine(sample_recommender, sample_processor)
+        for team, prev_month in queries:
+            cached = backtest._rec_cache.get((team, prev_month, version, params))
+            assert cached is not None
+            assert cached == serial._recommend_cached(team, prev_month, params)
+
+    def test_random_baseline_closed_form(self):
+        """Test the random baseline matches the combinatorial formula and accepts fractional k_avg."""
+        from math import comb
+
+        # Integer k_avg: exactly 1 - C(n-k, top_n) / C(n, top_n)
+        assert BacktestEngine._random_baseline(30, 4, 2) == pytest.approx(1 - comb(26, 2) / comb(30, 2))
+
+        # Fractional k_avg lies between its integer neighbours (no silent fallback)
+        fractional = BacktestEngine._random_baseline(30, 4.5, 2)
+        assert BacktestEngine._random_baseline(30, 4, 2) < fractional < BacktestEngine._random_baseline(30, 5, 2)
+
+        assert BacktestEngine._random_baseline(30, 0, 2) == 0.0
+        assert BacktestEngine._random_baseline(3, 3, 2) == 1.0
+
+    def test_pack_rows_bitmasks(self):
+        """Test boolean rows pack into int bitmasks with bit j for column j."""
+        import numpy as np
+        from src.validation.backtest import _pack_rows
+
+        mask = np.zeros((3, 70), dtype=bool)
+        mask[0, [0, 3]] = True
+        mask[2, [8, 69]] = True
+
+        assert _pack_rows(mask) == [0b1001, 0, (1 << 8) | (1 << 69)]
@@ -2,6 +2,7 @@
 Tests for MetricsCalculator class.
 """
 
+import numpy as np
 import pytest
 from src.validation.metrics import MetricsCalculator
 
@@ -54,6 +55,15 @@ class TestMetricsCalculator:
         
         assert hit_rate == 0.0
     
+    def test_calculate_hit_rate_counts_each_recommendation(self):
+        """Test calculate_hit_rate counts every list entry, so repeats are not collapsed like a set."""
+        recommendations = ['Practice1', 'Practice1', 'Practice2']
+        actual_improvements = {'Practice1'}
+
+        hit_rate = MetricsCalculator.calculate_hit_rate(recommendations, actual_improvements)
+
+        assert hit_rate == pytest.approx(2 / 3)
+    
     def test_calculate_mrr_first_position(self):
         """Test calculate_mrr when first recommendation is correct."""
         recommendations = ['Practice1', 'Practice2', 'Practice3']
@@ -263,3 +273,33 @@ class TestMetricsCalculator:
         # Should handle negative gracefully (will be negative, but capped at 1.0)
         assert confidence <= 1.0
 
+
+    def test_batch_metrics_match_scalar(self):
+        """Test batch hit rate and MRR match the per-list methods, including padded lists."""
+        practices = ['Practice1', 'Practice2', 'Practice3', 'Practice4']
+        cases = [
+            (['Practice1', 'Practice2'], {'Practice2'}),
+            (['Practice3', 'Practice4'], {'Practice1'}),
+            (['Practice4'], {'Practice4', 'Practice1'}),
+            ([], {'Practice1'}),
+        ]
+        recs_idx = np.full((len(cases), 2), -1)
+        improved_mask = np.zeros((len(cases), len(practices)), dtype=bool)
+        for case, (recs, improved) in enumerate(cases):
+            recs_idx[case, :len(recs)] = [practices.index(r) for r in recs]
+            improved_mask[case, [practices.index(p) for p in improved]] = True
+
+        hit_rates = MetricsCalculator.calculate_hit_rate_batch(recs_idx, improved_mask)
+        mrrs = MetricsCalculator.calculate_mrr_batch(recs_idx, improved_mask)
+
+        for case, (recs, improved) in enumerate(cases):
+            assert hit_rates[case] == pytest.approx(MetricsCalculator.calculate_hit_rate(recs, improved))
+            assert mrrs[case] == pytest.approx(MetricsCalculator.calculate_mrr(recs, improved))
+
+    def test_calculate_diversity_matches_numpy(self):
+        """Test calculate_diversity agrees with NumPy mean/std for short and long lists."""
+        for scores in ([0.9, 0.3], [0.5, 0.4, 0.1], [0.1 * i for i in range(1, 13)], [0.01 * i for i in range(1, 101)]):
+            recommendations = [(f'Practice{i}', score, 0.0) for i, score in enumerate(scores)]
+            expected = min(np.std(scores) / np.mean(scores), 1.0)
+
+            assert MetricsCalculator.calculate_diversity(recommendations) == pytest.approx(expected)
@@ -5,15 +5,48 @@ Tests for OptimizationEngine class.
 import pytest
 import json
 import os
+import joblib
+import threading
+import numpy as np
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
+from src.validation import optimizer as optimizer_module
 from src.validation.optimizer import OptimizationEngine
 from src.validation.backtest import BacktestEngine
 
 
+class _ConfigScoredBacktest:
+    """Picklable backtest stand-in whose accuracy depends on the config (for worker processes)."""
+
+    def run_backtest(self, config=None, cancellation_check=None):
+        if config["k_similar"] == 15:
+            raise ValueError("Test error")
+        accuracy = 0.4 + config["top_n"] / 100 + config["k_similar"] / 1000
+        return {
+            'overall_accuracy': accuracy,
+            'random_baseline': 0.3,
+            'improvement_gap': accuracy - 0.3,
+            'improvement_factor': accuracy / 0.3,
+            'total_predictions': 100,
+            'correct_predictions': int(accuracy * 100),
+            'cancelled': False,
+        }
+
+
+@pytest.fixture(autouse=True)
+def isolated_output_dirs(tmp_path, monkeypatch):
+    """Keep results files and the backtest cache out of the working tree."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(optimizer_module, "RESULTS_DIR", tmp_path / "results")
+    monkeypatch.setattr(optimizer_module, "BACKTEST_CACHE_DIR", tmp_path / ".cache" / "backtest")
+    yield
+    # find_optimal_config() saves in the background; finish before tmp_path is left
+    optimizer_module._SAVE_EXECUTOR.submit(lambda: None).result()
+
+
 class TestOptimizationEngine:
     """Test OptimizationEngine functionality."""
-    
+
     @pytest.fixture
     def mock_backtest_engine(self):
         """Create a mock BacktestEngine."""
@@ -82,6 +115,44 @@ class TestOptimizationEngine:
             assert combo['top_n'] == 5
             assert combo['k_similar'] == 20
     
+    def test_generate_parameter_combinations_preferred_first(self, optimizer):
+        """Test combinations are ordered by distance from PREFERRED_CONFIG."""
+        from src.validation.optimizer import PREFERRED_CONFIG
+
+        combinations = list(optimizer.generate_parameter_combinations())
+
+        assert combinations[0] == PREFERRED_CONFIG
+        assert combinations[-1]['k_similar'] == 5
+        assert len({tuple(sorted(c.items())) for c in combinations}) == 4 * 3 * 5 * 3
+
+    def test_count_parameter_combinations(self, optimizer):
+        """Test the combination count matches the generated configs, which are all distinct."""
+        for fixed_params in (None, {'top_n': 5}, {'top_n': 5, 'k_similar': 20, 'extra': 1}):
+            ranges = optimizer._parameter_ranges(top_n_range=[2, 3, 3], k_similar_range=[5, 10])
+            generated = list(optimizer.generate_parameter_combinations(*ranges.values(), fixed_params))
+            # Fixed parameters and repeated range values never produce duplicate configs
+            assert len({tuple(sorted(c.items())) for c in generated}) == len(generated)
+            assert optimizer.count_parameter_combinations(ranges, fixed_params) == len(generated)
+
+    def test_sample_parameter_combinations(self, optimizer):
+        """Test random sampling draws distinct grid configs, reproducibly, capped at the grid size."""
+        ranges = optimizer._parameter_ranges(top_n_range=[2, 3, 3], k_similar_range=[5, 10])
+        grid = [
+            tuple(sorted(c.items()))
+            for c in optimizer._unique_configs(optimizer.generate_parameter_combinations(*ranges.values()))
+        ]
+
+        sample = [tuple(sorted(c.items())) for c in optimizer.sample_parameter_combinations(ranges, 5, seed=1)]
+        assert len(sample) == len(set(sample)) == 5
+        assert set(sample) <= set(grid)
+        assert sample == [
+            tuple(sorted(c.items())) for c in optimizer.sample_parameter_combinations(ranges, 5, seed=1)
+        ]
+
+        everything = list(optimizer.sample_parameter_combinations(ranges, 1000, {'top_n': 4}, seed=1))
+        assert len(everything) == optimizer.count_parameter_combinations(ranges, {'top_n': 4})
+        assert all(c['top_n'] == 4 for c in everything)
+
     def test_cancel(self, optimizer):
         """Test cancel sets cancellation flag."""
         assert optimizer._cancelled is False
@@ -147,6 +218,21 @@ class TestOptimizationEngine:
         finally:
             os.chdir(original_dir)
     
+    def test_save_results_background(self, optimizer, tmp_path, monkeypatch):
+        """Test save_results can write in the background and leaves no temporary files."""
+        from src.validation.optimizer import _SAVE_EXECUTOR
+
+        monkeypatch.chdir(tmp_path)
+        results = {'optimal_config': {'top_n': 3}, 'model_accuracy': 0.75}
+
+        filepath = optimizer.save_results(results, wait_for_save=False)
+        _SAVE_EXECUTOR.submit(lambda: None).result()  # Wait for queued saves
+
+        with open(filepath) as f:
+            loaded = json.load(f)
+        assert loaded['model_accuracy'] == 0.75
+        assert os.listdir('results') == [Path(filepath).name]
+
     def test_load_latest_results_no_files(self, tmp_path):
         """Test load_latest_results returns None when no files exist."""
         original_dir = os.getcwd()
@@ -300,7 +386,31 @@ class TestOptimizationEngine:
 
         assert result['cancelled'] is True
         assert result['total_combinations_tested'] < result.get('total_combinations_available', 999)
+        # The combination that detected the cancellation counts as reached
+        assert result['total_combinations_tested'] == 2
     
+    def test_find_optimal_config_cancel_from_another_thread(self, optimizer, tmp_path, monkeypatch):
+        """Test a cancel() from another thread is seen by the running backtest's cancellation check."""
+        monkeypatch.chdir(tmp_path)
+        checks = []
+
+        def run_backtest(config=None, cancellation_check=None):
+            checks.append(cancellation_check())
+            canceller = threading.Thread(target=optimizer.cancel)
+            canceller.start()
+            canceller.join()
+            checks.append(cancellation_check())
+            return {'cancelled': cancellation_check()}
+
+        optimizer.backtest_engine.run_backtest = Mock(side_effect=run_backtest)
+
+        result = optimizer.find_optimal_config(use_cache=False)
+
+        assert checks == [False, True]
+        assert result['cancelled'] is True
+        assert result['total_combinations_tested'] == 1
+        assert optimizer._cancelled is True
+
     def test_find_optimal_config_early_stop(self, optimizer):
         """Test find_optimal_config stops early when excellent solution found."""
         mock_result_excellent = {
@@ -328,6 +438,9 @@ class TestOptimizationEngine:
         # Should stop early if excellent solution found
         # (May or may not stop depending on when solution is found)
         assert result['early_stopped'] is True or result['total_combinations_tested'] <= result.get('total_combinations_available', 999)
+        # The first combination is already excellent (gap > 0.30), so it is the only one tested
+        assert result['early_stopped'] is True
+        assert result['total_combinations_tested'] == 1
     
     def test_find_optimal_config_progress_callback(self, optimizer):
         """Test find_optimal_config calls progress callback."""
@@ -365,6 +478,23 @@ class TestOptimizationEngine:
             assert isinstance(total, int)
             assert isinstance(config, dict)
     
+    def test_find_optimal_config_progress_is_throttled(self, optimizer, tmp_path, monkeypatch):
+        """Test fast backtests only report progress for the first and last combination."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr('src.validation.optimizer.PROGRESS_INTERVAL_SECONDS', 3600)
+        optimizer.backtest_engine.run_backtest = Mock(return_value={'error': 'Insufficient data'})
+
+        callback_calls = []
+        optimizer.find_optimal_config(
+            top_n_range=[2, 3, 4],
+            similarity_weight_range=[0.6],
+            k_similar_range=[5, 10],
+            min_similarity_threshold_range=[0.0],
+            progress_callback=lambda current, total, config: callback_calls.append((current, total)),
+        )
+
+        assert callback_calls == [(1, 6), (6, 6)]
+
     def test_find_optimal_config_error_handling(self, optimizer):
         """Test find_optimal_config handles errors gracefully."""
         # Mock backtest to raise exception
@@ -382,3 +512,163 @@ class TestOptimizationEngine:
         assert isinstance(result, dict)
         assert result['valid_combinations'] == 0
 
+    def test_run_shared_backtest_config_loads_engine_once(self, tmp_path, monkeypatch):
+        """Test worker tasks load the dumped engine once and reuse it for later configs."""
+        engine_path = str(tmp_path / 'engine.joblib')
+        joblib.dump(_ConfigScoredBacktest(), engine_path)
+        monkeypatch.setattr(optimizer_module, '_WORKER_ENGINES', {})
+        config = {'top_n': 2, 'k_similar': 5}
+
+        first = optimizer_module._run_shared_backtest_config(engine_path, config)
+        loaded = optimizer_module._WORKER_ENGINES[engine_path]
+        second = optimizer_module._run_shared_backtest_config(engine_path, config)
+
+        assert first == second == _ConfigScoredBacktest().run_backtest(config=config)
+        assert optimizer_module._WORKER_ENGINES == {engine_path: loaded}
+
+        # Load and backtest failures are returned, not raised
+        assert isinstance(optimizer_module._run_shared_backtest_config(str(tmp_path / 'missing'), config), Exception)
+        assert isinstance(optimizer_module._run_shared_backtest_config(engine_path, {'top_n': 2, 'k_similar': 15}), ValueError)
+
+    def test_find_optimal_config_parallel_matches_serial(self, tmp_path, monkeypatch):
+        """Test find_optimal_config with worker processes returns the serial result."""
+        monkeypatch.chdir(tmp_path)
+        optimizer = OptimizationEngine(_ConfigScoredBacktest())
+        ranges = dict(
+            min_accuracy=0.4,
+            top_n_range=[2, 3],
+            similarity_weight_range=[0.6],
+            k_similar_range=[5, 15, 19],
+            min_similarity_threshold_range=[0.0, 0.5],
+        )
+
+        serial = optimizer.find_optimal_config(**ranges)
+        parallel = optimizer.find_optimal_config(**ranges, n_jobs=2)
+        # An explicit joblib backend takes the parallel path even with one job
+        threaded = optimizer.find_optimal_config(**ranges, backend='threading')
+
+        for result in (parallel, threaded):
+            assert result['optimal_config'] == serial['optimal_config']
+            assert result['all_results'] == serial['all_results']
+            assert result['total_combinations_tested'] == serial['total_combinations_tested']
+        # Failing configs (k_similar=15) are skipped in both modes
+        assert serial['valid_combinations'] == 8
+
+    def test_find_optimal_config_skips_duplicate_configs(self, optimizer, tmp_path, monkeypatch):
+        """Test configs collapsed by fixed_params are backtested only once."""
+        monkeypatch.chdir(tmp_path)
+        optimizer.backtest_engine.run_backtest = Mock(return_value={'error': 'Insufficient data'})
+
+        result = optimizer.find_optimal_config(
+            top_n_range=[2, 3, 4],
+            similarity_weight_range=[0.6],
+            k_similar_range=[5, 10],
+            min_similarity_threshold_range=[0.0],
+            fixed_params={'top_n': 2},
+        )
+
+        configs = [c.kwargs['config'] for c in optimizer.backtest_engine.run_backtest.call_args_list]
+        assert len(configs) == 2
+        assert {c['k_similar'] for c in configs} == {5, 10}
+        assert result['total_combinations_available'] == 2
+
+    def test_find_optimal_config_multi_resolution(self, optimizer, tmp_path, monkeypatch):
+        """Test the coarse-then-fine search finds an off-coarse-grid optimum with fewer backtests."""
+        monkeypatch.chdir(tmp_path)
+
+        def run_backtest(config=None, cancellation_check=None):
+            # Peaks at top_n=3, k_similar=19, neither of which is in the coarse grid
+            accuracy = 0.5 - abs(config['top_n'] - 3) / 100 - abs(config['k_similar'] - 19) / 1000
+            return {
+                'overall_accuracy': accuracy,
+                'random_baseline': 0.4,
+                'improvement_gap': accuracy - 0.4,
+                'improvement_factor': accuracy / 0.4,
+                'total_predictions': 100,
+                'correct_predictions': int(accuracy * 100),
+                'cancelled': False,
+            }
+
+        optimizer.backtest_engine.run_backtest = Mock(side_effect=run_backtest)
+
+        result = optimizer.find_optimal_config(
+            top_n_range=[2, 3, 4, 5],
+            similarity_weight_range=[0.6],
+            k_similar_range=[5, 10, 15, 19, 20],
+            min_similarity_threshold_range=[0.0],
+            use_cache=False,
+            multi_resolution=True,
+        )
+
+        configs = [c.kwargs['config'] for c in optimizer.backtest_engine.run_backtest.call_args_list]
+        assert result['optimal_config']['top_n'] == 3
+        assert result['optimal_config']['k_similar'] == 19
+        assert result['total_combinations_available'] == 20
+        assert result['total_combinations_tested'] == len(configs) < 20
+        # No configuration is backtested twice across the two stages
+        assert len({tuple(sorted(c.items())) for c in configs}) == len(configs)
+
+    def test_find_optimal_config_random_search(self, optimizer, tmp_path, monkeypatch):
+        """Test random search backtests n_trials distinct configs and rejects unknown strategies."""
+        monkeypatch.chdir(tmp_path)
+        optimizer.backtest_engine.run_backtest = Mock(return_value={'error': 'Insufficient data'})
+
+        result = optimizer.find_optimal_config(use_cache=False, search='random', n_trials=7, seed=0)
+
+        configs = [c.kwargs['config'] for c in optimizer.backtest_engine.run_backtest.call_args_list]
+        assert len({tuple(sorted(c.items())) for c in configs}) == 7
+        assert result['total_combinations_tested'] == 7
+        assert result['total_combinations_available'] == 180
+
+        with pytest.raises(ValueError, match="Unknown search strategy"):
+            optimizer.find_optimal_config(search='tpe')
+        with pytest.raises(ValueError, match="multi_resolution"):
+            optimizer.find_optimal_config(search='random', multi_resolution=True)
+
+    def test_find_optimal_config_result_cache(self, sample_processor, tmp_path, monkeypatch):
+        """Test completed backtests are cached on disk and reused by later runs on the same data."""
+        monkeypatch.chdir(tmp_path)
+        engine = Mock(spec=BacktestEngine)
+        engine.processor = sample_processor
+        engine.run_backtest = Mock(return_value={
+            'overall_accuracy': 0.5,
+            'random_baseline': 0.3,
+            'improvement_gap': 0.2,
+            'improvement_factor': 1.67,
+            'total_predictions': 10,
+            'correct_predictions': 5,
+            'cancelled': False,
+        })
+        optimizer = OptimizationEngine(engine)
+        ranges = dict(top_n_range=[2], similarity_weight_range=[0.6], min_similarity_threshold_range=[0.0])
+
+        first = optimizer.find_optimal_config(k_similar_range=[5, 10], **ranges)
+        assert engine.run_backtest.call_count == 2
+
+        # Overlapping grid: only the new k_similar value is backtested
+        second = optimizer.find_optimal_config(k_similar_range=[5, 10, 15], **ranges)
+        assert engine.run_backtest.call_count == 3
+        assert second['valid_combinations'] == 3
+        assert second['model_accuracy'] == first['model_accuracy']
+
+        # Opting out runs everything again
+        optimizer.find_optimal_config(k_similar_range=[5, 10, 15], use_cache=False, **ranges)
+        assert engine.run_backtest.call_count == 6
+
+        # numpy-typed ranges (e.g. from np.array) hit the same entries, serially and in parallel
+        np_ranges = dict(
+            top_n_range=np.array([2]),
+            similarity_weight_range=np.array([0.6]),
+            min_similarity_threshold_range=np.array([0.0]),
+        )
+        serial = optimizer.find_optimal_config(k_similar_range=np.array([5, 10, 15]), **np_ranges)
+        assert engine.run_backtest.call_count == 6
+        assert serial['valid_combinations'] == 3
+        parallel = optimizer.find_optimal_config(
+            k_similar_range=np.array([5, 10, 15, 20]), n_jobs=2, backend='threading', **np_ranges
+        )
+        assert engine.run_backtest.call_count == 7
+        assert parallel['valid_combinations'] == 4
+        # Entries are renamed into place, so no temporary files are left behind
+        assert sorted(path.suffix for path in optimizer_module.BACKTEST_CACHE_DIR.iterdir()) == ['.json'] * 4
+
@@ -8,6 +8,18 @@ from src.ml.recommender import RecommendationEngine
 
 class TestRecommendationEngineExtended:
     """Extended tests for RecommendationEngine functionality."""
+
+    # These tests only call recommend()/recommend_batch(), which relearn sequences up to
+    # the requested month themselves, so the session-wide sample engine is safe to share
+    @pytest.fixture
+    def sample_processor(self, shared_sample_processor):
+        """Session-wide processed sample data."""
+        return shared_sample_processor
+
+    @pytest.fixture
+    def sample_recommender(self, shared_sample_recommender):
+        """Session-wide RecommendationEngine on the sample data."""
+        return shared_sample_recommender
     
     def test_recommend_basic(self, sample_recommender, sample_processor):
         """Test recommend returns recommendations."""
@@ -353,3 +365,33 @@ class TestRecommendationEngineExtended:
                 # ValueError is acceptable if threshold too high
                 pass
 
+
+    def test_recommend_batch_matches_recommend(self, sample_recommender, sample_processor):
+        """Test recommend_batch returns what recommend returns (or raises) per query."""
+        recommender = sample_recommender
+        months = sample_processor.get_all_months()
+        queries = [(team, month) for team in sample_processor.get_all_teams() for month in months]
+        queries.append(("Unknown Team", months[-1]))
+
+        results = recommender.recommend_batch(queries, top_n=2, k_similar=5, min_similarity_threshold=0.0)
+
+        assert len(results) == len(queries)
+        for (team, month), result in zip(queries, results):
+            try:
+                expected = recommender.recommend(team, month, top_n=2, k_similar=5, min_similarity_threshold=0.0)
+            except ValueError:
+                assert isinstance(result, ValueError)
+            else:
+                assert result == expected
+
+    def test_is_valid_baseline_month(self, sample_recommender, sample_processor):
+        """Test only months with an earlier month are valid baselines, and month 1 always fails."""
+        recommender = sample_recommender
+        months = sample_processor.get_all_months()
+
+        assert not recommender.is_valid_baseline_month(months[0])
+        assert all(recommender.is_valid_baseline_month(month) for month in months[1:])
+
+        team = next(t for t in sample_processor.get_all_teams() if months[0] in sample_processor.get_team_history(t))
+        with pytest.raises(ValueError):
+            recommender.recommend(team, months[0], allow_first_three_months=True, min_similarity_threshold=0.0)
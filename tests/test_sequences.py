@@ -2,7 +2,10 @@
 Extended tests for SequenceMapper class.
 """
 
+import numpy as np
+import pandas as pd
 import pytest
+from src.data import DataProcessor
 from src.ml.sequences import SequenceMapper
 
 
@@ -230,7 +233,55 @@ class TestSequenceMapperExtended:
         # Results should be the same (from cache)
         assert first_transitions == second_transitions
         assert first_freq == second_freq
-    
+
+    def test_learn_sequences_up_to_month_cache_is_frozen(self, sample_processor, sample_practices):
+        """Test cached sequence snapshots are shared read-only, not copied."""
+        mapper = SequenceMapper(sample_processor, sample_practices)
+        months = sample_processor.get_all_months()
+
+        if len(months) < 3:
+            pytest.skip("Need at least 3 months")
+
+        mapper.learn_sequences_up_to_month(months[-1])
+        cached_trans, cached_freq = mapper._sequence_cache[months[-1]]
+
+        # Learning a different cutoff and coming back must reuse the same snapshot
+        mapper.learn_sequences_up_to_month(months[-2])
+        mapper.learn_sequences_up_to_month(months[-1])
+
+        assert mapper._trans is cached_trans
+        assert mapper._freq is cached_freq
+        assert not cached_trans.flags.writeable
+        assert not cached_freq.flags.writeable
+
+        # A full relearn must not write into the cached snapshot
+        snapshot = cached_trans.copy()
+        mapper.learn_sequences()
+        assert (cached_trans == snapshot).all()
+
+    def test_learn_sequences_up_to_month_repeat_is_noop(self, sample_processor, sample_practices):
+        """Test re-learning the loaded cutoff is skipped, but not after a full relearn."""
+        mapper = SequenceMapper(sample_processor, sample_practices)
+        months = sample_processor.get_all_months()
+
+        if len(months) < 2:
+            pytest.skip("Need at least 2 months")
+
+        mapper.learn_sequences_up_to_month(months[-1])
+        cached_trans, _ = mapper._sequence_cache[months[-1]]
+
+        # Emptying the cache shows the repeat call does no lookup or relearning at all
+        mapper._sequence_cache = {}
+        mapper.learn_sequences_up_to_month(months[-1])
+        assert mapper._trans is cached_trans
+        assert months[-1] not in mapper._sequence_cache
+
+        # A full relearn replaces the counts, so the same cutoff must be learned again
+        mapper.learn_sequences()
+        mapper.learn_sequences_up_to_month(months[-1])
+        assert mapper._trans is not cached_trans
+        assert (mapper._trans == cached_trans).all()
+
     def test_learn_sequences_up_to_month_insufficient_data(self, sample_processor, sample_practices):
         """Test learn_sequences_up_to_month handles insufficient data gracefully."""
         mapper = SequenceMapper(sample_processor, sample_practices)
@@ -270,6 +321,43 @@ class TestSequenceMapperExtended:
         assert mapper.learned
         assert len(mapper.transition_matrix) >= 0 or len(mapper.practice_improvement_freq) >= 0
     
+    def test_learn_sequences_matches_per_team_loop(self):
+        """Test the vectorized counting matches a plain per-team loop, including month gaps."""
+        rng = np.random.default_rng(0)
+        practices = [f'Practice{i}' for i in range(6)]
+        months = [20200107, 20200304, 20200402, 20200503, 20200608, 20200705]
+        rows = [
+            {'Team Name': f'Team{team}', 'Month': month, **dict(zip(practices, rng.integers(0, 4, len(practices))))}
+            for team in range(8)
+            for month in months
+            if rng.random() > 0.2
+        ]
+        processor = DataProcessor(pd.DataFrame(rows), practices)
+        processor.process()
+
+        mapper = SequenceMapper(processor, practices)
+        mapper.learn_sequences()
+
+        expected_trans = np.zeros((len(practices), len(practices)), dtype=np.int64)
+        expected_freq = np.zeros(len(practices), dtype=np.int64)
+        for team in processor.get_all_teams():
+            history = processor.get_team_history(team)
+            team_months = sorted(history)
+            steps = []
+            for prev_month, month in zip(team_months, team_months[1:]):
+                improved = np.flatnonzero(history[month] > history[prev_month])
+                if len(improved):
+                    steps.append(improved)
+            for step in steps:
+                expected_freq[step] += 1
+            for prev_step, next_step in zip(steps, steps[1:]):
+                for i in prev_step:
+                    expected_trans[i, next_step] += 1
+
+        assert expected_trans.sum() > 0
+        np.testing.assert_array_equal(mapper._trans, expected_trans)
+        np.testing.assert_array_equal(mapper._freq, expected_freq)
+
     def test_learned_flag(self, sample_processor, sample_practices):
         """Test learned flag is set correctly."""
         mapper = SequenceMapper(sample_processor, sample_practices)
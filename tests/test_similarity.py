@@ -294,3 +294,69 @@ class TestSimilarityEngineExtended:
         assert np.all(matrix >= -1e-9)
         assert np.all(matrix <= 1.0 + 1e-9)
 
+
+    def test_find_similar_teams_batch_matches_brute_force(self, sample_similarity_engine, sample_processor):
+        """Test find_similar_teams_batch against a brute-force cosine scan of the team histories."""
+        engine = sample_similarity_engine
+        teams = sample_processor.get_all_teams()
+        histories = {team: sample_processor.get_team_history(team) for team in teams}
+
+        def cosine(a, b):
+            norms = np.linalg.norm(a) * np.linalg.norm(b)
+            return float(np.dot(a, b) / norms) if norms else 0.0
+
+        def reference(target_team, target_month, k, min_similarity):
+            target = histories[target_team][target_month]
+            best = []
+            for team_idx, team in enumerate(teams):
+                if team == target_team:
+                    continue
+                # Best earlier month per team; strict > keeps the earliest month on ties
+                team_best = None
+                for month in sorted(m for m in histories[team] if m < target_month):
+                    score = cosine(target, histories[team][month])
+                    if score >= min_similarity and (team_best is None or score > team_best[1] + 1e-12):
+                        team_best = (month, score)
+                if team_best is not None:
+                    best.append((team, team_best[1], team_best[0], team_idx))
+            best.sort(key=lambda entry: (-round(entry[1], 9), entry[2], entry[3]))
+            return [(team, score, month) for team, score, month, _ in best[:k]]
+
+        queries = [
+            (team, month)
+            for team in teams
+            for month in sorted(histories[team])
+            if month > sample_processor.get_all_months()[0]
+        ]
+        assert queries
+
+        for k, min_similarity in ((1, 0.0), (2, 0.0), (2, 0.99)):
+            results = engine.find_similar_teams_batch(queries, k=k, min_similarity=min_similarity)
+            assert len(results) == len(queries)
+            for (team, month), result in zip(queries, results):
+                expected = reference(team, month, k, min_similarity)
+                assert [(t, m) for t, _, m in result] == [(t, m) for t, _, m in expected]
+                assert [s for _, s, _ in result] == pytest.approx([s for _, s, _ in expected])
+
+    def test_find_similar_teams_batch_no_past_months(self, sample_similarity_engine, sample_processor):
+        """Test find_similar_teams_batch returns an empty list instead of raising."""
+        engine = sample_similarity_engine
+        teams = sample_processor.get_all_teams()
+        first_month = sample_processor.get_all_months()[0]
+
+        assert engine.find_similar_teams_batch([(teams[0], first_month)]) == [[]]
+
+        with pytest.raises(ValueError):
+            engine.find_similar_teams_batch([(teams[0], 99999999)])
+
+    def test_warm_up_builds_index_once(self, sample_similarity_engine, sample_processor):
+        """Test warm_up builds the index that later queries reuse."""
+        engine = sample_similarity_engine
+        engine.warm_up()
+        index = engine._get_index()
+
+        team = sample_processor.get_all_teams()[0]
+        month = sorted(sample_processor.get_team_history(team))[-1]
+        engine.find_similar_teams(team, month, k=2)
+
+        assert engine._index is index
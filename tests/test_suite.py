@@ -14,13 +14,33 @@ import numpy as np
 from src.data import DataLoader, DataProcessor, DataValidator
 from src.ml import SimilarityEngine, SequenceMapper, RecommendationEngine
 
+EXCEL_PATH = 'data/raw/20250204_Cleaned_Dataset.xlsx'
+
+
+@pytest.fixture(scope="module")
+def cleaned_dataset():
+    """Load the cleaned dataset once for the module (None, None if it is not available)."""
+    if not os.path.exists(EXCEL_PATH):
+        return None, None
+    loader = DataLoader(EXCEL_PATH)
+    return loader.load(), loader.practices
+
+
+@pytest.fixture
+def dataset(cleaned_dataset):
+    """Per-test copy of the cleaned dataset (DataProcessor.process() writes to its frame)."""
+    df, practices = cleaned_dataset
+    if df is None:
+        return None, None
+    return df.copy(), list(practices)
+
 
 class TestDataLoading:
     """Test data loading functionality."""
     
     def test_data_loader_initialization(self):
         """Test DataLoader can be initialized."""
-        excel_path = 'data/raw/20250204_Cleaned_Dataset.xlsx'
+        excel_path = EXCEL_PATH
         if os.path.exists(excel_path):
             loader = DataLoader(excel_path)
             assert loader.file_path == excel_path
@@ -28,7 +48,7 @@ class TestDataLoading:
     
     def test_data_loader_loads_file(self):
         """Test DataLoader can load Excel file."""
-        excel_path = 'data/raw/20250204_Cleaned_Dataset.xlsx'
+        excel_path = EXCEL_PATH
         if os.path.exists(excel_path):
             loader = DataLoader(excel_path)
             df = loader.load()
@@ -37,20 +57,56 @@ class TestDataLoading:
             assert loader.teams is not None
             assert len(loader.teams) > 0
 
+    def test_data_loader_matches_read_excel(self, tmp_path):
+        """Test the streamed .xlsx reader gives the same frame as pd.read_excel, or falls back."""
+        plain = pd.DataFrame({
+            'Team Name': ['Team A', 'Team B', 'Team C'],
+            'Month': [20200107, 20200107, 20200304],
+            'Practice 1': [0.0, 2.0, 3.0],
+            'Practice 2': [1.0, np.nan, 2.5],
+        })
+        # Numbers and 'NA' stored as text are interpreted by pandas (fallback path)
+        tricky = plain.assign(**{'Practice 1': ['0', 'NA', '3']})
+
+        for name, frame in (('plain.xlsx', plain), ('tricky.xlsx', tricky)):
+            path = str(tmp_path / name)
+            frame.to_excel(path, index=False)
+            pd.testing.assert_frame_equal(DataLoader(path).load(), pd.read_excel(path, sheet_name=0))
+
+    def test_data_loader_cache(self, tmp_path, monkeypatch):
+        """Test load(use_cache=True) reuses the cached frame until the file changes."""
+        from src.data import loader as loader_module
+        monkeypatch.setattr(loader_module, 'FRAME_CACHE_DIR', tmp_path / 'cache')
+
+        path = str(tmp_path / 'data.xlsx')
+        frame = pd.DataFrame({'Team Name': ['Team A', 'Team B'], 'Month': [20200107, 20200107], 'Practice 1': [1, 2]})
+        frame.to_excel(path, index=False)
+
+        first = DataLoader(path).load(use_cache=True)
+        assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+        # A cache hit does not read the workbook at all
+        read_plain_table = loader_module._read_plain_table
+        monkeypatch.setattr(loader_module, '_read_plain_table', lambda file_path: 1 / 0)
+        cached = DataLoader(path)
+        pd.testing.assert_frame_equal(cached.load(use_cache=True), first)
+        assert cached.practices == ['Practice 1']
+
+        # Rewriting the file invalidates its entry
+        monkeypatch.setattr(loader_module, '_read_plain_table', read_plain_table)
+        frame.assign(**{'Practice 1': [3, 0]}).to_excel(path, index=False)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert DataLoader(path).load(use_cache=True)['Practice 1'].tolist() == [3, 0]
+
 
 class TestDataProcessing:
     """Test data processing functionality."""
     
     @pytest.fixture
-    def sample_data(self):
+    def sample_data(self, dataset):
         """Create sample data for testing."""
-        excel_path = 'data/raw/20250204_Cleaned_Dataset.xlsx'
-        if os.path.exists(excel_path):
-            loader = DataLoader(excel_path)
-            df = loader.load()
-            practices = loader.practices
-            return df, practices
-        return None, None
+        return dataset
     
     def test_processor_normalizes_data(self, sample_data):
         """Test that processor normalizes values."""
@@ -84,18 +140,100 @@ class TestDataProcessing:
             assert isinstance(history, dict)
             assert len(history) > 0
 
+    def test_processor_sorted_team_months(self, sample_data):
+        """Test that sorted team months match the team history keys."""
+        df, practices = sample_data
+        if df is None:
+            pytest.skip("Sample data not available")
+
+        processor = DataProcessor(df, practices)
+        processor.process()
+
+        for team in processor.get_all_teams():
+            sorted_months = processor.get_sorted_team_months(team)
+            assert sorted_months.tolist() == sorted(processor.get_team_history(team))
+
+        with pytest.raises(ValueError):
+            processor.get_sorted_team_months("Unknown Team")
+
+    def test_processor_team_row_idx(self, sample_data):
+        """Test that team row indices select exactly each team's rows of the frame."""
+        df, practices = sample_data
+        if df is None:
+            pytest.skip("Sample data not available")
+
+        processor = DataProcessor(df, practices)
+        processor.process()
+
+        assert list(processor.team_row_idx) == processor.get_all_teams()
+        for team, rows in processor.team_row_idx.items():
+            assert rows.tolist() == np.flatnonzero(df['Team Name'].to_numpy() == team).tolist()
+
+    def test_processor_team_month_mask(self, sample_data):
+        """Test that the team/month presence mask matches the team histories."""
+        df, practices = sample_data
+        if df is None:
+            pytest.skip("Sample data not available")
+
+        processor = DataProcessor(df, practices)
+        processor.process()
+
+        assert processor.months_array.tolist() == processor.get_all_months()
+        assert processor.team_month_mask.shape == (len(processor.get_all_teams()), len(processor.months_array))
+
+        for team_idx, team in enumerate(processor.get_all_teams()):
+            history = processor.get_team_history(team)
+            expected = [month in history for month in processor.months_array.tolist()]
+            assert processor.team_month_mask[team_idx].tolist() == expected
+
+    def test_processor_team_matrix(self, sample_data):
+        """Test that team matrices hold the history vectors in sorted month order."""
+        df, practices = sample_data
+        if df is None:
+            pytest.skip("Sample data not available")
+
+        processor = DataProcessor(df, practices)
+        processor.process()
+
+        for team in processor.get_all_teams():
+            months, matrix = processor.get_team_matrix(team)
+            history = processor.get_team_history(team)
+            assert matrix.shape == (len(history), len(practices))
+            for row, month in zip(matrix, months.tolist()):
+                np.testing.assert_array_equal(row, history[month])
+                # History vectors are views into the matrix, not copies
+                assert np.shares_memory(history[month], matrix)
+
+    def test_processor_history_tensor(self, sample_data):
+        """Test the dense history tensor the ML engines read matches the team histories."""
+        df, practices = sample_data
+        if df is None:
+            pytest.skip("Sample data not available")
+
+        processor = DataProcessor(df, practices)
+        processor.process()
+
+        tensor = processor.history_tensor
+        assert tensor.dtype == np.float64
+        assert tensor.flags.c_contiguous
+        assert tensor.shape == (len(processor.get_all_teams()), len(processor.months_array), len(practices))
+
+        # Missing team/months are zero rows; present ones hold the history vector
+        assert not tensor[~processor.team_month_mask].any()
+        for team_idx, team in enumerate(processor.get_all_teams()):
+            for month, vector in processor.get_team_history(team).items():
+                month_idx = processor.months_array.tolist().index(month)
+                np.testing.assert_array_equal(tensor[team_idx, month_idx], vector)
+
 
 class TestSimilarityEngine:
     """Test similarity calculation."""
     
     @pytest.fixture
-    def engine_with_data(self):
+    def engine_with_data(self, dataset):
         """Create similarity engine with data."""
-        excel_path = 'data/raw/20250204_Cleaned_Dataset.xlsx'
-        if os.path.exists(excel_path):
-            loader = DataLoader(excel_path)
-            df = loader.load()
-            practices = loader.practices
+        df, practices = dataset
+        if df is not None:
             processor = DataProcessor(df, practices)
             processor.process()
             engine = SimilarityEngine(processor)
@@ -127,13 +265,10 @@ class TestSequenceMapper:
     """Test sequence mapping."""
     
     @pytest.fixture
-    def mapper_with_data(self):
+    def mapper_with_data(self, dataset):
         """Create sequence mapper with data."""
-        excel_path = 'data/raw/20250204_Cleaned_Dataset.xlsx'
-        if os.path.exists(excel_path):
-            loader = DataLoader(excel_path)
-            df = loader.load()
-            practices = loader.practices
+        df, practices = dataset
+        if df is not None:
             processor = DataProcessor(df, practices)
             processor.process()
             mapper = SequenceMapper(processor, practices)
@@ -155,13 +290,10 @@ class TestRecommendations:
     """Test recommendation engine."""
     
     @pytest.fixture
-    def recommender_with_data(self):
+    def recommender_with_data(self, dataset):
         """Create complete recommendation engine."""
-        excel_path = 'data/raw/20250204_Cleaned_Dataset.xlsx'
-        if os.path.exists(excel_path):
-            loader = DataLoader(excel_path)
-            df = loader.load()
-            practices = loader.practices
+        df, practices = dataset
+        if df is not None:
             processor = DataProcessor(df, practices)
             processor.process()
             
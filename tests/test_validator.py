@@ -134,6 +134,26 @@ class TestDataValidator:
                 assert 'total' in month_info
                 assert 'percentage' in month_info
     
+    def test_get_missing_values_details_counts(self, sample_dataframe_with_missing, sample_practices):
+        """Test the missing-value counts match pandas per-practice and per-month counts."""
+        df = sample_dataframe_with_missing
+        validator = DataValidator(df, sample_practices)
+        details = validator.get_missing_values_details()
+
+        per_month = df[sample_practices].isna().groupby(df['Month']).sum()
+        assert details['total_missing'] == int(df.isnull().sum().sum())
+        for practice in sample_practices:
+            assert details['by_practice'][practice]['count'] == int(df[practice].isna().sum())
+            for month, count in per_month[practice].items():
+                if count:
+                    assert details['by_practice'][practice]['by_month'][month]['count'] == count
+        for month, count in per_month.sum(axis=1).items():
+            assert details['by_month'][month] == {
+                'count': count,
+                'total': int((df['Month'] == month).sum()) * len(sample_practices),
+                'percentage': round(count / ((df['Month'] == month).sum() * len(sample_practices)) * 100, 1),
+            }
+
     def test_get_data_quality_report(self, sample_dataframe, sample_practices):
         """Test get_data_quality_report returns correct metrics."""
         validator = DataValidator(sample_dataframe, sample_practices)
@@ -174,6 +194,24 @@ class TestDataValidator:
         assert isinstance(filtered, list)
         assert isinstance(excluded, list)
     
+    def test_filter_high_missing_practices_uses_reported_percentage(self):
+        """Test the threshold applies to the percentage rounded as in the missing-values report."""
+        rows = 2500
+        df = pd.DataFrame({
+            'Team Name': ['Team1'] * rows,
+            'Month': [202001] * rows,
+            'Rounds down': [np.nan] * 2251 + [1.0] * (rows - 2251),  # 90.04% -> 90.0
+            'Rounds up': [np.nan] * 2252 + [1.0] * (rows - 2252),  # 90.08% -> 90.1
+            'Complete': [1.0] * rows,
+        })
+        practices = ['Rounds down', 'Rounds up', 'Complete', 'Unknown']
+        validator = DataValidator(df, practices)
+
+        filtered, excluded = validator.filter_high_missing_practices(practices, threshold=90.0)
+
+        assert filtered == ['Rounds down', 'Complete']
+        assert excluded == ['Rounds up', 'Unknown']
+
     def test_filter_high_missing_practices_no_missing(self, sample_dataframe, sample_practices):
         """Test filter_high_missing_practices with no missing values."""
         validator = DataValidator(sample_dataframe, sample_practices)